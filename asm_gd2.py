@@ -1,4 +1,17 @@
+import logging
+import os
+import sys
+
+from chuyendoi import LOI_CHUYEN_DOI
+from hienthi import xuat_danh_sach
 from quanly import QuanLyNhanSu
+from quanlyfile import CLASS_MAP
+
+"""
+Menu của chương trình quản lý nhân sự: chỉ hỏi/in cho người dùng,
+mọi thao tác dữ liệu gọi qua API của QuanLyNhanSu (them, xoa, cap_nhat, lay, loc_theo_khoang,
+top_k, thong_ke, ...), QuanLyNhanSu không hỏi và không in gì.
+"""
 
 def hien_thi_menu():
     """Hiển thị menu chức năng cho người dùng từ dictionary."""
@@ -12,51 +25,246 @@ def hien_thi_menu():
         7: "Sắp xếp nhân viên theo họ tên",
         8: "Sắp xếp nhân viên theo thu nhập",
         9: "Hiển thị top 5 nhân viên thu nhập cao nhất",
+        10: "Thống kê theo chức vụ",
+        11: "Tìm nhân viên theo họ tên",
+        12: "Chuyển dữ liệu sang định dạng file khác",
         0: "Thoát chương trình"
     }
-    
+
     print("\n--- CHƯƠNG TRÌNH QUẢN LÝ NHÂN SỰ ---")
     for key, value in menu_options.items():
         print(f"{key}. {value}")
     print("------------------------------------")
     return menu_options
 
-ql_nhansu = QuanLyNhanSu()
-ql_nhansu.set_file_type()
-while True:
-    menu_options = hien_thi_menu()
+def chon_dinh_dang_file(ql: QuanLyNhanSu) -> None:
+    """Cho phép người dùng chọn định dạng file để làm việc."""
+    print("Chọn định dạng file:")
+    types = ql.cac_dinh_dang
+    for i, ftype in enumerate(types):
+        print(f"{i+1}. {ftype}")
+    try:
+        choice = int(input("Lựa chọn của bạn: ")) - 1
+    except ValueError:
+        print("Vui lòng nhập một số.")
+        return
+    if not 0 <= choice < len(types):
+        print("Lựa chọn không hợp lệ.")
+        return
+    print(f"Đã chuyển sang làm việc với file *{types[choice]}")
+    ql.doi_dinh_dang(types[choice])
+
+def nhap_thong_tin_nv_moi() -> dict | None:
+    """
+    Lấy thông tin nhân viên mới từ người dùng, trả về dict dùng cho QuanLyNhanSu.them.
+    - Gồm loại nhận viên, họ tên, lương và các thông tin khác nếu có.
+    - Chưa có mã: them cấp mã sau khi đồng bộ với file.
+    """
+    print("Chọn loại nhân viên để thêm:")
+    cac_chuc_vu = list(CLASS_MAP)
+    for i, chuc_vu in enumerate(cac_chuc_vu, 1):
+        print(f"{i}. {chuc_vu}")
+    loai_nv = int(input("Chọn loại nhân viên: "))
+    if not 1 <= loai_nv <= len(cac_chuc_vu):
+        print("Lựa chọn không hợp lệ.")
+        return None
+
+    ban_ghi = {"chuc_vu": cac_chuc_vu[loai_nv - 1]}
+    ban_ghi["ho_ten"] = input("Nhập họ tên: ")
+    ban_ghi["luong"] = input("Nhập lương cơ bản: ")
+    if ban_ghi["chuc_vu"] == "Tiếp Thị":
+        ban_ghi["doanh_so"] = input("Nhập doanh số: ")
+        ban_ghi["hoa_hong"] = input("Nhập tỉ lệ hoa hồng (vd: 0.1): ")
+    elif ban_ghi["chuc_vu"] == "Trưởng Phòng":
+        ban_ghi["luong_trach_nhiem"] = input("Nhập lương trách nhiệm: ")
+    return ban_ghi
+
+def them_nhan_vien(ql: QuanLyNhanSu) -> None:
+    """Y1: Thêm nhân viên mới và lưu vào file (mã được cấp trong them)."""
+    ban_ghi = nhap_thong_tin_nv_moi()
+    if not ban_ghi:
+        return
+    try:
+        nv = ql.them(ban_ghi)[0]
+    except ValueError as e:
+        print(f"Lỗi: {e} Nhân viên chưa được thêm.")
+        return
+    print(f"Đã thêm nhân viên {nv.ma_nv} thành công và cập nhật file.")
+
+def tim_nhan_vien_theo_ma(ql: QuanLyNhanSu, ma_nv: str):
+    """Y3: Tìm nhân viên theo mã, báo nếu mã sai định dạng."""
+    if not ql.ma_hop_le(ma_nv):
+        print("Mã nhân viên không hợp lệ. Mã Phải bắt đầu bằng HC, TT, TP và theo sau là ít nhất 4 chữ số.")
+        return None
+    return ql.lay(ma_nv)
+
+def xoa_nhan_vien(ql: QuanLyNhanSu) -> None:
+    """Y4: Xóa nhân viên và cập nhật file."""
+    ma_nv = input("Nhập mã nhân viên cần xóa: ").strip().upper()
+    ql.dong_bo_file()
+    nv = tim_nhan_vien_theo_ma(ql, ma_nv)
+    if not nv:
+        print("Không tìm thấy nhân viên.")
+        return
+    nv.xuat_thong_tin()
+    confirm = input(f"Bạn có chắc chắn muốn xóa nhân viên {nv.ma_nv}? (y/n): ").strip().lower()
+    if confirm == 'y':
+        ql.xoa(nv.ma_nv)
+        print(f"Đã xóa nhân viên: {nv.ho_ten}")
+        print("Đã xóa và cập nhật file.")
+
+def cap_nhat_thong_tin(ql: QuanLyNhanSu) -> None:
+    """Y5: Cập nhật thông tin nhân viên và lưu file."""
+    ma_nv = input("Nhập mã nhân viên cần cập nhật: ").strip()
+    ql.dong_bo_file()
+    nv = tim_nhan_vien_theo_ma(ql, ma_nv)
+    if not nv:
+        print("Không tìm thấy nhân viên cần cập nhật.")
+        return
+
+    print("Thông tin hiện tại của nhân viên:")
+    nv.xuat_thong_tin()
+    print("Thông tin bạn muốn cập nhật (Không thể cập nhật mã nhân viên) bỏ trống (enter) nếu bạn muốn giữa nguyên:")
+    truong = {}
+    for ten in ql.TRUONG_THEO_LOAI[type(nv)]:
+        if (gia_tri := input(f"{ql.NHAN_TRUONG[ten]} ({getattr(nv, ten)}): ")) != "":
+            truong[ten] = gia_tri
+    try:
+        ql.cap_nhat(nv.ma_nv, **truong)
+    except ValueError as e:
+        print(f"Lỗi: {e} Thông tin nhân viên được giữ nguyên.")
+        return
+    print("Đã cập nhật và lưu file.")
+
+def tim_theo_khoang_luong(ql: QuanLyNhanSu) -> None:
+    """Y6: Tìm nhân viên theo khoảng lương."""
+    try:
+        min_luong = float(input("Nhập mức lượng thấp nhất: "))
+        max_luong = float(input("Nhập mức lương cao nhất: "))
+    except ValueError:
+        print("Vui lòng nhập số hợp lệ.")
+        return
+    if min_luong > max_luong:
+        print("Mức lương thấp nhất phải nhỏ hơn mức lương cao nhất.")
+        return
+    nv_trong_khoang_luong = ql.loc_theo_khoang(min_luong, max_luong)
+    if not nv_trong_khoang_luong:
+        print(f"Không có nhân viên nào trong khoảng lương {min_luong:,} - {max_luong:,}")
+        return
+    xuat_danh_sach(nv_trong_khoang_luong)
+
+def tim_theo_ten(ql: QuanLyNhanSu) -> None:
+    """Y11: Tìm nhân viên theo họ tên (gõ không dấu được, không thấy thì tìm gần đúng)."""
+    tu_khoa = input("Nhập họ tên (hoặc một phần) cần tìm: ").strip()
+    if not tu_khoa:
+        print("Vui lòng nhập từ khóa.")
+        return
+    ket_qua = ql.tim_kiem_ten(tu_khoa)
+    if not ket_qua:
+        ket_qua = ql.tim_kiem_ten(tu_khoa, kieu="gan_dung")
+        if ket_qua:
+            print(f"Không có họ tên khớp '{tu_khoa}', các kết quả gần đúng:")
+    if not ket_qua:
+        print(f"Không tìm thấy nhân viên nào có họ tên khớp '{tu_khoa}'.")
+        return
+    xuat_danh_sach(ket_qua)
+
+def xuat_thong_ke(ql: QuanLyNhanSu) -> None:
+    """Y10: Xuất thống kê nhân sự và thu nhập theo chức vụ."""
+    thong_ke = ql.thong_ke()
+    if not thong_ke["Tổng"]["so_luong"]:
+        print("Danh sách nhân viên trống.")
+        return
+    print("\n--- Thống kê theo chức vụ ---")
+    print(f"{'Chức Vụ':<13}| {'Số NV':<7}| {'Tổng lương':<18}| {'Tổng thu nhập':<18}| {'Tổng thuế':<16}| "
+          f"{'TN trung bình':<16}| {'Độ lệch chuẩn':<16}| {'TN thấp nhất':<16}| {'TN cao nhất':<16}")
+    for chuc_vu, so_lieu in thong_ke.items():
+        print(f"{chuc_vu:<13}| {so_lieu['so_luong']:<7}| {so_lieu['tong_luong']:<18,.0f}| "
+              f"{so_lieu['tong_thu_nhap']:<18,.0f}| {so_lieu['tong_thue']:<16,.0f}| "
+              f"{so_lieu['thu_nhap_trung_binh']:<16,.0f}| {so_lieu['do_lech_chuan']:<16,.0f}| "
+              f"{so_lieu['thu_nhap_thap_nhat']:<16,.0f}| {so_lieu['thu_nhap_cao_nhat']:<16,.0f}")
+
+def chuyen_doi_dinh_dang(ql: QuanLyNhanSu) -> None:
+    """Y12: Xuất dữ liệu hiện tại sang định dạng file khác (xem QuanLyNhanSu.chuyen_sang)."""
+    types = [ftype for ftype in ql.cac_dinh_dang if ftype != ql.dinh_dang_hien_tai]
+    print("Chọn định dạng đích:")
+    for i, ftype in enumerate(types):
+        print(f"{i+1}. {ftype}")
     try:
-        lua_chon = int(input("Vui lòng chọn một chức năng: "))
-        
-        match lua_chon:
-            case 1:
-                ql_nhansu.them_nhan_vien()
-            case 2:
-                ql_nhansu.xuat_danh_sach_all()
-            case 3:
-                ma_nv = input("Nhập mã nhân viên cần tìm: ").strip()
-                nv = ql_nhansu.tim_nhan_vien_theo_ma(ma_nv)
-                if nv:
-                    nv.xuat_thong_tin()
-                else:
-                    print(f"Không tìm thấy nhân viên có mã {ma_nv}")
-            case 4:
-                ma_nv = input("Nhập mã nhân viên cần xóa: ").strip().upper()
-                ql_nhansu.xoa_nhan_vien_theo_ma(ma_nv)
-            case 5:
-                ql_nhansu.cap_nhat_thong_tin()
-            case 6:
-                ql_nhansu.tim_theo_khoang_luong()
-            case 7:
-                ql_nhansu.sap_xep_theo_ten()
-            case 8:
-                ql_nhansu.sap_xep_theo_thu_nhap()
-            case 9:
-                ql_nhansu.top_5_thu_nhap_cao()
-            case 0:
-                print("Cảm ơn đã sử dụng chương trình. Tạm biệt!")
-                break
-            case _:
-                print("Lựa chọn không hợp lệ. Vui lòng chọn lại.")
+        choice = int(input("Lựa chọn của bạn: ")) - 1
     except ValueError:
-        print("Vui lòng nhập một số nguyên hợp lệ.")
\ No newline at end of file
+        print("Vui lòng nhập một số.")
+        return
+    if not 0 <= choice < len(types):
+        print("Lựa chọn không hợp lệ.")
+        return
+    file_dich = ql.ten_file(types[choice])
+    if os.path.exists(file_dich) and input(f"File '{file_dich}' đã tồn tại, ghi đè? (y/n): ").strip().lower() != 'y':
+        print("Đã hủy chuyển đổi.")
+        return
+    print(f"Đang chuyển '{ql.ten_file()}' -> '{file_dich}'...")
+    try:
+        ql.chuyen_sang(types[choice])
+    except LOI_CHUYEN_DOI as e:
+        print(f"\nLỗi khi chuyển '{ql.ten_file()}' sang '{file_dich}': {e}. File đích không bị thay đổi.")
+
+def main() -> None:
+    # Thông báo trạng thái của QuanLyNhanSu và các handler (đã tải, đã lưu, ...) được in ra như trước
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    ql_nhansu = QuanLyNhanSu()
+    ql_nhansu.bat_ghi_nen()  # Lưu file trên luồng nền, menu không phải chờ ghi file
+    chon_dinh_dang_file(ql_nhansu)
+    while True:
+        menu_options = hien_thi_menu()
+        try:
+            lua_chon = int(input("Vui lòng chọn một chức năng: "))
+
+            match lua_chon:
+                case 1:
+                    them_nhan_vien(ql_nhansu)
+                case 2:
+                    xuat_danh_sach(ql_nhansu.tat_ca_nhan_vien())
+                case 3:
+                    ma_nv = input("Nhập mã nhân viên cần tìm: ").strip()
+                    nv = tim_nhan_vien_theo_ma(ql_nhansu, ma_nv)
+                    if nv:
+                        nv.xuat_thong_tin()
+                    else:
+                        print(f"Không tìm thấy nhân viên có mã {ma_nv}")
+                case 4:
+                    xoa_nhan_vien(ql_nhansu)
+                case 5:
+                    cap_nhat_thong_tin(ql_nhansu)
+                case 6:
+                    tim_theo_khoang_luong(ql_nhansu)
+                case 7:
+                    # Danh sách gốc giữ nguyên thứ tự
+                    print("Đã sắp xếp danh sách theo tên.")
+                    xuat_danh_sach(ql_nhansu.danh_sach_theo_ten())
+                case 8:
+                    print("Đã sắp xếp danh sách theo thu nhập giảm dần.")
+                    xuat_danh_sach(ql_nhansu.danh_sach_theo_thu_nhap())
+                case 9:
+                    print("Top 5 nhân viên có thu nhập cao nhất:")
+                    xuat_danh_sach(ql_nhansu.top_k(5))
+                case 10:
+                    xuat_thong_ke(ql_nhansu)
+                case 11:
+                    tim_theo_ten(ql_nhansu)
+                case 12:
+                    chuyen_doi_dinh_dang(ql_nhansu)
+                case 0:
+                    ql_nhansu.gop_nhat_ky()
+                    ql_nhansu.tat_ghi_nen()
+                    print("Cảm ơn đã sử dụng chương trình. Tạm biệt!")
+                    break
+                case _:
+                    print("Lựa chọn không hợp lệ. Vui lòng chọn lại.")
+        except ValueError:
+            print("Vui lòng nhập một số nguyên hợp lệ.")
+        except OSError as e:
+            # Lỗi của luồng ghi nền được báo lại ở lần đọc/gộp file sau đó
+            print(f"Lỗi khi ghi file: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Module này chứa bộ tính lương hàng loạt cho toàn bộ danh sách nhân viên.
+- Tính thu nhập và thuế thu nhập của cả danh sách trong một lượt theo cột,
+  không phải gọi property thu_nhap/thue_thu_nhap trên từng đối tượng.
+- Dùng NumPy nếu có cài đặt, nếu không thì tính bằng list comprehension.
+- Kết quả giống hệt khi tính bằng property của từng nhân viên.
+"""
+from operator import attrgetter
+
+from bieuthue import bo_thue
+from danhsachcot import DanhSachCot
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là tùy chọn
+    np = None
+
+
+class BangLuong:
+    """
+    Kết quả tính lương của một danh sách nhân viên.\n
+    Các cột thu_nhap, thue_thu_nhap cùng thứ tự với danh sách đầu vào,
+    nên các hàm ghi file/báo cáo có thể lấy theo chỉ số dòng.
+    """
+    def __init__(self, nguon, thu_nhap: list[float], thue_thu_nhap: list[float]):
+        self._nguon = nguon
+        self.thu_nhap = thu_nhap
+        self.thue_thu_nhap = thue_thu_nhap
+        self._vi_tri: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.thu_nhap)
+
+    def theo_ma(self, ma_nv: str) -> tuple[float, float] | None:
+        """Trả về (thu_nhap, thue_thu_nhap) của một nhân viên theo mã."""
+        if self._vi_tri is None:
+            ds_ma = self._nguon.ma_nv if isinstance(self._nguon, DanhSachCot) else (nv.ma_nv for nv in self._nguon)
+            self._vi_tri = {ma: i for i, ma in enumerate(ds_ma)}
+        i = self._vi_tri.get(ma_nv)
+        return None if i is None else (self.thu_nhap[i], self.thue_thu_nhap[i])
+
+
+def _cot_doi_tuong(nguon, truong: str):
+    """Lấy một trường của cả list nhân viên thành mảng NumPy, một lượt qua list."""
+    return np.fromiter(map(attrgetter(truong), nguon), dtype=np.float64, count=len(nguon))
+
+
+def _tinh_thu_nhap(nguon):
+    """
+    Tính cột thu nhập. Các trường không áp dụng đều là 0.0 (cột của DanhSachCot, thuộc tính
+    lớp của NhanVien) nên một công thức chung luong + doanh_so * hoa_hong + luong_trach_nhiem
+    đúng cho cả ba loại nhân viên.\n
+    Với list đối tượng: có NumPy thì lấy từng trường thành cột rồi tính cả cột; không có
+    thì gọi property thu_nhap đúng một lần mỗi người (thue_thu_nhap không phải gọi lại thu_nhap).
+    """
+    if not isinstance(nguon, DanhSachCot):
+        if np is None:
+            return [nv.thu_nhap for nv in nguon]
+        return (_cot_doi_tuong(nguon, "_luong")
+                + _cot_doi_tuong(nguon, "_doanh_so") * _cot_doi_tuong(nguon, "_hoa_hong")
+                + _cot_doi_tuong(nguon, "_luong_trach_nhiem"))
+    if np is not None:
+        luong = np.frombuffer(nguon.luong, dtype=np.float64)
+        doanh_so = np.frombuffer(nguon.doanh_so, dtype=np.float64)
+        hoa_hong = np.frombuffer(nguon.hoa_hong, dtype=np.float64)
+        luong_trach_nhiem = np.frombuffer(nguon.luong_trach_nhiem, dtype=np.float64)
+        return luong + doanh_so * hoa_hong + luong_trach_nhiem
+    return [l + d * h + t for l, d, h, t in
+            zip(nguon.luong, nguon.doanh_so, nguon.hoa_hong, nguon.luong_trach_nhiem)]
+
+
+def tinh_bang_luong(nguon) -> BangLuong:
+    """
+    Tính thu nhập và thuế cho toàn bộ nguồn (DanhSachCot hoặc list nhân viên).\n
+    Thuế tính theo biểu thuế đang áp dụng (giống NhanVien.thue_thu_nhap) cho cả cột một lần.
+    """
+    if not len(nguon):
+        return BangLuong(nguon, [], [])
+    thu_nhap = _tinh_thu_nhap(nguon)
+    thue = bo_thue.hien_hanh.tinh_hang_loat(thu_nhap)
+
+    if np is not None:
+        # tolist() trả về float của Python để json/csv ghi được trực tiếp;
+        # bậc 0% trả về số nguyên 0 giống property thue_thu_nhap
+        return BangLuong(nguon, thu_nhap.tolist(), [t or 0 for t in thue.tolist()])
+    return BangLuong(nguon, thu_nhap, thue)
@@ -0,0 +1,568 @@
+"""
+Các phép đo hiệu năng đơn giản cho chương trình quản lý nhân sự.
+Chạy: python benchmark.py [tên_phép_đo ...]  (bỏ trống để chạy tất cả)
+"""
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bangluong import tinh_bang_luong
+from bieuthue import BieuThue, bo_thue
+from chuyendoi import convert
+from hienthi import TIEU_DE_BANG, xuat_bang
+from danhsachcot import DanhSachCot
+from nhansu import HanhChinh, TiepThi, TruongPhong, bo_dem_cache, tao_hang_loat
+import nhansu
+from quanly import QuanLyNhanSu
+from nhatky import NhatKy, SUA
+from quanlyfile import QuanLyBin, QuanLyCsv, QuanLyJson, QuanLySqlite, QuanLyTxt, QuanLyXml
+from tiengviet import chuan_hoa
+from truyvan import top_k
+
+
+def tao_du_lieu_gia(so_luong: int, seed: int = 42) -> list:
+    """Sinh ngẫu nhiên một danh sách nhân viên để đo hiệu năng."""
+    rng = random.Random(seed)
+    ds = []
+    for i in range(1, so_luong + 1):
+        loai = rng.randrange(3)
+        if loai == 0:
+            nv = HanhChinh()
+            nv.ma_nv = f"HC{i:04d}"
+        elif loai == 1:
+            nv = TiepThi()
+            nv.ma_nv = f"TT{i:04d}"
+            nv.doanh_so = rng.randrange(0, 100_000_000, 1000)
+            nv.hoa_hong = rng.choice([0.05, 0.1, 0.2])
+        else:
+            nv = TruongPhong()
+            nv.ma_nv = f"TP{i:04d}"
+            nv.luong_trach_nhiem = rng.randrange(1_000_000, 20_000_000, 1000)
+        nv.ho_ten = f"Nhân Viên {i}"
+        nv.luong = rng.randrange(3_000_000, 60_000_000, 1000)
+        ds.append(nv)
+    return ds
+
+
+def do_thoi_gian(ham, so_lan: int = 1) -> float:
+    """Trả về thời gian trung bình (giây) của một lần gọi ham()."""
+    bat_dau = time.perf_counter()
+    for _ in range(so_lan):
+        ham()
+    return (time.perf_counter() - bat_dau) / so_lan
+
+
+def bench_khoang_luong(so_luong: int = 200_000, so_truy_van: int = 200) -> None:
+    """Y6: So sánh lọc tuyến tính với truy vấn trên chỉ mục lương đã sắp xếp."""
+    ql = QuanLyNhanSu()
+    ql._danh_sach_nv = tao_du_lieu_gia(so_luong)
+    ds = ql._danh_sach_nv
+    rng = random.Random(1)
+    khoang = []
+    for _ in range(so_truy_van):
+        thap = rng.randrange(3_000_000, 60_000_000)
+        khoang.append((thap, thap + 500_000))
+
+    def tuyen_tinh():
+        for thap, cao in khoang:
+            [nv for nv in ds if thap <= nv.luong <= cao]
+
+    def chi_muc():
+        for thap, cao in khoang:
+            ql.loc_theo_khoang(thap, cao)
+
+    t1 = do_thoi_gian(tuyen_tinh) / so_truy_van
+    t2 = do_thoi_gian(chi_muc) / so_truy_van
+    print(f"[khoang_luong] n={so_luong:,}: duyệt O(n) {t1 * 1e3:.3f} ms/truy vấn, "
+          f"chỉ mục {t2 * 1e3:.3f} ms/truy vấn (x{t1 / t2:.1f})")
+
+
+def bench_top_k(so_luong: int = 500_000) -> None:
+    """Y9: So sánh sắp xếp toàn bộ với heap kích thước k."""
+    ds = tao_du_lieu_gia(so_luong)
+    t1 = do_thoi_gian(lambda: sorted(ds, key=lambda nv: nv.thu_nhap, reverse=True)[:5])
+    t2 = do_thoi_gian(lambda: top_k(ds, 5))
+    print(f"[top_k] n={so_luong:,}: sorted {t1 * 1e3:.1f} ms, heap {t2 * 1e3:.1f} ms (x{t1 / t2:.1f})")
+
+
+def bench_bo_nho(so_luong: int = 200_000) -> None:
+    """So sánh bộ nhớ của list đối tượng nhân viên với DanhSachCot."""
+    # Chuỗi (mã, họ tên) được tạo trước và dùng chung cho cả hai cách lưu,
+    # nên phần chênh lệch đo được chỉ là chi phí cấu trúc của mỗi cách.
+    # Các trường số để dạng chuỗi như khi đọc từ file, setter sẽ tạo float mới.
+    mau = tao_du_lieu_gia(so_luong)
+    dong = [(type(nv), nv.ma_nv, nv.ho_ten, str(nv.luong), str(getattr(nv, "doanh_so", 0.0)),
+             str(getattr(nv, "hoa_hong", 0.0)), str(getattr(nv, "luong_trach_nhiem", 0.0)))
+            for nv in mau]
+    del mau
+
+    def tao(cls, ma, ten, luong, doanh_so, hoa_hong, ltn):
+        nv = cls()
+        nv.ma_nv, nv.ho_ten, nv.luong = ma, ten, luong
+        if cls is TiepThi:
+            nv.doanh_so, nv.hoa_hong = doanh_so, hoa_hong
+        elif cls is TruongPhong:
+            nv.luong_trach_nhiem = ltn
+        return nv
+
+    tracemalloc.start()
+    ds = [tao(*d) for d in dong]
+    bo_nho_doi_tuong = tracemalloc.get_traced_memory()[0]
+    del ds
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    bang = DanhSachCot()
+    for d in dong:
+        bang.them(tao(*d))
+    bo_nho_cot = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"[bo_nho] n={so_luong:,}: đối tượng {bo_nho_doi_tuong / so_luong:.0f} B/nv, "
+          f"dạng cột {bo_nho_cot / so_luong:.0f} B/nv")
+
+
+def bench_bang_luong(so_luong: int = 500_000) -> None:
+    """So sánh tính thu nhập/thuế từng đối tượng với bộ tính lương hàng loạt."""
+    ds = tao_du_lieu_gia(so_luong)
+    bang = DanhSachCot.tu_danh_sach(ds)
+    t1 = do_thoi_gian(lambda: [(nv.thu_nhap, nv.thue_thu_nhap) for nv in ds])
+    t2 = do_thoi_gian(lambda: tinh_bang_luong(ds))
+    t3 = do_thoi_gian(lambda: tinh_bang_luong(bang))
+    print(f"[bang_luong] n={so_luong:,}: property {t1 * 1e3:.1f} ms, hàng loạt từ list {t2 * 1e3:.1f} ms, "
+          f"hàng loạt từ DanhSachCot {t3 * 1e3:.1f} ms")
+
+
+def bench_cache(so_luong: int = 100_000) -> None:
+    """Tỉ lệ trúng cache thu nhập/thuế khi chạy một lượt báo cáo Y8, Y9 và lưu file."""
+    ql = QuanLyNhanSu()
+    ql._danh_sach_nv = tao_du_lieu_gia(so_luong)
+    with tempfile.TemporaryDirectory() as thu_muc:
+        ql._file_name_base = os.path.join(thu_muc, "data_nhansu")
+        bo_dem_cache.dat_lai()
+        bat_dau = time.perf_counter()
+        xuat_bang(ql.danh_sach_theo_thu_nhap(), io.StringIO())
+        xuat_bang(ql.top_k(5), io.StringIO())
+        ql.luu_file(ql._danh_sach_nv)
+        thoi_gian = time.perf_counter() - bat_dau
+    print(f"[cache] n={so_luong:,}: {thoi_gian * 1e3:.0f} ms, {bo_dem_cache}")
+
+
+def bench_doc_luong(so_luong: int = 100_000) -> None:
+    """So sánh bộ nhớ đỉnh khi chạy top-5 trên read() và trên iter_read()."""
+    ds = tao_du_lieu_gia(so_luong)
+    with tempfile.TemporaryDirectory() as thu_muc:
+        for handler, duoi in ((QuanLyJson(), ".json"), (QuanLyXml(), ".xml")):
+            file_path = os.path.join(thu_muc, "data_nhansu" + duoi)
+            handler.write(file_path, ds)
+            ket_qua = []
+            for ten, doc in (("read", handler.read), ("iter_read", handler.iter_read)):
+                tracemalloc.start()
+                bat_dau = time.perf_counter()
+                top_k(doc(file_path), 5)
+                thoi_gian = time.perf_counter() - bat_dau
+                dinh = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                ket_qua.append(f"{ten} {thoi_gian * 1e3:.0f} ms / {dinh / 2**20:.1f} MiB")
+            print(f"[doc_luong] {duoi} n={so_luong:,}: " + ", ".join(ket_qua))
+
+
+def bench_ghi_them(cac_kich_thuoc=(1_000, 10_000, 50_000), so_lan: int = 20) -> None:
+    """Độ trễ ghi thêm một nhân viên vào file JSON/XML khi file lớn dần."""
+    them = tao_du_lieu_gia(so_lan, seed=7)
+    with tempfile.TemporaryDirectory() as thu_muc:
+        for handler, duoi in ((QuanLyJson(), ".json"), (QuanLyXml(), ".xml")):
+            ket_qua = []
+            for so_luong in cac_kich_thuoc:
+                file_path = os.path.join(thu_muc, "data_nhansu" + duoi)
+                handler.write(file_path, tao_du_lieu_gia(so_luong))
+                bat_dau = time.perf_counter()
+                for nv in them:
+                    handler.write(file_path, nv)
+                thoi_gian = (time.perf_counter() - bat_dau) / so_lan
+                ket_qua.append(f"{so_luong:,} dòng: {thoi_gian * 1e3:.2f} ms")
+            print(f"[ghi_them] {duoi}: " + ", ".join(ket_qua))
+
+
+def bench_xml_tang_dan(cac_so_lan=(500, 1_000, 2_000)) -> None:
+    """Tổng thời gian và kích thước file khi ghi thêm lần lượt từng nhân viên vào file XML rỗng."""
+    handler = QuanLyXml()
+    with tempfile.TemporaryDirectory() as thu_muc:
+        for so_lan in cac_so_lan:
+            file_path = os.path.join(thu_muc, f"data_nhansu_{so_lan}.xml")
+            ds = tao_du_lieu_gia(so_lan)
+            bat_dau = time.perf_counter()
+            for nv in ds:
+                handler.write(file_path, nv)
+            thoi_gian = time.perf_counter() - bat_dau
+            kich_thuoc = os.path.getsize(file_path)
+            print(f"[xml_tang_dan] {so_lan:,} lần ghi thêm: {thoi_gian * 1e3:.0f} ms, "
+                  f"{kich_thuoc / 1024:.0f} KiB ({kich_thuoc / so_lan:.0f} B/nv)")
+
+
+def bench_nhat_ky(so_luong: int = 50_000, so_lan: int = 20) -> None:
+    """Y5: So sánh ghi lại cả file CSV với ghi một dòng vào nhật ký sau mỗi lần sửa."""
+    ds = tao_du_lieu_gia(so_luong)
+    handler = QuanLyCsv()
+    with tempfile.TemporaryDirectory() as thu_muc:
+        file_path = os.path.join(thu_muc, "data_nhansu.csv")
+        ghi_lai = do_thoi_gian(lambda: handler.write(file_path, ds), so_lan=3)
+        nhat_ky = NhatKy(file_path)
+        bat_dau = time.perf_counter()
+        for nv in ds[:so_lan]:
+            nhat_ky.ghi(SUA, nv)
+        ghi_nhat_ky = (time.perf_counter() - bat_dau) / so_lan
+    print(f"[nhat_ky] {so_luong:,} nhân viên: ghi lại cả file {ghi_lai * 1e3:.1f} ms/lần, "
+          f"nhật ký {ghi_nhat_ky * 1e3:.2f} ms/lần (x{ghi_lai / ghi_nhat_ky:.0f})")
+
+
+def bench_va_ban_ghi(so_luong: int = 50_000, so_lan: int = 200) -> None:
+    """Y4/Y5: So sánh ghi lại cả file TXT/CSV với vá trực tiếp từng dòng."""
+    ds = tao_du_lieu_gia(so_luong)
+    with tempfile.TemporaryDirectory() as thu_muc:
+        for handler, duoi in ((QuanLyTxt(), ".txt"), (QuanLyCsv(), ".csv")):
+            file_path = os.path.join(thu_muc, "data_nhansu" + duoi)
+            ghi_lai = do_thoi_gian(lambda: handler.write(file_path, ds), so_lan=3)
+            handler.cap_nhat_ban_ghi(file_path, ds[0])  # dựng chỉ mục vị trí dòng
+            bat_dau = time.perf_counter()
+            for i, nv in enumerate(random.Random(1).sample(ds, so_lan)):
+                nv.luong += 1
+                if i % 2:
+                    handler.cap_nhat_ban_ghi(file_path, nv)
+                else:
+                    handler.xoa_ban_ghi(file_path, nv.ma_nv)
+            va = (time.perf_counter() - bat_dau) / so_lan
+            print(f"[va_ban_ghi] {duoi} {so_luong:,} dòng: ghi lại cả file {ghi_lai * 1e3:.1f} ms/lần, "
+                  f"vá dòng {va * 1e3:.3f} ms/lần (x{ghi_lai / va:.0f})")
+
+
+def bench_nhi_phan(so_luong: int = 200_000) -> None:
+    """Y6/Y9: Đọc toàn bộ file CSV rồi truy vấn so với mở file .bin qua mmap và quét theo cột."""
+    ds = tao_du_lieu_gia(so_luong)
+    csv_handler, bin_handler = QuanLyCsv(), QuanLyBin()
+    with tempfile.TemporaryDirectory() as thu_muc:
+        file_csv = os.path.join(thu_muc, "data_nhansu.csv")
+        file_bin = os.path.join(thu_muc, "data_nhansu.bin")
+        csv_handler.write(file_csv, ds)
+        bin_handler.write(file_bin, ds)
+
+        def qua_csv():
+            danh_sach = csv_handler.read(file_csv)
+            return top_k(danh_sach, 5), sum(1 for nv in danh_sach if 5e6 <= nv.luong <= 6e6)
+
+        def qua_bin():
+            with bin_handler.mo_bang(file_bin) as bang:
+                return bang.top_k(5), sum(1 for _ in bang.loc_theo_khoang(5e6, 6e6))
+
+        t_csv = do_thoi_gian(qua_csv)
+        t_bin = do_thoi_gian(qua_bin, so_lan=5)
+        t_mo = do_thoi_gian(lambda: bin_handler.mo_bang(file_bin).dong(), so_lan=100)
+        print(f"[nhi_phan] n={so_luong:,}: đọc CSV + top-5 + lọc lương {t_csv * 1e3:.0f} ms, "
+              f"mmap .bin {t_bin * 1e3:.1f} ms (x{t_csv / t_bin:.0f}), mở file .bin {t_mo * 1e6:.0f} µs")
+
+
+def bench_sqlite(so_luong: int = 200_000, so_truy_van: int = 50) -> None:
+    """Y3/Y6/Y9 và Y5 trên CSDL SQLite so với tải file CSV vào bộ nhớ rồi truy vấn."""
+    ds = tao_du_lieu_gia(so_luong)
+    csv_handler, db_handler = QuanLyCsv(), QuanLySqlite()
+    rng = random.Random(3)
+    ma_tim = [nv.ma_nv for nv in rng.sample(ds, so_truy_van)]
+    with tempfile.TemporaryDirectory() as thu_muc:
+        file_csv = os.path.join(thu_muc, "data_nhansu.csv")
+        file_db = os.path.join(thu_muc, "data_nhansu.db")
+        csv_handler.write(file_csv, ds)
+        db_handler.write(file_db, ds)
+
+        def qua_csv():
+            theo_ma = {nv.ma_nv: nv for nv in csv_handler.read(file_csv)}
+            [theo_ma.get(ma) for ma in ma_tim]
+            top_k(theo_ma.values(), 5)
+            return [nv for nv in theo_ma.values() if 5e6 <= nv.luong <= 5.01e6]
+
+        def qua_db():
+            [db_handler.tim_theo_ma(file_db, ma) for ma in ma_tim]
+            db_handler.top_k(file_db, 5)
+            return db_handler.loc_theo_khoang(file_db, 5e6, 5.01e6)
+
+        t_csv = do_thoi_gian(qua_csv)
+        t_db = do_thoi_gian(qua_db, so_lan=5)
+        nv = ds[so_luong // 2]
+        t_sua = do_thoi_gian(lambda: db_handler.cap_nhat_ban_ghi(file_db, nv), so_lan=so_truy_van)
+        db_handler.dong()
+    print(f"[sqlite] n={so_luong:,}: tải CSV + {so_truy_van} lần Y3 + Y6 + Y9 {t_csv * 1e3:.0f} ms, "
+          f"truy vấn SQLite {t_db * 1e3:.1f} ms (x{t_csv / t_db:.0f}); Y5 một dòng {t_sua * 1e3:.2f} ms")
+
+
+def bench_doc_song_song(so_luong: int = 300_000, cac_so_tien_trinh=(1, 2, 4, 8)) -> None:
+    """Đọc file TXT/CSV lớn bằng read() so với doc_song_song() theo số tiến trình."""
+    ds = tao_du_lieu_gia(so_luong)
+    print(f"[doc_song_song] n={so_luong:,}, máy có {os.cpu_count()} CPU")
+    with tempfile.TemporaryDirectory() as thu_muc:
+        for handler, duoi in ((QuanLyTxt(), ".txt"), (QuanLyCsv(), ".csv")):
+            file_path = os.path.join(thu_muc, "data_nhansu" + duoi)
+            handler.write(file_path, ds)
+            kich_thuoc = os.path.getsize(file_path)
+            t_doc = do_thoi_gian(lambda: handler.read(file_path))
+            ket_qua = [f"read() {t_doc * 1e3:.0f} ms"]
+            for so_tien_trinh in cac_so_tien_trinh:
+                t = do_thoi_gian(lambda: handler.doc_song_song(
+                    file_path, so_tien_trinh, kich_thuoc_khoi=max(1 << 20, kich_thuoc // (4 * so_tien_trinh))))
+                ket_qua.append(f"{so_tien_trinh} tiến trình {t * 1e3:.0f} ms (x{t_doc / t:.1f})")
+            print(f"  {duoi} {kich_thuoc / 2**20:.0f} MiB: " + ", ".join(ket_qua))
+
+
+def bench_from_row(so_luong: int = 200_000) -> None:
+    """Tạo nhân viên từ các dòng chuỗi đọc được: qua setter từng trường so với tao_hang_loat/from_row."""
+    cac_dong = [(type(nv), nv.ma_nv, nv.ho_ten, str(nv.luong),
+                 str(getattr(nv, "doanh_so", 0.0)), str(getattr(nv, "hoa_hong", 0.0)),
+                 str(getattr(nv, "luong_trach_nhiem", 0.0))) for nv in tao_du_lieu_gia(so_luong)]
+    t_setter = do_thoi_gian(lambda: [nhansu._tao_qua_setter(*dong) for dong in cac_dong])
+    t_lo = do_thoi_gian(lambda: tao_hang_loat(cac_dong))
+    so_thuc = [(lop, ma, ten, float(l), float(d), float(h), float(t)) for lop, ma, ten, l, d, h, t in cac_dong]
+    t_from_row = do_thoi_gian(lambda: [lop.from_row(ma, ten, l, d, h, t) for lop, ma, ten, l, d, h, t in so_thuc])
+    print(f"[from_row] n={so_luong:,}: setter {t_setter * 1e3:.0f} ms, tao_hang_loat {t_lo * 1e3:.0f} ms "
+          f"(x{t_setter / t_lo:.1f}), from_row với số đã là float {t_from_row * 1e3:.0f} ms "
+          f"(x{t_setter / t_from_row:.1f})")
+
+
+def bench_bieu_thue(so_luong: int = 500_000) -> None:
+    """Đổi biểu thuế (7 bậc lũy tiến) rồi tính lại thuế: qua property từng nhân viên so với theo cột."""
+    ds = tao_du_lieu_gia(so_luong)
+    bang = DanhSachCot.tu_danh_sach(ds)
+    luy_tien = BieuThue([(0, 0.05), (5e6, 0.10), (10e6, 0.15), (18e6, 0.20), (32e6, 0.25),
+                         (52e6, 0.30), (80e6, 0.35)], luy_tien=True, ten="Lũy tiến 7 bậc")
+    cu = bo_thue.hien_hanh
+    [nv.thue_thu_nhap for nv in ds]  # làm nóng cache theo biểu thuế cũ
+    try:
+        bo_thue.ap_dung(luy_tien)
+        t_property = do_thoi_gian(lambda: [nv.thue_thu_nhap for nv in ds])
+        t_cot = do_thoi_gian(lambda: tinh_bang_luong(bang))
+    finally:
+        bo_thue.ap_dung(cu)
+    print(f"[bieu_thue] n={so_luong:,}: tính lại qua property {t_property * 1e3:.0f} ms, "
+          f"theo cột {t_cot * 1e3:.0f} ms (x{t_property / t_cot:.1f})")
+
+
+def bench_thong_ke(so_luong: int = 200_000, so_lan_sua: int = 1_000) -> None:
+    """Thống kê theo chức vụ: duyệt toàn bộ danh sách so với đọc các tổng cập nhật dần sau mỗi lần sửa."""
+    ql = QuanLyNhanSu()
+    ql._danh_sach_nv = tao_du_lieu_gia(so_luong)
+    rng = random.Random(4)
+    cac_nv = rng.sample(ql._danh_sach_nv, so_lan_sua)
+
+    def duyet():
+        tong = {}
+        for nv in ql._danh_sach_nv:
+            so_lieu = tong.setdefault(nv.chuc_vu, [0, 0.0, 0.0])
+            so_lieu[0] += 1
+            so_lieu[1] += nv.thu_nhap
+            so_lieu[2] += nv.thue_thu_nhap
+        return tong
+
+    def sua_roi_doc():
+        for nv in cac_nv:
+            nv.luong = nv.luong + 1.0
+            ql._cap_nhat_chi_muc(nv)
+            ql.thong_ke()
+
+    t_duyet = do_thoi_gian(duyet, so_lan=3)
+    t_dan = do_thoi_gian(sua_roi_doc) / so_lan_sua
+    print(f"[thong_ke] n={so_luong:,}: duyệt toàn bộ {t_duyet * 1e3:.0f} ms, "
+          f"sửa một người + đọc số liệu {t_dan * 1e6:.0f} µs (x{t_duyet / t_dan:.0f})")
+
+
+def bench_hien_thi(so_luong: int = 100_000) -> None:
+    """
+    Y2: In từng dòng bằng print so với định dạng theo lô vào bộ đệm. Ghi ra file tạm mở
+    ở chế độ đệm theo dòng (giống stdout khi là terminal: mỗi dòng một lần ghi xuống).
+    """
+    ds = tao_du_lieu_gia(so_luong)
+    with tempfile.TemporaryFile("w+", encoding="utf-8", buffering=1) as f:
+        def tung_dong():
+            f.seek(0)
+            bang_luong = tinh_bang_luong(ds)
+            with contextlib.redirect_stdout(f):
+                print(TIEU_DE_BANG)
+                for nv, thu_nhap, thue in zip(ds, bang_luong.thu_nhap, bang_luong.thue_thu_nhap):
+                    print(nv.dong_thong_tin(thu_nhap, thue))
+            f.flush()
+
+        def theo_lo():
+            f.seek(0)
+            xuat_bang(ds, f)
+
+        t_cu = do_thoi_gian(tung_dong)
+        t_moi = do_thoi_gian(theo_lo)
+        t_csv = do_thoi_gian(lambda: (f.seek(0), xuat_bang(ds, f, dinh_dang="csv")))
+        t_trang = do_thoi_gian(lambda: (f.seek(0), xuat_bang(ds, f, offset=so_luong // 2, limit=50)), so_lan=100)
+    print(f"[hien_thi] n={so_luong:,}: print từng dòng {t_cu * 1e3:.0f} ms ({so_luong / t_cu:,.0f} dòng/s), "
+          f"theo lô {t_moi * 1e3:.0f} ms ({so_luong / t_moi:,.0f} dòng/s, x{t_cu / t_moi:.1f}); "
+          f"csv {t_csv * 1e3:.0f} ms; một trang 50 dòng {t_trang * 1e3:.2f} ms")
+
+
+def bench_sap_xep(so_luong: int = 200_000, so_lan: int = 5) -> None:
+    """Y7/Y8: Sắp xếp lại từ đầu mỗi lần so với lấy từ chỉ mục đã sắp xếp (không đổi danh sách gốc)."""
+    ql = QuanLyNhanSu()
+    ql._danh_sach_nv = tao_du_lieu_gia(so_luong)
+    t_ten_cu = do_thoi_gian(lambda: sorted(ql._danh_sach_nv, key=lambda nv: nv.ho_ten), so_lan)
+    t_thu_nhap_cu = do_thoi_gian(lambda: sorted(ql._danh_sach_nv, key=lambda nv: nv.thu_nhap, reverse=True), so_lan)
+    t_dung = do_thoi_gian(ql.danh_sach_theo_ten)  # lần đầu dựng chỉ mục tên
+    t_ten = do_thoi_gian(ql.danh_sach_theo_ten, so_lan)
+    t_thu_nhap = do_thoi_gian(ql.danh_sach_theo_thu_nhap, so_lan)
+    print(f"[sap_xep] n={so_luong:,}: theo tên sorted() {t_ten_cu * 1e3:.0f} ms, chỉ mục {t_ten * 1e3:.0f} ms "
+          f"(dựng lần đầu {t_dung * 1e3:.0f} ms); theo thu nhập sorted() {t_thu_nhap_cu * 1e3:.0f} ms, "
+          f"chỉ mục {t_thu_nhap * 1e3:.0f} ms")
+
+
+def bench_tim_ten(so_luong: int = 200_000, so_truy_van: int = 200) -> None:
+    """Tìm theo họ tên: duyệt cả danh sách (chuẩn hóa từng tên) so với chỉ mục token."""
+    rng = random.Random(5)
+    ho = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ", "Võ", "Đặng", "Bùi", "Đỗ"]
+    dem = ["Văn", "Thị", "Minh", "Hữu", "Ngọc", "Thanh", "Quốc", "Đức", "Thu", "Gia"]
+    ten = ["An", "Ánh", "Bình", "Cường", "Dũng", "Đạt", "Giang", "Hạnh", "Hùng", "Khoa", "Lan", "Linh",
+           "Minh", "Nghĩa", "Phúc", "Quân", "Sơn", "Tâm", "Thảo", "Trung", "Tuấn", "Vy", "Yến"]
+    ds = tao_du_lieu_gia(so_luong)
+    for nv in ds:
+        nv.ho_ten = f"{rng.choice(ho)} {rng.choice(dem)} {rng.choice(ten)} {rng.choice(ten)}"
+    ql = QuanLyNhanSu()
+    ql._danh_sach_nv = ds
+    cac_tu_khoa = [f"{chuan_hoa(rng.choice(ho))} {chuan_hoa(rng.choice(ten))[:2]} "
+                   f"{chuan_hoa(rng.choice(ten))[:2]}" for _ in range(so_truy_van)]
+
+    def duyet():
+        for tu_khoa in cac_tu_khoa:
+            cac_tu = tu_khoa.split()
+            [nv for nv in ds if all(any(tu_ten.startswith(tu) for tu_ten in chuan_hoa(nv.ho_ten).split())
+                                    for tu in cac_tu)]
+
+    t_duyet = do_thoi_gian(duyet) / so_truy_van
+    t_tien_to = do_thoi_gian(lambda: [ql.tim_kiem_ten(tk) for tk in cac_tu_khoa]) / so_truy_van
+    ql.tim_kiem_ten("x", kieu="gan_dung")  # dựng bảng tìm gần đúng
+    t_gan_dung = do_thoi_gian(lambda: [ql.tim_kiem_ten(tk.replace("n", "m", 1), kieu="gan_dung")
+                                       for tk in cac_tu_khoa]) / so_truy_van
+    print(f"[tim_ten] n={so_luong:,}: duyệt {t_duyet * 1e3:.0f} ms/truy vấn, tiền tố {t_tien_to * 1e3:.2f} ms "
+          f"(x{t_duyet / t_tien_to:.0f}), gần đúng {t_gan_dung * 1e3:.2f} ms")
+
+
+def bench_chuyen_doi(so_luong: int = 100_000) -> None:
+    """Chuyển file XML sang CSV/JSON/.bin: read() rồi write() cả list so với convert() đọc/ghi dần theo lô."""
+    ds = tao_du_lieu_gia(so_luong)
+    with tempfile.TemporaryDirectory() as thu_muc:
+        co_so = os.path.join(thu_muc, "data_nhansu")
+        QuanLyXml().write(co_so + ".xml", ds)
+        del ds
+        for handler, duoi in ((QuanLyCsv(), ".csv"), (QuanLyJson(), ".json"), (QuanLyBin(), ".bin")):
+            ket_qua = []
+            for ten, chuyen in (("list", lambda: handler.write(co_so + duoi, QuanLyXml().read(co_so + ".xml"))),
+                                ("convert", lambda: convert(".xml", duoi, co_so, in_tien_do=False))):
+                tracemalloc.start()
+                bat_dau = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    chuyen()
+                thoi_gian = time.perf_counter() - bat_dau
+                dinh = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                ket_qua.append(f"{ten} {thoi_gian * 1e3:.0f} ms / {dinh / 2**20:.1f} MiB")
+            print(f"[chuyen_doi] .xml -> {duoi} n={so_luong:,}: " + ", ".join(ket_qua))
+
+
+def bench_ghi_nen(so_luong: int = 20_000, so_lan: int = 300) -> None:
+    """Y5 liên tiếp trên file XML: ghi trực tiếp sau mỗi lần sửa so với ghi nền (gom nhóm)."""
+    ds = tao_du_lieu_gia(so_luong)
+    with tempfile.TemporaryDirectory() as thu_muc:
+        ket_qua = []
+        for ten, ghi_nen in (("trực tiếp", False), ("ghi nền", True)):
+            ql = QuanLyNhanSu()
+            ql._file_name_base = os.path.join(thu_muc, "data_nhansu")
+            ql._current_file_type = ".xml"
+            ql.luu_file(ds)
+            ql.doc_file()
+            if ghi_nen:
+                ql.bat_ghi_nen()
+            rng = random.Random(3)
+            bat_dau = time.perf_counter()
+            for _ in range(so_lan):
+                nv = ql._chi_muc_ma[rng.choice(ds).ma_nv]
+                nv.luong = nv.luong + 1000
+                ql._cap_nhat_chi_muc(nv)
+                ql._danh_dau_thay_doi(SUA, nv)
+                ql.luu_thay_doi()
+            t_cho = time.perf_counter() - bat_dau
+            ql.flush()
+            t_tong = time.perf_counter() - bat_dau
+            so_lan_ghi = ql._bo_ghi_nen.so_lan_ghi if ghi_nen else so_lan
+            ql.tat_ghi_nen()
+            ket_qua.append(f"{ten} chờ {t_cho / so_lan * 1e3:.2f} ms/lần, tổng {t_tong * 1e3:.0f} ms "
+                           f"({so_lan_ghi} lần ghi)")
+    print(f"[ghi_nen] n={so_luong:,}, {so_lan} lần sửa: " + ", ".join(ket_qua))
+
+
+def bench_api(so_luong: int = 20_000, so_ban_ghi: int = 500) -> None:
+    """API them/xoa: gọi từng nhân viên một so với gọi một lần cho cả nhóm (ghi file một lần)."""
+    ds = tao_du_lieu_gia(so_luong)
+    ban_ghi = [{"chuc_vu": "Hành Chính", "ho_ten": f"Nhân Viên {i}", "luong": 500_000 + i}
+               for i in range(so_ban_ghi)]
+    with tempfile.TemporaryDirectory() as thu_muc:
+        for dinh_dang in (".csv", ".json", ".db"):
+            ket_qua = []
+            for ten, theo_nhom in (("từng cái", False), ("cả nhóm", True)):
+                ql = QuanLyNhanSu()
+                ql._file_name_base = os.path.join(thu_muc, f"data_nhansu_{ten[:2]}")
+                ql._current_file_type = dinh_dang
+                ql.luu_file(ds)
+                ql.doc_file()
+                bat_dau = time.perf_counter()
+                if theo_nhom:
+                    cac_ma = [nv.ma_nv for nv in ql.them(ban_ghi)]
+                else:
+                    cac_ma = [ql.them(dong)[0].ma_nv for dong in ban_ghi]
+                t_them = time.perf_counter() - bat_dau
+                bat_dau = time.perf_counter()
+                if theo_nhom:
+                    ql.xoa(cac_ma)
+                else:
+                    for ma_nv in cac_ma:
+                        ql.xoa(ma_nv)
+                t_xoa = time.perf_counter() - bat_dau
+                ql.gop_nhat_ky()
+                ket_qua.append(f"{ten} thêm {t_them * 1e3:.0f} ms, xóa {t_xoa * 1e3:.0f} ms")
+            print(f"[api] {dinh_dang} n={so_luong:,}, {so_ban_ghi} nhân viên: " + ", ".join(ket_qua))
+
+
+BENCHMARKS = {
+    "khoang_luong": bench_khoang_luong,
+    "top_k": bench_top_k,
+    "bo_nho": bench_bo_nho,
+    "bang_luong": bench_bang_luong,
+    "cache": bench_cache,
+    "doc_luong": bench_doc_luong,
+    "ghi_them": bench_ghi_them,
+    "xml_tang_dan": bench_xml_tang_dan,
+    "nhat_ky": bench_nhat_ky,
+    "va_ban_ghi": bench_va_ban_ghi,
+    "nhi_phan": bench_nhi_phan,
+    "sqlite": bench_sqlite,
+    "doc_song_song": bench_doc_song_song,
+    "from_row": bench_from_row,
+    "bieu_thue": bench_bieu_thue,
+    "thong_ke": bench_thong_ke,
+    "hien_thi": bench_hien_thi,
+    "sap_xep": bench_sap_xep,
+    "tim_ten": bench_tim_ten,
+    "chuyen_doi": bench_chuyen_doi,
+    "ghi_nen": bench_ghi_nen,
+    "api": bench_api,
+}
+
+if __name__ == "__main__":
+    # Các lớp quản lý báo trạng thái qua logging: chỉ để lại cảnh báo/lỗi, không lẫn vào kết quả đo
+    for ten_logger in ("quanly", "quanlyfile", "ghinen"):
+        logging.getLogger(ten_logger).setLevel(logging.WARNING)
+    ten_cac_phep_do = sys.argv[1:] or list(BENCHMARKS)
+    for ten in ten_cac_phep_do:
+        BENCHMARKS[ten]()
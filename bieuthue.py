@@ -0,0 +1,148 @@
+"""
+Module này chứa biểu thuế thu nhập có thể cấu hình.
+- Mỗi BieuThue được biên dịch thành mảng ngưỡng đã sắp xếp; thuế của một nhân viên
+  được tính bằng bisect, của cả danh sách thì tính theo mảng (NumPy nếu có).
+- Hai cách tính: toàn phần (cả thu nhập chịu thuế suất của bậc, như quy định hiện tại)
+  và lũy tiến từng phần (mỗi phần thu nhập chịu thuế suất của bậc chứa nó).
+- bo_thue giữ biểu thuế đang áp dụng và các phiên bản theo kỳ. Mỗi biểu thuế có số
+  phiên bản riêng, cache thuế trên từng nhân viên gắn với số phiên bản này nên khi đổi
+  biểu thuế không cần duyệt lại mọi đối tượng để xóa cache.
+"""
+import math
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import count
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là tùy chọn
+    np = None
+
+_dem_phien_ban = count(1)
+
+
+class BieuThue:
+    """
+    Một biểu thuế đã biên dịch (không thay đổi sau khi tạo).\n
+    cac_bac: các bậc (muc_tu, thue_suat) hoặc (muc_tu, thue_suat, khong_gom_muc_tu).
+    Bậc áp dụng cho thu nhập từ muc_tu tới trước mức của bậc kế tiếp; khong_gom_muc_tu=True
+    nghĩa là bậc chỉ bắt đầu khi thu nhập lớn hơn hẳn muc_tu. Thu nhập dưới bậc đầu tiên
+    tính theo bậc đầu tiên.\n
+    luy_tien=False: thuế = thu nhập * thuế suất của bậc chứa thu nhập.
+    luy_tien=True: thuế = tổng từng phần thu nhập trong mỗi bậc * thuế suất của bậc đó.
+    """
+    KICH_THUOC_CACHE = 65536  # Số mức thu nhập được nhớ thuế (lru_cache), để cache không lớn mãi
+
+    def __init__(self, cac_bac, luy_tien: bool = False, ten: str = ""):
+        cac_bac = sorted(cac_bac, key=lambda bac: bac[0])
+        if not cac_bac:
+            raise ValueError("Biểu thuế phải có ít nhất một bậc.")
+        self.ten = ten
+        self.luy_tien = luy_tien
+        self.phien_ban = next(_dem_phien_ban)
+        self._muc_tu = [float(bac[0]) for bac in cac_bac]
+        self._thue_suat = [float(bac[1]) for bac in cac_bac]
+        # Ngưỡng để bisect: bậc không gồm mức bắt đầu thì dời lên số float kế tiếp
+        self._nguong = [math.nextafter(muc, math.inf) if len(bac) > 2 and bac[2] else muc
+                        for muc, bac in zip(self._muc_tu, cac_bac)]
+        # Thuế lũy tiến đã tích lũy tới đầu mỗi bậc
+        self._tich_luy = [0.0]
+        for i in range(1, len(cac_bac)):
+            self._tich_luy.append(self._tich_luy[-1]
+                                  + (self._muc_tu[i] - self._muc_tu[i - 1]) * self._thue_suat[i - 1])
+        # thu nhập -> thuế, nhiều nhân viên có cùng thu nhập; mức ít dùng nhất bị bỏ khi đầy
+        self._tinh_nho = lru_cache(maxsize=self.KICH_THUOC_CACHE)(self._tinh)
+        if np is not None:
+            self._nguong_np = np.array(self._nguong)
+            self._muc_tu_np = np.array(self._muc_tu)
+            self._thue_suat_np = np.array(self._thue_suat)
+            self._tich_luy_np = np.array(self._tich_luy)
+
+    def __repr__(self) -> str:
+        return f"BieuThue({self.ten!r}, phien_ban={self.phien_ban}, {len(self._nguong)} bậc)"
+
+    def _tinh(self, thu_nhap: float) -> float:
+        i = max(bisect_right(self._nguong, thu_nhap) - 1, 0)
+        if self.luy_tien:
+            thue = self._tich_luy[i] + (thu_nhap - self._muc_tu[i]) * self._thue_suat[i]
+        else:
+            thue = thu_nhap * self._thue_suat[i]
+        return thue or 0  # bậc 0% trả về số nguyên 0 như trước đây
+
+    def tinh(self, thu_nhap: float) -> float:
+        """Thuế của một mức thu nhập (tìm bậc bằng bisect, kết quả được nhớ lại)."""
+        return self._tinh_nho(thu_nhap)
+
+    def tinh_hang_loat(self, thu_nhap):
+        """
+        Thuế cho cả một cột thu nhập. Nhận mảng NumPy thì trả về mảng NumPy
+        (tìm bậc bằng searchsorted), nhận list thì trả về list.
+        """
+        if np is not None and isinstance(thu_nhap, np.ndarray):
+            i = np.maximum(np.searchsorted(self._nguong_np, thu_nhap, side="right") - 1, 0)
+            if self.luy_tien:
+                return self._tich_luy_np[i] + (thu_nhap - self._muc_tu_np[i]) * self._thue_suat_np[i]
+            return thu_nhap * self._thue_suat_np[i]
+        tinh = self.tinh
+        return [tinh(x) for x in thu_nhap]
+
+    def bieu_thuc_sql(self, cot: str) -> tuple[str, list[float]]:
+        """
+        Biểu thức SQL (CASE theo các ngưỡng) tính thuế từ cột thu nhập cot, cùng kết quả với tinh(),
+        và các tham số của nó. Ngưỡng truyền bằng tham số để giữ đúng giá trị float (vd: ngưỡng
+        đã dời bằng nextafter), không phụ thuộc cách SQLite đọc số thập phân.
+        """
+        cac_nhanh, tham_so = [], []
+        for i in range(len(self._nguong) - 1, -1, -1):
+            if self.luy_tien:
+                thue = f"(? + ({cot} - ?) * ?)"
+                gia_tri = [self._tich_luy[i], self._muc_tu[i], self._thue_suat[i]]
+            else:
+                thue, gia_tri = f"({cot} * ?)", [self._thue_suat[i]]
+            if i == 0:  # thu nhập dưới bậc đầu tiên cũng tính theo bậc đầu tiên
+                cac_nhanh.append(f"ELSE {thue}")
+                tham_so += gia_tri
+            else:
+                cac_nhanh.append(f"WHEN {cot} >= ? THEN {thue}")
+                tham_so += [self._nguong[i]] + gia_tri
+        if len(cac_nhanh) == 1:
+            return thue, tham_so
+        return f"(CASE {' '.join(cac_nhanh)} END)", tham_so
+
+
+# Quy định hiện tại: < 9tr: 0, 9tr-15tr (gồm 15tr): 10%, > 15tr: 12% trên toàn bộ thu nhập
+BIEU_THUE_MAC_DINH = BieuThue([(0, 0.0), (9_000_000, 0.10), (15_000_000, 0.12, True)], ten="Mặc định")
+
+
+class BoThue:
+    """Giữ biểu thuế đang áp dụng và các phiên bản biểu thuế theo kỳ (vd: "2025-01")."""
+    def __init__(self, hien_hanh: BieuThue = BIEU_THUE_MAC_DINH):
+        self.hien_hanh = hien_hanh
+        self._cac_ky: list[str] = []
+        self._theo_ky: list[BieuThue] = []
+
+    def ap_dung(self, bieu_thue: BieuThue) -> None:
+        """Đổi biểu thuế đang áp dụng. Cache thuế cũ trên các nhân viên tự hết hiệu lực."""
+        self.hien_hanh = bieu_thue
+
+    def them_phien_ban(self, tu_ky: str, bieu_thue: BieuThue) -> None:
+        """Đăng ký biểu thuế có hiệu lực từ kỳ tu_ky (chuỗi so sánh được, vd: "2025-01")."""
+        i = bisect_right(self._cac_ky, tu_ky)
+        if i and self._cac_ky[i - 1] == tu_ky:
+            self._theo_ky[i - 1] = bieu_thue
+            return
+        self._cac_ky.insert(i, tu_ky)
+        self._theo_ky.insert(i, bieu_thue)
+
+    def theo_ky(self, ky: str) -> BieuThue:
+        """Biểu thuế có hiệu lực trong kỳ ky; trước mọi phiên bản đã đăng ký thì dùng biểu mặc định."""
+        i = bisect_right(self._cac_ky, ky)
+        return self._theo_ky[i - 1] if i else BIEU_THUE_MAC_DINH
+
+    def ap_dung_theo_ky(self, ky: str) -> BieuThue:
+        """Áp dụng biểu thuế có hiệu lực trong kỳ ky và trả về biểu thuế đó."""
+        self.ap_dung(self.theo_ky(ky))
+        return self.hien_hanh
+
+
+bo_thue = BoThue()
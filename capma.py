@@ -0,0 +1,69 @@
+"""
+Module này chứa bộ cấp mã nhân viên tự động.
+- Mỗi prefix (HC, TT, TP) có một bộ đếm riêng, khởi tạo một lần khi tải dữ liệu.
+- Cấp mã mới chỉ tốn O(1), không phải duyệt lại toàn bộ danh sách.
+"""
+
+# Ánh xạ tên lớp nhân viên với prefix của mã
+PREFIX_MAP = {"HanhChinh": "HC", "TiepThi": "TT", "TruongPhong": "TP"}
+
+
+class BoCapMa:
+    """
+    Bộ cấp mã theo dãy số tăng dần cho từng prefix.\n
+    Mã có tối thiểu 4 chữ số (HC0001). Khi vượt quá 9999 thì mã tự mở rộng
+    thêm chữ số (HC10000) thay vì bị từ chối.
+    """
+    DO_RONG = 4  # Số chữ số tối thiểu của phần số thứ tự
+
+    def __init__(self):
+        self._bo_dem: dict[str, int] = {}  # prefix -> số thứ tự lớn nhất đã cấp
+
+    @staticmethod
+    def tach_ma(ma_nv: str) -> tuple[str, int] | None:
+        """Tách mã thành (prefix, số thứ tự). Trả về None nếu mã sai định dạng."""
+        if not ma_nv or len(ma_nv) < 2 + BoCapMa.DO_RONG:
+            return None
+        so = ma_nv[2:]
+        if not so.isdigit():
+            return None
+        return ma_nv[:2].upper(), int(so)
+
+    def khoi_tao(self, ds_ma) -> None:
+        """Khởi tạo lại các bộ đếm từ danh sách mã hiện có (gọi một lần khi tải file)."""
+        self._bo_dem = {}
+        for ma_nv in ds_ma:
+            self.ghi_nhan(ma_nv)
+
+    def ghi_nhan(self, ma_nv: str) -> None:
+        """Ghi nhận một mã đã được sử dụng, đẩy bộ đếm lên nếu cần."""
+        tach = self.tach_ma(ma_nv)
+        if tach is None:
+            return
+        prefix, so = tach
+        if so > self._bo_dem.get(prefix, 0):
+            self._bo_dem[prefix] = so
+
+    def _dinh_dang(self, prefix: str, so: int) -> str:
+        return f"{prefix}{so:0{self.DO_RONG}d}"
+
+    def ma_tiep_theo(self, prefix: str) -> str:
+        """Xem trước mã kế tiếp của prefix mà không tăng bộ đếm."""
+        return self._dinh_dang(prefix, self._bo_dem.get(prefix, 0) + 1)
+
+    def cap_ma(self, prefix: str) -> str:
+        """Cấp một mã mới và tăng bộ đếm."""
+        so = self._bo_dem.get(prefix, 0) + 1
+        self._bo_dem[prefix] = so
+        return self._dinh_dang(prefix, so)
+
+    def dat_truoc(self, prefix: str, so_luong: int) -> list[str]:
+        """
+        Đặt trước một khối mã liên tiếp cho việc nhập hàng loạt.
+        Bộ đếm chỉ tăng một lần cho cả khối.
+        """
+        if so_luong <= 0:
+            return []
+        bat_dau = self._bo_dem.get(prefix, 0) + 1
+        self._bo_dem[prefix] = bat_dau + so_luong - 1
+        return [self._dinh_dang(prefix, so) for so in range(bat_dau, bat_dau + so_luong)]
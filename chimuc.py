@@ -0,0 +1,81 @@
+"""
+Module này chứa các chỉ mục phụ (secondary index) cho danh sách nhân viên.
+- ChiMucSapXep: giữ mã nhân viên được sắp theo một khóa (lương, thu nhập, khóa họ tên...).
+- Truy vấn theo khoảng dùng tìm kiếm nhị phân: O(log n + k) thay vì duyệt O(n).
+- Lấy toàn bộ danh sách theo thứ tự chỉ là duyệt O(n), không phải sắp xếp lại.
+"""
+from bisect import bisect_left, bisect_right
+
+
+class ChiMucSapXep:
+    """
+    Chỉ mục sắp xếp theo một khóa của nhân viên (số hoặc giá trị so sánh được như tuple).\n
+    Lưu hai list song song: _khoa (giá trị khóa tăng dần) và _ma (mã nhân viên),
+    cùng dict ma_nv -> khóa đã lập chỉ mục để xóa/cập nhật đúng vị trí.
+    """
+    def __init__(self, ham_khoa):
+        self._ham_khoa = ham_khoa
+        self._khoa: list = []
+        self._ma: list[str] = []
+        self._gia_tri: dict = {}
+        self._giam_dan: list[str] | None = None  # thứ tự giảm dần đã tính, xóa khi chỉ mục thay đổi
+
+    def __len__(self) -> int:
+        return len(self._ma)
+
+    def xay_dung(self, danh_sach) -> None:
+        """Dựng lại toàn bộ chỉ mục từ danh sách nhân viên (một lần sắp xếp)."""
+        cap = sorted(((self._ham_khoa(nv), nv.ma_nv) for nv in danh_sach), key=lambda c: c[0])
+        self._khoa = [k for k, _ in cap]
+        self._ma = [ma for _, ma in cap]
+        self._gia_tri = {ma: k for k, ma in cap}
+        self._giam_dan = None
+
+    def them(self, nv) -> None:
+        """Chèn một nhân viên vào đúng vị trí theo khóa."""
+        khoa = self._ham_khoa(nv)
+        i = bisect_right(self._khoa, khoa)
+        self._khoa.insert(i, khoa)
+        self._ma.insert(i, nv.ma_nv)
+        self._gia_tri[nv.ma_nv] = khoa
+        self._giam_dan = None
+
+    def xoa(self, ma_nv: str) -> None:
+        """Xóa nhân viên khỏi chỉ mục theo mã (khóa cũ lấy từ _gia_tri)."""
+        khoa = self._gia_tri.pop(ma_nv, None)
+        if khoa is None:
+            return
+        # Các khóa bằng nhau nằm liền kề, dò tiếp trong đoạn đó để tìm đúng mã
+        i = bisect_left(self._khoa, khoa)
+        while self._ma[i] != ma_nv:
+            i += 1
+        del self._khoa[i]
+        del self._ma[i]
+        self._giam_dan = None
+
+    def cap_nhat(self, nv) -> None:
+        """Sắp xếp lại vị trí của nhân viên sau khi khóa của họ thay đổi."""
+        if self._gia_tri.get(nv.ma_nv) == self._ham_khoa(nv):
+            return
+        self.xoa(nv.ma_nv)
+        self.them(nv)
+
+    def khoang(self, nho_nhat: float, lon_nhat: float) -> list[str]:
+        """Trả về mã các nhân viên có khóa trong đoạn [nho_nhat, lon_nhat], theo khóa tăng dần."""
+        dau = bisect_left(self._khoa, nho_nhat)
+        cuoi = bisect_right(self._khoa, lon_nhat)
+        return self._ma[dau:cuoi]
+
+    def theo_thu_tu(self, giam_dan: bool = False) -> list[str]:
+        """
+        Mã mọi nhân viên theo khóa tăng dần (hoặc giảm dần). Các khóa bằng nhau luôn
+        giữ thứ tự đã lập chỉ mục, giống sorted(..., reverse=True) vốn ổn định.
+        Thứ tự giảm dần được nhớ lại cho tới lần thêm/xóa kế tiếp.
+        """
+        if not giam_dan:
+            return self._ma[:]
+        if self._giam_dan is None:
+            # Timsort nhận ra dãy đã sắp nên lượt sắp xếp ổn định này chỉ tốn O(n)
+            thu_tu = sorted(range(len(self._khoa)), key=self._khoa.__getitem__, reverse=True)
+            self._giam_dan = [self._ma[i] for i in thu_tu]
+        return self._giam_dan[:]
@@ -0,0 +1,93 @@
+"""
+Module này chứa hàm convert: chuyển dữ liệu nhân viên giữa các định dạng file.
+- Đọc dần từ handler nguồn (iter_read) và ghi dần bằng handler đích (ghi_luong) theo
+  từng lô, nên bộ nhớ dùng không phụ thuộc số nhân viên trong file.
+- File đích được ghi atomic: lỗi giữa chừng thì file đích cũ vẫn còn nguyên.
+- In tiến độ trong lúc chuyển và tốc độ (bản ghi/giây) khi xong.
+"""
+import os
+import sqlite3
+import sys
+import time
+import xml.etree.ElementTree as ETree
+
+from nhatky import NhatKy
+from quanlyfile import QuanLyTxt, QuanLyCsv, QuanLyJson, QuanLyXml, QuanLyBin, QuanLySqlite
+
+CAC_DINH_DANG = {
+    ".txt": QuanLyTxt,
+    ".csv": QuanLyCsv,
+    ".json": QuanLyJson,
+    ".xml": QuanLyXml,
+    ".bin": QuanLyBin,
+    ".db": QuanLySqlite,
+}
+KHOANG_IN_TIEN_DO = 0.5  # Số giây tối thiểu giữa hai lần in tiến độ
+# Lỗi đọc/ghi có thể gặp khi chuyển đổi (file hỏng, sai định dạng, lỗi CSDL...)
+LOI_CHUYEN_DOI = (OSError, ValueError, KeyError, ETree.ParseError, sqlite3.Error)
+
+
+def _chuan_dinh_dang(dinh_dang: str) -> str:
+    """"csv", ".CSV" -> ".csv"; báo lỗi nếu không phải định dạng được hỗ trợ."""
+    dinh_dang = "." + dinh_dang.lower().lstrip(".")
+    if dinh_dang not in CAC_DINH_DANG:
+        raise ValueError(f"Không hỗ trợ định dạng '{dinh_dang}', chọn một trong {tuple(CAC_DINH_DANG)}.")
+    return dinh_dang
+
+
+def chuyen_luong(nguon, handler_dich, file_dich: str, kich_thuoc_lo: int | None = None,
+                 in_tien_do: bool = True, out=None) -> tuple[int, float]:
+    """
+    Ghi một nguồn nhân viên (iterator) vào file_dich bằng handler_dich theo từng lô.\n
+    Xóa nhật ký cũ của file đích (nếu có) để lần đọc sau không áp dụng nhầm lên dữ liệu mới.
+    Trả về (số bản ghi, số giây).
+    """
+    out = out if out is not None else sys.stdout
+    bat_dau = time.perf_counter()
+    lan_in_cuoi = bat_dau
+
+    def bao_tien_do(so_ban_ghi: int) -> None:
+        nonlocal lan_in_cuoi
+        bay_gio = time.perf_counter()
+        if bay_gio - lan_in_cuoi >= KHOANG_IN_TIEN_DO:
+            lan_in_cuoi = bay_gio
+            out.write(f"\r  Đã chuyển {so_ban_ghi:,} bản ghi ({so_ban_ghi / (bay_gio - bat_dau):,.0f} bản ghi/s)")
+            out.flush()
+
+    so_ban_ghi = handler_dich.ghi_luong(file_dich, nguon, kich_thuoc_lo, bao_tien_do if in_tien_do else None)
+    thoi_gian = time.perf_counter() - bat_dau
+    NhatKy(file_dich).xoa()
+    if in_tien_do:
+        toc_do = so_ban_ghi / thoi_gian if thoi_gian > 0 else 0.0
+        out.write(f"\r  Đã chuyển {so_ban_ghi:,} bản ghi vào '{file_dich}' trong {thoi_gian:.2f}s "
+                  f"({toc_do:,.0f} bản ghi/s).\n")
+        out.flush()
+    return so_ban_ghi, thoi_gian
+
+
+def convert(src_format: str, dst_format: str, file_name_base: str = "data_nhansu", src_path: str | None = None,
+            dst_path: str | None = None, kich_thuoc_lo: int | None = None, in_tien_do: bool = True) -> tuple[int, float]:
+    """
+    Chuyển file nhân viên từ định dạng src_format sang dst_format (vd: ".xml" -> ".csv").\n
+    - Mặc định đọc file_name_base + src_format và ghi đè file_name_base + dst_format;
+      src_path/dst_path để chỉ định đường dẫn khác.
+    - kich_thuoc_lo: số nhân viên mỗi lô ghi (mặc định theo handler đích).\n
+    Trả về (số bản ghi đã chuyển, số giây); (0, 0.0) nếu không chuyển được.
+    """
+    src_format, dst_format = _chuan_dinh_dang(src_format), _chuan_dinh_dang(dst_format)
+    src_path = src_path or file_name_base + src_format
+    dst_path = dst_path or file_name_base + dst_format
+    if os.path.abspath(src_path) == os.path.abspath(dst_path):
+        print("File nguồn và file đích trùng nhau, không cần chuyển đổi.")
+        return 0, 0.0
+    if not os.path.exists(src_path):
+        print(f"File '{src_path}' không tồn tại.")
+        return 0, 0.0
+    if in_tien_do:
+        print(f"Đang chuyển '{src_path}' -> '{dst_path}'...")
+    try:
+        return chuyen_luong(CAC_DINH_DANG[src_format]().iter_read(src_path), CAC_DINH_DANG[dst_format](),
+                            dst_path, kich_thuoc_lo, in_tien_do)
+    except LOI_CHUYEN_DOI as e:
+        print(f"\nLỗi khi chuyển '{src_path}' sang '{dst_path}': {e}. File đích không bị thay đổi.")
+        return 0, 0.0
@@ -0,0 +1,135 @@
+"""
+Module này chứa DanhSachCot: cách lưu danh sách nhân viên dạng cột (struct-of-arrays).
+- Mỗi trường số được lưu trong một array('d') liền mạch thay vì mỗi nhân viên một đối tượng.
+- Chức vụ lưu thành mã số 1 byte, họ tên và mã nhân viên lưu trong list chuỗi.
+- Truy cập từng dòng trả về một "view" vẫn là HanhChinh/TiepThi/TruongPhong,
+  nên các hàm xử lý hiện có (xuất thông tin, ghi file...) dùng được bình thường.
+"""
+from array import array
+
+from nhansu import HanhChinh, TiepThi, TruongPhong
+
+# Mã chức vụ lưu trong cột 'chuc_vu' và lớp tương ứng
+MA_CHUC_VU = {HanhChinh: 0, TiepThi: 1, TruongPhong: 2}
+
+
+def _cot(ten: str):
+    """Tạo property đọc/ghi trực tiếp vào cột `ten` tại dòng của view."""
+    def doc(self):
+        return getattr(self._bang, ten)[self._i]
+
+    def ghi(self, value):
+        getattr(self._bang, ten)[self._i] = value
+
+    return property(doc, ghi)
+
+
+# View không giữ cache thu nhập/thuế vì cột có thể bị ghi trực tiếp mà view không biết
+_KHONG_CACHE = property(lambda self: None, lambda self, value: None)
+
+
+class _ViewHanhChinh(HanhChinh):
+    """View của một dòng hành chính trong DanhSachCot."""
+    __slots__ = ("_bang", "_i")
+    _thu_nhap_cache = _thue_cache = _KHONG_CACHE
+    _ma_nv = _cot("ma_nv")
+    _ho_ten = _cot("ho_ten")
+    _luong = _cot("luong")
+
+
+class _ViewTiepThi(TiepThi):
+    """View của một dòng tiếp thị trong DanhSachCot."""
+    __slots__ = ("_bang", "_i")
+    _thu_nhap_cache = _thue_cache = _KHONG_CACHE
+    _ma_nv = _cot("ma_nv")
+    _ho_ten = _cot("ho_ten")
+    _luong = _cot("luong")
+    _doanh_so = _cot("doanh_so")
+    _hoa_hong = _cot("hoa_hong")
+
+
+class _ViewTruongPhong(TruongPhong):
+    """View của một dòng trưởng phòng trong DanhSachCot."""
+    __slots__ = ("_bang", "_i")
+    _thu_nhap_cache = _thue_cache = _KHONG_CACHE
+    _ma_nv = _cot("ma_nv")
+    _ho_ten = _cot("ho_ten")
+    _luong = _cot("luong")
+    _luong_trach_nhiem = _cot("luong_trach_nhiem")
+
+
+_VIEW_THEO_MA = (_ViewHanhChinh, _ViewTiepThi, _ViewTruongPhong)
+
+
+class DanhSachCot:
+    """
+    Danh sách nhân viên lưu theo cột.\n
+    Các cột: ma_nv, ho_ten (list chuỗi), chuc_vu (array 'b' mã chức vụ),
+    luong, doanh_so, hoa_hong, luong_trach_nhiem (array 'd').
+    Trường không áp dụng cho loại nhân viên được lưu là 0.0.
+    """
+    def __init__(self):
+        self.ma_nv: list[str] = []
+        self.ho_ten: list[str] = []
+        self.chuc_vu = array('b')
+        self.luong = array('d')
+        self.doanh_so = array('d')
+        self.hoa_hong = array('d')
+        self.luong_trach_nhiem = array('d')
+        self._vi_tri: dict[str, int] | None = None  # ma_nv -> số thứ tự dòng, dựng khi cần
+
+    @classmethod
+    def tu_danh_sach(cls, danh_sach) -> "DanhSachCot":
+        """Chuyển một danh sách đối tượng nhân viên sang dạng cột."""
+        bang = cls()
+        for nv in danh_sach:
+            bang.them(nv)
+        return bang
+
+    def __len__(self) -> int:
+        return len(self.ma_nv)
+
+    def __getitem__(self, i: int):
+        """Trả về view của dòng thứ i (ghi qua setter của view sẽ ghi thẳng vào cột)."""
+        if i < 0:
+            i += len(self.ma_nv)
+        if not 0 <= i < len(self.ma_nv):
+            raise IndexError("Chỉ số dòng vượt quá kích thước danh sách.")
+        view = _VIEW_THEO_MA[self.chuc_vu[i]].__new__(_VIEW_THEO_MA[self.chuc_vu[i]])
+        view._bang = self
+        view._i = i
+        return view
+
+    def __iter__(self):
+        for i in range(len(self.ma_nv)):
+            yield self[i]
+
+    def them(self, nv) -> None:
+        """Thêm một nhân viên (đối tượng hoặc view) vào cuối các cột."""
+        if self._vi_tri is not None:
+            self._vi_tri[nv.ma_nv] = len(self.ma_nv)
+        self.ma_nv.append(nv.ma_nv)
+        self.ho_ten.append(nv.ho_ten)
+        self.luong.append(nv.luong)
+        if isinstance(nv, TiepThi):
+            self.chuc_vu.append(MA_CHUC_VU[TiepThi])
+            self.doanh_so.append(nv.doanh_so)
+            self.hoa_hong.append(nv.hoa_hong)
+            self.luong_trach_nhiem.append(0.0)
+        elif isinstance(nv, TruongPhong):
+            self.chuc_vu.append(MA_CHUC_VU[TruongPhong])
+            self.doanh_so.append(0.0)
+            self.hoa_hong.append(0.0)
+            self.luong_trach_nhiem.append(nv.luong_trach_nhiem)
+        else:
+            self.chuc_vu.append(MA_CHUC_VU[HanhChinh])
+            self.doanh_so.append(0.0)
+            self.hoa_hong.append(0.0)
+            self.luong_trach_nhiem.append(0.0)
+
+    def tim(self, ma_nv: str):
+        """Tìm view của nhân viên theo mã, trả về None nếu không có."""
+        if self._vi_tri is None:
+            self._vi_tri = {ma: i for i, ma in enumerate(self.ma_nv)}
+        i = self._vi_tri.get(ma_nv)
+        return None if i is None else self[i]
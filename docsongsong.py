@@ -0,0 +1,171 @@
+"""
+Module này chứa bộ đọc song song cho file .txt/.csv lớn.
+- File được chia thành các khối byte, mỗi khối kết thúc đúng ở cuối một dòng
+  (với .csv là cuối một bản ghi, không cắt giữa ô nhiều dòng trong ngoặc kép).
+- Các khối được phân tích trong ProcessPoolExecutor, mỗi tiến trình trả về dữ liệu
+  dạng cột gọn (chuỗi nối và bytes của array) thay vì pickle từng đối tượng nhân viên.
+- Kết quả được ghép theo đúng thứ tự khối thành một DanhSachCot.
+"""
+import csv
+import io
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from danhsachcot import DanhSachCot, MA_CHUC_VU
+from nhansu import TiepThi, TruongPhong, tao_hang_loat
+
+KICH_THUOC_KHOI = 16 * 1024 * 1024  # Kích thước mặc định của một khối (byte)
+
+# Tên chức vụ trong file -> (lớp, mã chức vụ của DanhSachCot)
+_LOP_THEO_TEN = {lop.chuc_vu: (lop, ma) for lop, ma in MA_CHUC_VU.items()}
+_MA_TIEP_THI = MA_CHUC_VU[TiepThi]
+_MA_TRUONG_PHONG = MA_CHUC_VU[TruongPhong]
+
+
+def chia_khoi(file_path: str, kich_thuoc_khoi: int = KICH_THUOC_KHOI, la_csv: bool = False) -> list[tuple[int, int]]:
+    """
+    Chia file thành các đoạn byte [bắt đầu, kết thúc) khoảng kich_thuoc_khoi, cắt tại cuối dòng.\n
+    Với .csv, một ô trong ngoặc kép có thể chứa xuống dòng nên điểm cắt phải nằm ngoài ngoặc:
+    đếm dấu '"' từ đầu file (ngoặc kép trong ô được nhân đôi nên không đổi tính chẵn lẻ),
+    chỉ cắt ở cuối dòng khi số dấu đã gặp là chẵn.
+    """
+    kich_thuoc = os.path.getsize(file_path)
+    cac_khoi, bat_dau = [], 0
+    with open(file_path, "rb") as f:
+        while bat_dau < kich_thuoc:
+            if la_csv:
+                f.seek(bat_dau)
+                trong_ngoac = f.read(kich_thuoc_khoi).count(b'"') & 1
+                while True:
+                    dong = f.readline()  # đi tiếp tới hết dòng đang dở
+                    trong_ngoac ^= dong.count(b'"') & 1
+                    if not trong_ngoac or not dong:
+                        break
+            else:
+                f.seek(min(bat_dau + kich_thuoc_khoi, kich_thuoc))
+                f.readline()  # đi tiếp tới hết dòng đang dở
+            ket_thuc = min(f.tell(), kich_thuoc)
+            cac_khoi.append((bat_dau, ket_thuc))
+            bat_dau = ket_thuc
+    return cac_khoi
+
+
+def _goi_chuoi(cac_chuoi: list[str]) -> str | list[str]:
+    """Nối các chuỗi bằng '\\n' để gửi về gọn, giữ nguyên list nếu có chuỗi chứa '\\n' (ô .csv nhiều dòng)."""
+    chuoi = "\n".join(cac_chuoi)
+    return chuoi if chuoi.count("\n") == len(cac_chuoi) - 1 else cac_chuoi
+
+
+def _mo_chuoi(goi: str | list[str]) -> list[str]:
+    return goi.split("\n") if isinstance(goi, str) else goi
+
+
+def _tach_cot(van_ban: str, la_csv: bool, so_cot: int):
+    """
+    Tách một khối văn bản thành các dòng đã chia cột, theo đúng cách read() đọc file:\n
+    - .txt: dòng kết thúc bằng \\n, \\r\\n hoặc \\r như khi mở file ở chế độ văn bản (không tách
+      ở U+2028 như str.splitlines), bỏ dòng trống/bia mộ và dòng ít hơn 4 cột, thiếu cột
+      thông tin thêm thì coi là '0'.
+    - .csv: đọc như csv.DictReader, bỏ dòng trống/bia mộ, ô thiếu là None.
+    """
+    if la_csv:
+        for cot in csv.reader(io.StringIO(van_ban, newline="")):
+            if cot:
+                yield cot + [None] * (so_cot - len(cot))
+        return
+    for dong in io.StringIO(van_ban, newline=None):
+        dong = dong.strip()
+        if not dong:
+            continue
+        cot = dong.split(",")
+        if len(cot) >= 4:
+            yield cot + ["0"] * (so_cot - len(cot))
+
+
+def phan_tich_khoi(file_path: str, bat_dau: int, ket_thuc: int, la_csv: bool, vi_tri_cot: tuple) -> tuple:
+    """
+    Phân tích một khối dòng (chạy trong tiến trình con), cho cùng kết quả với read().\n
+    vi_tri_cot là chỉ số các cột (ma_nv, ho_ten, chuc_vu, luong, doanh_so, hoa_hong,
+    luong_trach_nhiem). Dòng tiêu đề, dòng trống/bia mộ và dòng có chức vụ lạ bị bỏ qua;
+    dòng có họ tên trống hoặc số sai được tạo qua setter như read() (báo lỗi, đặt giá trị
+    mặc định). Mã trùng được giữ theo thứ tự trong file như read(), DanhSachCot.tim lấy dòng sau cùng.
+    Trả về (ma_nv và ho_ten nối bằng '\\n' qua _goi_chuoi, rồi bytes của các cột chuc_vu,
+    luong, doanh_so, hoa_hong, luong_trach_nhiem).
+    """
+    with open(file_path, "rb") as f:
+        f.seek(bat_dau)
+        van_ban = f.read(ket_thuc - bat_dau).decode("utf-8")
+
+    i_ma, i_ten, i_chuc_vu, i_luong, i_doanh_so, i_hoa_hong, i_ltn = vi_tri_cot
+    ma_nv, ho_ten = [], []
+    chuc_vu = array("b")
+    luong, doanh_so, hoa_hong, luong_trach_nhiem = array("d"), array("d"), array("d"), array("d")
+    for cot in _tach_cot(van_ban, la_csv, max(vi_tri_cot) + 1):
+        lop_ma = _LOP_THEO_TEN.get(cot[i_chuc_vu])
+        if lop_ma is None:
+            continue
+        lop, ma_chuc_vu = lop_ma
+        ten = cot[i_ten]
+        try:
+            if not ten.strip():
+                raise ValueError(ten)
+            gia_tri_luong, ds, hh, ltn = (float(cot[i_luong]), float(cot[i_doanh_so]),
+                                          float(cot[i_hoa_hong]), float(cot[i_ltn]))
+        except (ValueError, TypeError, AttributeError):
+            nv = tao_hang_loat([(lop, cot[i_ma], ten, cot[i_luong], cot[i_doanh_so],
+                                 cot[i_hoa_hong], cot[i_ltn])])[0]
+            ten = nv.ho_ten or ""  # cột họ tên chỉ chứa chuỗi
+            gia_tri_luong = nv.luong
+            ds, hh = (nv.doanh_so, nv.hoa_hong) if ma_chuc_vu == _MA_TIEP_THI else (0.0, 0.0)
+            ltn = nv.luong_trach_nhiem if ma_chuc_vu == _MA_TRUONG_PHONG else 0.0
+        if ma_chuc_vu != _MA_TIEP_THI:
+            ds = hh = 0.0
+        if ma_chuc_vu != _MA_TRUONG_PHONG:
+            ltn = 0.0
+        ma_nv.append(cot[i_ma])
+        ho_ten.append(ten)
+        chuc_vu.append(ma_chuc_vu)
+        luong.append(gia_tri_luong)
+        doanh_so.append(ds)
+        hoa_hong.append(hh)
+        luong_trach_nhiem.append(ltn)
+    return (_goi_chuoi(ma_nv), _goi_chuoi(ho_ten), chuc_vu.tobytes(), luong.tobytes(),
+            doanh_so.tobytes(), hoa_hong.tobytes(), luong_trach_nhiem.tobytes())
+
+
+def _ghep(bang: DanhSachCot, ket_qua: tuple) -> None:
+    """Nối kết quả của một khối vào cuối bảng."""
+    ma_nv, ho_ten, chuc_vu, luong, doanh_so, hoa_hong, luong_trach_nhiem = ket_qua
+    if not chuc_vu:
+        return
+    bang.ma_nv.extend(_mo_chuoi(ma_nv))
+    bang.ho_ten.extend(_mo_chuoi(ho_ten))
+    bang.chuc_vu.frombytes(chuc_vu)
+    bang.luong.frombytes(luong)
+    bang.doanh_so.frombytes(doanh_so)
+    bang.hoa_hong.frombytes(hoa_hong)
+    bang.luong_trach_nhiem.frombytes(luong_trach_nhiem)
+
+
+def doc_song_song(file_path: str, la_csv: bool, vi_tri_cot: tuple, so_tien_trinh: int | None = None,
+                  kich_thuoc_khoi: int = KICH_THUOC_KHOI) -> DanhSachCot:
+    """
+    Đọc file .txt/.csv bằng nhiều tiến trình và trả về DanhSachCot theo đúng thứ tự dòng.\n
+    - so_tien_trinh: số tiến trình (mặc định bằng số CPU); 1 thì đọc ngay trong tiến trình hiện tại.
+    - kich_thuoc_khoi: số byte mỗi khối giao cho một tiến trình.
+    """
+    bang = DanhSachCot()
+    cac_khoi = chia_khoi(file_path, kich_thuoc_khoi, la_csv)
+    so_tien_trinh = min(so_tien_trinh or os.cpu_count() or 1, len(cac_khoi))
+    if so_tien_trinh <= 1:
+        for bat_dau, ket_thuc in cac_khoi:
+            _ghep(bang, phan_tich_khoi(file_path, bat_dau, ket_thuc, la_csv, vi_tri_cot))
+        return bang
+    n = len(cac_khoi)
+    with ProcessPoolExecutor(max_workers=so_tien_trinh) as pool:
+        # map trả kết quả theo thứ tự khối nên ghép lại vẫn đúng thứ tự trong file
+        for ket_qua in pool.map(phan_tich_khoi, [file_path] * n, [bd for bd, _ in cac_khoi],
+                                [kt for _, kt in cac_khoi], [la_csv] * n, [vi_tri_cot] * n):
+            _ghep(bang, ket_qua)
+    return bang
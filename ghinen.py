@@ -0,0 +1,127 @@
+"""
+Module này chứa BoGhiNen: ghi thay đổi xuống file trên một luồng nền (write-behind).
+- Thao tác thêm/sửa/xóa được đưa vào hàng đợi rồi trả về ngay, không chờ ghi file.
+- Hàng đợi có giới hạn: khi đầy thì bên gửi phải chờ luồng ghi (backpressure)
+  thay vì dồn thay đổi không giới hạn trong bộ nhớ.
+- Luồng ghi lấy một thao tác rồi chờ thêm một khoảng ngắn để gom các thao tác tới liền
+  sau, gộp theo mã nhân viên và ghi cả nhóm trong một lần.
+- Mỗi thao tác mang theo nơi ghi (handler, file, nhật ký) lấy lúc gửi, nên đổi file
+  đang làm việc không làm các thao tác còn chờ bị ghi nhầm sang file mới.
+- flush() chờ mọi thao tác đã gửi được ghi xong (và ném lại lỗi ghi nếu có);
+  dong() flush rồi dừng luồng ghi, lỗi ghi cũng được ném lại.
+"""
+import copy
+import logging
+import queue
+import threading
+import time
+from itertools import groupby
+
+from nhatky import SUA, THEM, XOA
+
+log = logging.getLogger(__name__)
+
+
+class BoGhiNen:
+    """
+    Luồng ghi nền cho các thay đổi của danh sách nhân viên.\n
+    ghi(thay_doi, dich) được gọi trên luồng nền với dict ma_nv -> (thao tác, nhân viên) đã gộp
+    của các thao tác liền nhau có cùng nơi ghi dich (giá trị truyền vào gui).
+    Nhân viên được sao lại lúc gửi nên việc sửa tiếp đối tượng gốc không ảnh hưởng
+    tới bản đang chờ ghi.
+    """
+    KICH_THUOC_HANG_DOI = 1024  # Số thao tác tối đa chờ ghi
+    THOI_GIAN_GOM = 0.05        # Số giây chờ gom thêm thao tác sau thao tác đầu tiên của nhóm
+    _DUNG = object()            # Đánh dấu dừng luồng ghi
+
+    def __init__(self, ghi, kich_thuoc_hang_doi: int | None = None, thoi_gian_gom: float | None = None):
+        self._ghi = ghi
+        self._kich_thuoc_nhom = kich_thuoc_hang_doi or self.KICH_THUOC_HANG_DOI
+        self._hang_doi = queue.Queue(self._kich_thuoc_nhom)
+        self._thoi_gian_gom = self.THOI_GIAN_GOM if thoi_gian_gom is None else thoi_gian_gom
+        self.loi: Exception | None = None  # Lỗi ghi gần nhất, ném lại ở lần flush sau
+        self.so_lan_ghi = 0                # Số nhóm đã ghi
+        self._luong = threading.Thread(target=self._chay, name="BoGhiNen", daemon=True)
+        self._luong.start()
+
+    @property
+    def dang_cho(self) -> bool:
+        """Còn thao tác đã gửi mà chưa ghi xong."""
+        return self._hang_doi.unfinished_tasks > 0
+
+    def gui(self, thao_tac: str, nv, dich=None) -> None:
+        """Gửi một thao tác (THEM, SUA, XOA) để ghi nền vào nơi ghi dich; chờ nếu hàng đợi đã đầy."""
+        if not self._luong.is_alive():
+            raise RuntimeError("Bộ ghi nền đã dừng.")
+        self._hang_doi.put((dich, thao_tac, nv if thao_tac == XOA else copy.copy(nv)))
+
+    def flush(self) -> None:
+        """Chờ tới khi mọi thao tác đã gửi được ghi xong. Ném lại lỗi nếu có lần ghi bị lỗi."""
+        self._hang_doi.join()
+        loi, self.loi = self.loi, None
+        if loi is not None:
+            raise loi
+
+    def dong(self) -> None:
+        """Ghi nốt các thao tác còn lại rồi dừng luồng ghi. Ném lại lỗi ghi như flush() (luồng vẫn được dừng)."""
+        if not self._luong.is_alive():
+            return
+        try:
+            self.flush()
+        finally:
+            self._hang_doi.put(self._DUNG)
+            self._luong.join()
+
+    @staticmethod
+    def gop(cac_thao_tac) -> dict:
+        """
+        Gộp các thao tác theo mã (thứ tự theo thao tác cuối cùng, riêng thêm giữ thứ tự thêm):
+        thêm rồi sửa -> thêm bản mới nhất, thêm rồi xóa -> bỏ cả hai, sửa rồi xóa -> xóa,
+        xóa rồi thêm lại cùng mã -> sửa (bản ghi cũ vẫn còn trong file).
+        """
+        thay_doi = {}
+        for thao_tac, nv in cac_thao_tac:
+            cu = thay_doi.get(nv.ma_nv)
+            if cu is not None and cu[0] == THEM:
+                if thao_tac == XOA:
+                    del thay_doi[nv.ma_nv]  # chưa ghi xuống file nên không cần ghi rồi lại xóa
+                else:
+                    thay_doi[nv.ma_nv] = (THEM, nv)  # giữ chỗ để thứ tự ghi thêm đúng thứ tự thêm
+                continue
+            if cu is not None and cu[0] == XOA and thao_tac == THEM:
+                thao_tac = SUA  # ghi thêm sẽ để lại hai dòng cùng mã, thay dòng cũ thì đúng
+            thay_doi.pop(nv.ma_nv, None)
+            thay_doi[nv.ma_nv] = (thao_tac, nv)
+        return thay_doi
+
+    def _lay_nhom(self) -> list:
+        """Chờ thao tác đầu tiên rồi gom thêm các thao tác tới trong THOI_GIAN_GOM giây."""
+        nhom = [self._hang_doi.get()]
+        han = time.monotonic() + self._thoi_gian_gom
+        while nhom[-1] is not self._DUNG and len(nhom) < self._kich_thuoc_nhom:
+            con_lai = han - time.monotonic()
+            try:
+                nhom.append(self._hang_doi.get(timeout=con_lai) if con_lai > 0 else self._hang_doi.get_nowait())
+            except queue.Empty:
+                break
+        return nhom
+
+    def _chay(self) -> None:
+        """Vòng lặp của luồng ghi."""
+        while True:
+            nhom = self._lay_nhom()
+            dung = nhom[-1] is self._DUNG
+            try:
+                # Các thao tác liền nhau cùng nơi ghi được gộp và ghi trong một lần
+                for dich, doan in groupby(nhom[:-1] if dung else nhom, key=lambda muc: muc[0]):
+                    try:
+                        self._ghi(self.gop(muc[1:] for muc in doan), dich)
+                        self.so_lan_ghi += 1
+                    except Exception as e:
+                        self.loi = e
+                        log.error("Lỗi khi ghi nền: %s", e)
+            finally:
+                for _ in nhom:
+                    self._hang_doi.task_done()
+            if dung:
+                return
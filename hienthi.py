@@ -0,0 +1,119 @@
+"""
+Module này chứa bộ hiển thị danh sách nhân viên dạng bảng.
+- Các dòng được định dạng theo lô vào một bộ đệm rồi ghi ra một lần mỗi lô,
+  thay vì mỗi dòng một lần print.
+- Thu nhập/thuế được tính hàng loạt cho đúng các dòng sẽ hiển thị (theo limit/offset).
+- Hỗ trợ phân trang khi xem trên terminal và các định dạng máy đọc được (csv, jsonl).
+- xuat_danh_sach: xuất ra màn hình cho menu (kèm tiêu đề, tự phân trang).
+"""
+import csv
+import io
+import json
+import sys
+from itertools import islice
+
+from bangluong import tinh_bang_luong
+from nhansu import TiepThi, TruongPhong
+
+TIEU_DE_BANG = (f"{'Mã NV':<6}| {'Họ Tên':<30}| {'Chức Vụ':<13}| {'Lương':<16}| {'Doanh số':<16}| "
+                f"{'Hoa hồng':<10}| {'Lương trách nhiệm':<18}| {'Thu Nhập':<16}| {'Thuế TN':<16}")
+COT_MAY_DOC = ("ma_nv", "ho_ten", "chuc_vu", "luong", "doanh_so", "hoa_hong", "luong_trach_nhiem",
+               "thu_nhap", "thue_tn")
+DINH_DANG = ("bang", "csv", "jsonl")
+DONG_MOI_LO = 4096       # Số dòng định dạng vào bộ đệm trước mỗi lần ghi
+KICH_THUOC_TRANG = 50    # Số dòng mỗi trang khi phân trang
+
+
+def _cac_lo(danh_sach, offset: int, limit: int | None):
+    """Lấy lần lượt từng lô (list) nhân viên trong đoạn [offset, offset + limit) của nguồn."""
+    het = None if limit is None else offset + limit
+    if isinstance(danh_sach, list):
+        danh_sach = danh_sach[offset:het]
+        for i in range(0, len(danh_sach), DONG_MOI_LO):
+            yield danh_sach[i:i + DONG_MOI_LO]
+        return
+    nguon = islice(danh_sach, offset, het)
+    while lo := list(islice(nguon, DONG_MOI_LO)):
+        yield lo
+
+
+def _gia_tri_cot(nv, thu_nhap: float, thue: float) -> tuple:
+    """Các giá trị theo COT_MAY_DOC (trường không áp dụng là 0.0)."""
+    la_tiep_thi = isinstance(nv, TiepThi)
+    return (nv.ma_nv, nv.ho_ten, nv.chuc_vu, nv.luong,
+            nv.doanh_so if la_tiep_thi else 0.0, nv.hoa_hong if la_tiep_thi else 0.0,
+            nv.luong_trach_nhiem if isinstance(nv, TruongPhong) else 0.0, thu_nhap, thue)
+
+
+def _dinh_dang_lo(lo: list, dinh_dang: str) -> str:
+    """Định dạng một lô nhân viên thành một chuỗi (kết thúc bằng xuống dòng)."""
+    bang_luong = tinh_bang_luong(lo)
+    cac_cap = zip(lo, bang_luong.thu_nhap, bang_luong.thue_thu_nhap)
+    if dinh_dang == "bang":
+        return "".join([nv.dong_thong_tin(thu_nhap, thue) + "\n" for nv, thu_nhap, thue in cac_cap])
+    if dinh_dang == "csv":
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(_gia_tri_cot(*cap) for cap in cac_cap)
+        return buf.getvalue()
+    return "".join([json.dumps(dict(zip(COT_MAY_DOC, _gia_tri_cot(*cap))), ensure_ascii=False) + "\n"
+                    for cap in cac_cap])
+
+
+def xuat_bang(danh_sach, out=None, offset: int = 0, limit: int | None = None, dinh_dang: str = "bang",
+              tieu_de: bool = True) -> int:
+    """
+    Ghi danh sách nhân viên (list, DanhSachCot hoặc iterator) ra out (mặc định sys.stdout).\n
+    - offset/limit: chỉ xuất các dòng từ vị trí offset, tối đa limit dòng.
+    - dinh_dang: "bang" (bảng căn cột như màn hình), "csv" hoặc "jsonl" (mỗi dòng một object JSON).
+    - tieu_de: ghi dòng tiêu đề (bảng, csv).\n
+    Mỗi lô DONG_MOI_LO dòng được ghép thành một chuỗi và ghi một lần. Trả về số dòng đã xuất.
+    """
+    if dinh_dang not in DINH_DANG:
+        raise ValueError(f"Không hỗ trợ định dạng '{dinh_dang}', chọn một trong {DINH_DANG}.")
+    out = out if out is not None else sys.stdout
+    if tieu_de and dinh_dang == "bang":
+        out.write(TIEU_DE_BANG + "\n")
+    elif tieu_de and dinh_dang == "csv":
+        out.write(",".join(COT_MAY_DOC) + "\n")
+    so_dong = 0
+    for lo in _cac_lo(danh_sach, offset, limit):
+        out.write(_dinh_dang_lo(lo, dinh_dang))
+        so_dong += len(lo)
+    out.flush()
+    return so_dong
+
+
+def phan_trang(danh_sach, kich_thuoc_trang: int = KICH_THUOC_TRANG, out=None) -> None:
+    """
+    Xem danh sách theo từng trang trên terminal.\n
+    Enter: trang sau, b: trang trước, số: tới trang đó, q: thoát.
+    Mỗi trang chỉ định dạng và tính thu nhập/thuế cho các dòng của trang đó.
+    """
+    so_trang = max((len(danh_sach) + kich_thuoc_trang - 1) // kich_thuoc_trang, 1)
+    trang = 0
+    while True:
+        xuat_bang(danh_sach, out, offset=trang * kich_thuoc_trang, limit=kich_thuoc_trang)
+        lenh = input(f"-- Trang {trang + 1}/{so_trang} (Enter: tiếp, b: trước, số: tới trang, q: thoát) ").strip().lower()
+        if lenh == "q":
+            return
+        if lenh == "b":
+            trang = max(trang - 1, 0)
+        elif lenh.isdigit():
+            trang = min(max(int(lenh) - 1, 0), so_trang - 1)
+        elif trang + 1 < so_trang:
+            trang += 1
+        else:
+            return
+
+
+def xuat_danh_sach(danh_sach, offset: int = 0, limit: int | None = None) -> None:
+    """Xuất danh sách nhân viên ra màn hình kèm tiêu đề, phân trang khi xem cả danh sách dài trên terminal."""
+    if not danh_sach:
+        print("Danh sách nhân viên trống.")
+        return
+    print(f"\n--- Danh sách nhân viên ({len(danh_sach)} nhân viên) ---")
+    if offset == 0 and limit is None and len(danh_sach) > KICH_THUOC_TRANG and sys.stdin.isatty() \
+            and sys.stdout.isatty():
+        phan_trang(danh_sach)
+        return
+    xuat_bang(danh_sach, offset=offset, limit=limit)
@@ -2,15 +2,77 @@
 Module này định nghĩa các lớp đối tượng cho các loại nhân sự trong công ty.
 - Các đối tượng được khởi tạo rỗng và nhận dữ liệu qua setters.
 - Sử dụng @property và @setter để quản lý thuộc tính.
+- Dùng __slots__ để mỗi đối tượng không mang theo __dict__ riêng; chức vụ là
+  hằng số của từng lớp nên được khai báo ở mức lớp thay vì từng đối tượng.
+- Thu nhập và thuế được tính một lần rồi lưu lại (cache); các setter của những
+  trường ảnh hưởng (lương, doanh số, hoa hồng, lương trách nhiệm) sẽ xóa cache.
+- Thuế tính theo biểu thuế đang áp dụng trong bieuthue.bo_thue; cache thuế ghi kèm
+  phiên bản biểu thuế nên tự hết hiệu lực khi biểu thuế thay đổi.
+- Khi đọc file, from_row/tao_hang_loat tạo nhanh đối tượng từ dữ liệu đã kiểm tra
+  theo lô, không đi qua từng setter.
 """
+from itertools import islice
+
+from bieuthue import bo_thue
+
+
+class BoDemCache:
+    """Bộ đếm số lần trúng/trượt cache thu nhập và thuế, dùng để theo dõi khi chạy báo cáo."""
+    def __init__(self):
+        self.trung = 0
+        self.truot = 0
+
+    def dat_lai(self) -> None:
+        """Đưa bộ đếm về 0, gọi trước khi bắt đầu một lần chạy báo cáo."""
+        self.trung = 0
+        self.truot = 0
+
+    @property
+    def ti_le_trung(self) -> float:
+        tong = self.trung + self.truot
+        return self.trung / tong if tong else 0.0
+
+    def __str__(self) -> str:
+        return f"Cache thu nhập/thuế: {self.trung} trúng, {self.truot} trượt ({self.ti_le_trung:.1%} trúng)"
+
+
+# Bộ đếm dùng chung cho mọi nhân viên
+bo_dem_cache = BoDemCache()
+
 
 class NhanVien:
     """Lớp cơ sở mô tả một nhân viên."""
+    __slots__ = ("_ma_nv", "_ho_ten", "_luong", "_thu_nhap_cache", "_thue_cache", "_thue_phien_ban")
+    # Trường riêng của TiepThi/TruongPhong (slot ở lớp con che giá trị này): loại nhân viên
+    # không có trường đó đọc ra 0.0, để bangluong lấy cả cột mà không phải kiểm tra từng loại
+    _doanh_so = _hoa_hong = _luong_trach_nhiem = 0.0
+
     def __init__(self):
         # Khởi tạo các thuộc tính "private" để quản lý qua getters/setters
         self._ma_nv = None
         self._ho_ten = None
         self._luong = 0.0
+        self._xoa_cache()
+
+    def _xoa_cache(self) -> None:
+        """Xóa thu nhập/thuế đã lưu, gọi khi một trường dùng để tính chúng thay đổi."""
+        self._thu_nhap_cache = None
+        self._thue_cache = None
+        self._thue_phien_ban = None
+
+    @classmethod
+    def from_row(cls, ma_nv: str, ho_ten: str, luong: float,
+                 doanh_so: float = 0.0, hoa_hong: float = 0.0, luong_trach_nhiem: float = 0.0):
+        """
+        Tạo nhanh một nhân viên từ dữ liệu đã kiểm tra (không qua __init__ và setter).
+        Nhận đủ các trường của mọi loại nhân viên; trường không dùng tới bị bỏ qua.
+        """
+        nv = cls.__new__(cls)
+        nv._ma_nv = ma_nv
+        nv._ho_ten = ho_ten
+        nv._luong = luong
+        nv._thu_nhap_cache = nv._thue_cache = nv._thue_phien_ban = None
+        return nv
 
     # --- Getters ---
     @property
@@ -23,20 +85,36 @@ class NhanVien:
     def luong(self) -> float: return self._luong
 
     @property
-    def thu_nhap(self) -> float: 
-        """Tính thu nhập của nhân viên. Mặc định là lương.""" 
-        return self._luong
+    def thu_nhap(self) -> float:
+        """Thu nhập của nhân viên, chỉ tính lại khi cache đã bị xóa."""
+        gia_tri = self._thu_nhap_cache
+        if gia_tri is None:
+            bo_dem_cache.truot += 1
+            gia_tri = self._thu_nhap_cache = self._tinh_thu_nhap()
+        else:
+            bo_dem_cache.trung += 1
+        return gia_tri
 
     @property
     def thue_thu_nhap(self) -> float:
-        """Tính thuế thu nhập dựa trên thu nhập."""
-        current_income = self.thu_nhap
-        if current_income < 9000000:
-            return 0
-        elif 9000000 <= current_income <= 15000000:
-            return current_income * 0.10
+        """Thuế thu nhập của nhân viên, chỉ tính lại khi cache đã bị xóa hoặc biểu thuế đã đổi."""
+        gia_tri = self._thue_cache
+        phien_ban = bo_thue.hien_hanh.phien_ban
+        if gia_tri is None or self._thue_phien_ban != phien_ban:
+            bo_dem_cache.truot += 1
+            gia_tri = self._thue_cache = self._tinh_thue_thu_nhap()
+            self._thue_phien_ban = phien_ban
         else:
-            return current_income * 0.12
+            bo_dem_cache.trung += 1
+        return gia_tri
+
+    def _tinh_thu_nhap(self) -> float:
+        """Tính thu nhập của nhân viên. Mặc định là lương."""
+        return self._luong
+
+    def _tinh_thue_thu_nhap(self) -> float:
+        """Tính thuế thu nhập dựa trên thu nhập, theo biểu thuế đang áp dụng."""
+        return bo_thue.hien_hanh.tinh(self.thu_nhap)
 
     # --- Setters ---
     @ma_nv.setter
@@ -58,6 +136,7 @@ class NhanVien:
         except (ValueError, TypeError):
             print(f"Lỗi: Lương '{value}' không hợp lệ. Đặt lương về 0.")
             self._luong = 0.0
+        self._xoa_cache()
     
     # --- Class Methods ---
     def xuat_thong_tin(self) -> None:
@@ -67,34 +146,40 @@ class NhanVien:
 
 class HanhChinh(NhanVien):
     """Lớp mô tả nhân viên hành chính."""
-    def __init__(self):
-        super().__init__()
-        self.__chuc_vu = "Hành Chính"
-
-    # getter cho chức vụ
-    @property
-    def chuc_vu(self) -> str:
-        return self.__chuc_vu
+    __slots__ = ()
+    chuc_vu = "Hành Chính"  # chức vụ dùng chung cho cả lớp
 
     # --- Ghi đè (Override) Phương thức xuất thông tin ---
     def xuat_thong_tin(self):
         """Ghi đè phương thức xuất thông tin để thêm chức vụ."""
-        print(f"{self.ma_nv}| {self.ho_ten:<30}| {self.chuc_vu:<13}| {self.luong:<16,.0f}|"
-          f" {0.0:<16,.0f}| {0.0:<10.2f}|"
-          f" {0.0:<18,.0f}| {self.thu_nhap:<16,.0f}| {self.thue_thu_nhap:<16,.0f}")
+        print(self.dong_thong_tin())
+
+    def dong_thong_tin(self, thu_nhap: float | None = None, thue_thu_nhap: float | None = None) -> str:
+        """Tạo dòng thông tin để xuất; có thể truyền sẵn thu nhập/thuế đã tính hàng loạt."""
+        if thu_nhap is None:
+            thu_nhap, thue_thu_nhap = self.thu_nhap, self.thue_thu_nhap
+        return (f"{self.ma_nv}| {self.ho_ten:<30}| {self.chuc_vu:<13}| {self.luong:<16,.0f}|"
+                f" {0.0:<16,.0f}| {0.0:<10.2f}|"
+                f" {0.0:<18,.0f}| {thu_nhap:<16,.0f}| {thue_thu_nhap:<16,.0f}")
 
 class TiepThi(NhanVien):
     """Lớp mô tả nhân viên tiếp thị."""
+    __slots__ = ("_doanh_so", "_hoa_hong")
+    chuc_vu = "Tiếp Thị"  # chức vụ dùng chung cho cả lớp
+
     def __init__(self):
         super().__init__()
-        self.__chuc_vu = "Tiếp Thị"
         self._doanh_so = 0.0
         self._hoa_hong = 0.0
-    
-    # getter cho chức vụ
-    @property
-    def chuc_vu(self) -> str:
-        return self.__chuc_vu
+
+    @classmethod
+    def from_row(cls, ma_nv: str, ho_ten: str, luong: float,
+                 doanh_so: float = 0.0, hoa_hong: float = 0.0, luong_trach_nhiem: float = 0.0):
+        nv = super().from_row(ma_nv, ho_ten, luong)
+        nv._doanh_so = doanh_so
+        nv._hoa_hong = hoa_hong
+        return nv
+
     # --- Getters for TiepThi ---
     @property
     def doanh_so(self) -> float:
@@ -104,9 +189,8 @@ class TiepThi(NhanVien):
     def hoa_hong(self) -> float:
         return self._hoa_hong
         
-    # --- Ghi đè (Override) Getter thu_nhap ---
-    @property
-    def thu_nhap(self) -> float:
+    # --- Ghi đè (Override) phương thức tính thu nhập ---
+    def _tinh_thu_nhap(self) -> float:
         """Ghi đè phương thức tính thu nhập cho nhân viên tiếp thị."""
         return self._luong + (self._doanh_so * self._hoa_hong)
 
@@ -118,6 +202,7 @@ class TiepThi(NhanVien):
         except (ValueError, TypeError):
             print(f"Lỗi: Doanh số '{value}' không hợp lệ. Đặt doanh số về 0.")
             self._doanh_so = 0.0
+        self._xoa_cache()
 
     @hoa_hong.setter
     def hoa_hong(self, value: float) -> None:
@@ -127,34 +212,45 @@ class TiepThi(NhanVien):
         except (ValueError, TypeError):
             print(f"Lỗi: Tỷ lệ hoa hồng '{value}' không hợp lệ. Đặt về 0.")
             self._hoa_hong = 0.0
+        self._xoa_cache()
 
     # --- Ghi đè (Override) phương thức xuat_thong_tin ---
     def xuat_thong_tin(self):
         """Ghi đè phương thức xuất thông tin để thêm chức vụ."""
-        print(f"{self.ma_nv}| {self.ho_ten:<30}| {self.chuc_vu:<13}| {self.luong:<16,.0f}|"
-          f" {self.doanh_so:<16,.0f}| {self.hoa_hong:<10.2f}|"
-          f" {0.0:<18,.0f}| {self.thu_nhap:<16,.0f}| {self.thue_thu_nhap:<16,.0f}")
+        print(self.dong_thong_tin())
+
+    def dong_thong_tin(self, thu_nhap: float | None = None, thue_thu_nhap: float | None = None) -> str:
+        """Tạo dòng thông tin để xuất; có thể truyền sẵn thu nhập/thuế đã tính hàng loạt."""
+        if thu_nhap is None:
+            thu_nhap, thue_thu_nhap = self.thu_nhap, self.thue_thu_nhap
+        return (f"{self.ma_nv}| {self.ho_ten:<30}| {self.chuc_vu:<13}| {self.luong:<16,.0f}|"
+                f" {self.doanh_so:<16,.0f}| {self.hoa_hong:<10.2f}|"
+                f" {0.0:<18,.0f}| {thu_nhap:<16,.0f}| {thue_thu_nhap:<16,.0f}")
 
 
 class TruongPhong(NhanVien):
     """Lớp mô tả trưởng phòng."""
+    __slots__ = ("_luong_trach_nhiem",)
+    chuc_vu = "Trưởng Phòng"  # chức vụ dùng chung cho cả lớp
+
     def __init__(self):
-        self.__chuc_vu = "Trưởng Phòng"
         super().__init__()
         self._luong_trach_nhiem = 0.0
 
-    # getter cho chức vụ
-    @property
-    def chuc_vu(self) -> str:
-        return self.__chuc_vu
+    @classmethod
+    def from_row(cls, ma_nv: str, ho_ten: str, luong: float,
+                 doanh_so: float = 0.0, hoa_hong: float = 0.0, luong_trach_nhiem: float = 0.0):
+        nv = super().from_row(ma_nv, ho_ten, luong)
+        nv._luong_trach_nhiem = luong_trach_nhiem
+        return nv
+
     # --- Getter for TruongPhong ---
     @property
     def luong_trach_nhiem(self) -> float:
         return self._luong_trach_nhiem
     
-    # --- Ghi đè (Override) Getter thu_nhap ---
-    @property
-    def thu_nhap(self) -> float:
+    # --- Ghi đè (Override) phương thức tính thu nhập ---
+    def _tinh_thu_nhap(self) -> float:
         """Ghi đè phương thức tính thu nhập cho trưởng phòng."""
         return self._luong + self._luong_trach_nhiem
 
@@ -166,11 +262,63 @@ class TruongPhong(NhanVien):
         except (ValueError, TypeError):
             print(f"Lỗi: Lương trách nhiệm '{value}' không hợp lệ. Đặt về 0.")
             self._luong_trach_nhiem = 0.0
+        self._xoa_cache()
 
     # --- Ghi đè (Override) phương thức xuat_thong_tin ---
     def xuat_thong_tin(self):
         """Ghi đè phương thức xuất thông tin để thêm chức vụ."""
-        print(f"{self.ma_nv}| {self.ho_ten:<30}| {self.chuc_vu:<13}| {self.luong:<16,.0f}|"
-          f" {0.0:<16,.0f}| {0.0:<10.2f}|"
-          f" {self.luong_trach_nhiem:<18,.0f}| {self.thu_nhap:<16,.0f}| {self.thue_thu_nhap:<16,.0f}")
+        print(self.dong_thong_tin())
+
+    def dong_thong_tin(self, thu_nhap: float | None = None, thue_thu_nhap: float | None = None) -> str:
+        """Tạo dòng thông tin để xuất; có thể truyền sẵn thu nhập/thuế đã tính hàng loạt."""
+        if thu_nhap is None:
+            thu_nhap, thue_thu_nhap = self.thu_nhap, self.thue_thu_nhap
+        return (f"{self.ma_nv}| {self.ho_ten:<30}| {self.chuc_vu:<13}| {self.luong:<16,.0f}|"
+                f" {0.0:<16,.0f}| {0.0:<10.2f}|"
+                f" {self.luong_trach_nhiem:<18,.0f}| {thu_nhap:<16,.0f}| {thue_thu_nhap:<16,.0f}")
+
+
+KICH_THUOC_LO = 1024  # Số dòng mỗi lô khi đọc dần file
+
+
+def _tao_qua_setter(lop, ma_nv, ho_ten, luong, doanh_so, hoa_hong, luong_trach_nhiem):
+    """Tạo nhân viên qua các setter như cách cũ (báo lỗi và đặt giá trị mặc định khi dữ liệu sai)."""
+    nv = lop()
+    nv.ma_nv = ma_nv
+    nv.ho_ten = ho_ten
+    nv.luong = luong
+    if isinstance(nv, TiepThi):
+        nv.doanh_so = doanh_so
+        nv.hoa_hong = hoa_hong
+    elif isinstance(nv, TruongPhong):
+        nv.luong_trach_nhiem = luong_trach_nhiem
+    return nv
+
+
+def tao_hang_loat(cac_dong) -> list:
+    """
+    Tạo nhân viên cho cả một lô dòng (lop, ma_nv, ho_ten, luong, doanh_so, hoa_hong, luong_trach_nhiem).\n
+    Cả lô được kiểm tra trong một lượt: dòng có họ tên khác rỗng và các số chuyển được
+    sang float thì tạo bằng from_row; dòng lỗi mới đi qua setter để giữ nguyên thông báo
+    lỗi và giá trị mặc định như trước.
+    """
+    ket_qua = []
+    them = ket_qua.append
+    for dong in cac_dong:
+        lop, ma_nv, ho_ten, luong, doanh_so, hoa_hong, luong_trach_nhiem = dong
+        try:
+            if ho_ten.strip():
+                them(lop.from_row(ma_nv, ho_ten, float(luong), float(doanh_so),
+                                  float(hoa_hong), float(luong_trach_nhiem)))
+                continue
+        except (ValueError, TypeError, AttributeError):
+            pass
+        them(_tao_qua_setter(*dong))
+    return ket_qua
+
 
+def tao_theo_lo(cac_dong, kich_thuoc_lo: int = KICH_THUOC_LO):
+    """Gom các dòng thành từng lô rồi tạo bằng tao_hang_loat, trả về lần lượt từng nhân viên."""
+    cac_dong = iter(cac_dong)
+    while lo := list(islice(cac_dong, kich_thuoc_lo)):
+        yield from tao_hang_loat(lo)
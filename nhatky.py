@@ -0,0 +1,113 @@
+"""
+Module này chứa NhatKy: nhật ký ghi trước (write-ahead journal) cho file dữ liệu.
+- Mỗi thao tác sửa/xóa nhân viên được ghi thành một dòng JSON vào file '<file>.journal'
+  thay vì ghi lại toàn bộ file dữ liệu (dùng cho .json, .xml; .txt/.csv được vá trực tiếp từng dòng).
+- Khi đọc file dữ liệu, các thao tác trong nhật ký được áp dụng lại (replay).
+- Định kỳ nhật ký được gộp (compaction) vào file dữ liệu gốc rồi xóa đi.
+"""
+import json
+import os
+
+from quanlyfile import QuanLyJson
+
+# Các loại thao tác trong nhật ký. "them" và "sua" đều là ghi đè (upsert) theo mã nên
+# việc áp dụng lại một thao tác nhiều lần cho cùng kết quả.
+THEM, SUA, XOA = "them", "sua", "xoa"
+
+
+class NhatKy:
+    """Nhật ký các thao tác thêm/sửa/xóa của một file dữ liệu."""
+    DUOI_FILE = ".journal"
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path + self.DUOI_FILE
+        self._json = QuanLyJson()  # dùng lại cách chuyển nhân viên <-> dict của file JSON
+        self._so_thao_tac: int | None = None  # đếm khi cần
+
+    def __len__(self) -> int:
+        if self._so_thao_tac is None:
+            self._so_thao_tac = len(self.doc())
+        return self._so_thao_tac
+
+    def ghi(self, thao_tac: str, nv) -> None:
+        """Ghi thêm một thao tác vào cuối nhật ký và fsync trước khi trả về."""
+        self.ghi_nhieu([(thao_tac, nv)])
+
+    def ghi_nhieu(self, cac_thao_tac) -> None:
+        """Ghi thêm nhiều thao tác (thao_tac, nv) vào cuối nhật ký với một lần fsync."""
+        cac_dong = []
+        for thao_tac, nv in cac_thao_tac:
+            ban_ghi = {"op": thao_tac, "ma_nv": nv.ma_nv}
+            if thao_tac != XOA:
+                ban_ghi["nv"] = self._json._nv_to_dict(nv)
+            cac_dong.append(json.dumps(ban_ghi, ensure_ascii=False) + "\n")
+        if not cac_dong:
+            return
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write("".join(cac_dong))
+            f.flush()
+            os.fsync(f.fileno())
+        if self._so_thao_tac is not None:
+            self._so_thao_tac += len(cac_dong)
+
+    def doc(self) -> list[dict]:
+        """
+        Đọc các thao tác trong nhật ký theo thứ tự ghi.
+        Dòng hỏng (vd: dòng cuối bị ghi dở khi chương trình dừng đột ngột) được bỏ qua.
+        """
+        if not os.path.exists(self.file_path):
+            return []
+        thao_tac = []
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            for dong in f:
+                try:
+                    ban_ghi = json.loads(dong)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(ban_ghi, dict) and ban_ghi.get("op") in (THEM, SUA, XOA):
+                    thao_tac.append(ban_ghi)
+        return thao_tac
+
+    def _trang_thai_cuoi(self) -> dict:
+        """Gộp các thao tác thành trạng thái cuối cùng: ma_nv -> nhân viên, hoặc None nếu đã xóa."""
+        trang_thai = {}
+        for ban_ghi in self.doc():
+            ma_nv = ban_ghi["ma_nv"]
+            nv = None if ban_ghi["op"] == XOA else self._json._dict_to_nv(ban_ghi.get("nv", {}))
+            # Xóa khỏi dict rồi thêm lại để thứ tự là thứ tự của thao tác cuối cùng
+            trang_thai.pop(ma_nv, None)
+            trang_thai[ma_nv] = nv
+        return trang_thai
+
+    def phu_len(self, nguon):
+        """
+        Áp dụng nhật ký lên một nguồn nhân viên đọc từ file gốc (generator).
+        Nhân viên đã sửa được thay tại chỗ, nhân viên đã xóa bị bỏ qua,
+        nhân viên chưa có trong file gốc được trả về ở cuối.
+        """
+        trang_thai = self._trang_thai_cuoi()
+        if not trang_thai:
+            yield from nguon
+            return
+        da_gap = set()
+        for nv in nguon:
+            if nv.ma_nv not in trang_thai:
+                yield nv
+                continue
+            da_gap.add(nv.ma_nv)
+            moi = trang_thai[nv.ma_nv]
+            if moi is not None:
+                yield moi
+        for ma_nv, moi in trang_thai.items():
+            if moi is not None and ma_nv not in da_gap:
+                yield moi
+
+    def cac_ma(self) -> list[str]:
+        """Danh sách mã nhân viên xuất hiện trong nhật ký."""
+        return [ban_ghi["ma_nv"] for ban_ghi in self.doc()]
+
+    def xoa(self) -> None:
+        """Xóa nhật ký sau khi đã gộp vào file gốc."""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        self._so_thao_tac = 0
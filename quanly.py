@@ -1,14 +1,43 @@
+import atexit
+import logging
+import os
+import threading
+
 from nhansu import NhanVien, HanhChinh, TiepThi, TruongPhong
-from quanlyfile import QuanLyTxt, QuanLyCsv, QuanLyJson, QuanLyXml, CLASS_MAP
+from quanlyfile import QuanLyTxt, QuanLyCsv, QuanLyJson, QuanLyXml, QuanLyBin, QuanLySqlite, CLASS_MAP
+from capma import BoCapMa, PREFIX_MAP
+from chimuc import ChiMucSapXep
+from tiengviet import khoa_sap_xep
+from timkiem import ChiMucTen
+from truyvan import top_k
+from bangluong import tinh_bang_luong, BangLuong
+from nhatky import NhatKy, THEM, SUA, XOA
+from thongke import ThongKeChucVu
+from hienthi import xuat_bang
+from chuyendoi import chuyen_luong
+from ghinen import BoGhiNen
 
 """Module này chứa lớp QuanLyNhanSu để quản lý các hoạt động trong chương trình quản lý nhân sự."""
 
+# Thông báo trạng thái (đã tải, đã lưu, ...) đi qua logging; chương trình có menu tự cấu hình để hiện ra
+log = logging.getLogger(__name__)
+
 class QuanLyNhanSu:
     """
     Lớp quản lý các hoạt động liên quan đến nhân sự:
     - Thêm, xóa, sửa, tìm kiếm nhân viên.
     - Sắp xếp.
     """
+    NGUONG_GOP_NHAT_KY = 100  # Số thao tác trong nhật ký để tự động gộp vào file gốc
+    # Các trường cập nhật được của từng loại nhân viên (theo thứ tự hỏi khi nhập) và tên hiển thị
+    TRUONG_THEO_LOAI = {
+        HanhChinh: ("ho_ten", "luong"),
+        TiepThi: ("ho_ten", "luong", "doanh_so", "hoa_hong"),
+        TruongPhong: ("ho_ten", "luong", "luong_trach_nhiem"),
+    }
+    NHAN_TRUONG = {"ho_ten": "Họ tên", "luong": "Lương cơ bản", "doanh_so": "Doanh số",
+                   "hoa_hong": "Tỉ lệ hoa hồng", "luong_trach_nhiem": "Lương trách nhiệm"}
+
     def __init__(self):
         self._file_name_base = "data_nhansu"
         self._current_file_type = ".txt"
@@ -17,212 +46,616 @@ class QuanLyNhanSu:
             ".txt": QuanLyTxt(),
             ".csv": QuanLyCsv(),
             ".json": QuanLyJson(),
-            ".xml": QuanLyXml()
+            ".xml": QuanLyXml(),
+            ".bin": QuanLyBin(),
+            ".db": QuanLySqlite()
         }
-        self._nv_moi = None  # Biến tạm để giữ nhân viên mới trước khi lưu
-        self._danh_sach_nv = []  # Danh sách nhân viên hiện tại
+        # Chỉ mục khóa chính ma_nv -> nhân viên. Dict giữ thứ tự chèn nên cũng chính là
+        # thứ tự (vị trí) của danh sách: tra cứu, xóa theo mã đều O(1).
+        self._chi_muc_ma: dict[str, NhanVien] = {}
+        self._ds_cache: list | None = []  # Bản list dựng lại khi cần duyệt toàn bộ
+        self._bo_cap_ma = BoCapMa()  # Bộ đếm mã theo prefix, khởi tạo khi tải danh sách
+        # Chỉ mục phụ sắp xếp theo lương và thu nhập cho truy vấn theo khoảng
+        self._chi_muc_luong = ChiMucSapXep(lambda nv: nv.luong)
+        self._chi_muc_thu_nhap = ChiMucSapXep(lambda nv: nv.thu_nhap)
+        # Chỉ mục theo khóa sắp xếp tiếng Việt của họ tên, dựng lần đầu khi cần sắp theo tên
+        self._chi_muc_ten: ChiMucSapXep | None = None
+        # Chỉ mục tìm kiếm theo họ tên (không dấu), dựng khi tải dữ liệu
+        self._chi_muc_tim_ten = ChiMucTen()
+        # Số liệu tổng hợp theo chức vụ, cập nhật cùng lúc với các chỉ mục
+        self._thong_ke = ThongKeChucVu()
+        # Dấu vết (mtime, size) của file ở lần đọc/ghi gần nhất, để biết khi nào
+        # file bị tiến trình khác sửa và cần đọc lại
+        self._dau_vet_file: tuple[int, int] | None = None
+        self._nhat_ky_hien_tai: NhatKy | None = None
+        self._ban_ghi_thay_doi: dict[str, tuple[str, NhanVien]] = {}  # ma_nv -> (thao tác, nhân viên) chưa lưu
+        self._bo_ghi_nen: BoGhiNen | None = None  # Bật bằng bat_ghi_nen(): lưu file trên luồng nền
+        # Luồng ghi nền và luồng chính cùng đọc/ghi file, dấu vết file, định dạng đang dùng
+        # và chỉ mục dòng của handler: mỗi lần chỉ một luồng được làm việc với file
+        self._khoa_file = threading.RLock()
 
-    # --- Phần tương tác với File Handlers ---
-    def set_file_type(self):
-        """Cho phép người dùng chọn định dạng file để làm việc."""
-        print("Chọn định dạng file:")
-        types = list(self._handlers.keys())
-        for i, ftype in enumerate(types):
-            print(f"{i+1}. {ftype}")
-        try:
-            choice = int(input("Lựa chọn của bạn: ")) - 1
-            if 0 <= choice < len(types):
-                self._current_file_type = types[choice]
-                print(f"Đã chuyển sang làm việc với file *{self._current_file_type}")
-                self.doc_file() # Đọc lại dữ liệu từ file có định dạng mới
+    # --- Danh sách nhân viên và chỉ mục theo mã ---
+    @property
+    def _danh_sach_nv(self) -> list:
+        """Danh sách nhân viên hiện tại (theo thứ tự của chỉ mục)."""
+        if self._ds_cache is None:
+            self._ds_cache = list(self._chi_muc_ma.values())
+        return self._ds_cache
+
+    @_danh_sach_nv.setter
+    def _danh_sach_nv(self, danh_sach: list) -> None:
+        """Thay toàn bộ danh sách và dựng lại chỉ mục theo mã."""
+        self._chi_muc_ma = {}
+        for nv in danh_sach:
+            if nv.ma_nv in self._chi_muc_ma:
+                log.warning("Cảnh báo: Mã nhân viên '%s' bị trùng, giữ bản ghi sau cùng.", nv.ma_nv)
+            self._chi_muc_ma[nv.ma_nv] = nv
+        self._ds_cache = None
+        self._bo_cap_ma.khoi_tao(self._chi_muc_ma)
+        self._chi_muc_luong.xay_dung(self._chi_muc_ma.values())
+        self._chi_muc_thu_nhap.xay_dung(self._chi_muc_ma.values())
+        self._thong_ke.xay_dung(self._chi_muc_ma.values())
+        self._chi_muc_ten = None
+        self._chi_muc_tim_ten.xay_dung((ma, nv.ho_ten) for ma, nv in self._chi_muc_ma.items())
+
+    def _them_vao_chi_muc(self, nv: NhanVien) -> None:
+        """Thêm một nhân viên vào cuối danh sách và chỉ mục."""
+        self._chi_muc_ma[nv.ma_nv] = nv
+        if self._ds_cache is not None:
+            self._ds_cache.append(nv)
+        self._bo_cap_ma.ghi_nhan(nv.ma_nv)
+        self._chi_muc_luong.them(nv)
+        self._chi_muc_thu_nhap.them(nv)
+        self._thong_ke.them(nv)
+        if self._chi_muc_ten is not None:
+            self._chi_muc_ten.them(nv)
+        self._chi_muc_tim_ten.them(nv.ma_nv, nv.ho_ten)
+
+    def _xoa_khoi_chi_muc(self, ma_nv: str) -> NhanVien | None:
+        """Xóa nhân viên khỏi chỉ mục theo mã, trả về nhân viên đã xóa."""
+        self._chi_muc_tim_ten.xoa(ma_nv)  # khi truy vấn trực tiếp trên file chỉ có chỉ mục tên trong bộ nhớ
+        nv = self._chi_muc_ma.pop(ma_nv, None)
+        if nv is not None:
+            self._ds_cache = None
+            self._chi_muc_luong.xoa(ma_nv)
+            self._chi_muc_thu_nhap.xoa(ma_nv)
+            self._thong_ke.xoa(ma_nv)
+            if self._chi_muc_ten is not None:
+                self._chi_muc_ten.xoa(ma_nv)
+        return nv
+
+    def _cap_nhat_chi_muc(self, nv: NhanVien) -> None:
+        """Cập nhật các chỉ mục phụ sau khi thông tin của nhân viên thay đổi."""
+        self._chi_muc_tim_ten.cap_nhat(nv.ma_nv, nv.ho_ten)
+        if nv.ma_nv not in self._chi_muc_ma:
+            return  # nhân viên lấy thẳng từ file, không nằm trong danh sách bộ nhớ
+        self._chi_muc_luong.cap_nhat(nv)
+        self._chi_muc_thu_nhap.cap_nhat(nv)
+        self._thong_ke.cap_nhat(nv)
+        if self._chi_muc_ten is not None:
+            self._chi_muc_ten.cap_nhat(nv)
+
+    def loc_theo_khoang(self, min_gia_tri: float, max_gia_tri: float, theo: str = "luong") -> list:
+        """
+        Lấy các nhân viên có lương (hoặc thu nhập nếu theo="thu_nhap") trong đoạn [min, max].
+        Dùng chỉ mục sắp xếp nên chỉ tốn O(log n + k). Kết quả theo thứ tự tăng dần.
+        """
+        if self._truy_van_truc_tiep:
+            return self._handler_hien_tai.loc_theo_khoang(self._file_hien_tai, min_gia_tri, max_gia_tri,
+                                                          cot="thu_nhap" if theo == "thu_nhap" else "luong")
+        chi_muc = self._chi_muc_thu_nhap if theo == "thu_nhap" else self._chi_muc_luong
+        return [self._chi_muc_ma[ma] for ma in chi_muc.khoang(min_gia_tri, max_gia_tri)]
+
+    def danh_sach_theo_ten(self) -> list:
+        """
+        Danh sách nhân viên theo họ tên (thứ tự chữ cái tiếng Việt), không đổi thứ tự
+        của danh sách gốc. Chỉ mục tên được dựng một lần rồi cập nhật theo từng thay đổi,
+        nên các lần sau chỉ còn duyệt O(n).
+        """
+        if self._truy_van_truc_tiep:
+            return self._handler_hien_tai.sap_xep(self._file_hien_tai, "ho_ten")
+        if self._chi_muc_ten is None:
+            self._chi_muc_ten = ChiMucSapXep(lambda nv: khoa_sap_xep(nv.ho_ten))
+            self._chi_muc_ten.xay_dung(self._chi_muc_ma.values())
+        return [self._chi_muc_ma[ma] for ma in self._chi_muc_ten.theo_thu_tu()]
+
+    def danh_sach_theo_thu_nhap(self, giam_dan: bool = True) -> list:
+        """Danh sách nhân viên theo thu nhập (lấy từ chỉ mục thu nhập), không đổi danh sách gốc."""
+        if self._truy_van_truc_tiep:
+            return self._handler_hien_tai.sap_xep(self._file_hien_tai, "thu_nhap", giam_dan=giam_dan)
+        return [self._chi_muc_ma[ma] for ma in self._chi_muc_thu_nhap.theo_thu_tu(giam_dan)]
+
+    def tim_kiem_ten(self, tu_khoa: str, kieu: str = "tien_to", sai_so: int = 1) -> list:
+        """
+        Tìm nhân viên theo họ tên, không phân biệt dấu và hoa thường:\n
+        - kieu="tien_to": mỗi từ của tu_khoa là đầu của một từ trong họ tên ("ng an").
+        - kieu="token": họ tên chứa đủ các từ của tu_khoa.
+        - kieu="gan_dung": cho phép gõ sai tối đa sai_so ký tự mỗi từ.
+        """
+        if kieu == "token":
+            cac_ma = self._chi_muc_tim_ten.tim_token(tu_khoa)
+        elif kieu == "gan_dung":
+            cac_ma = self._chi_muc_tim_ten.tim_gan_dung(tu_khoa, sai_so)
+        else:
+            cac_ma = self._chi_muc_tim_ten.tim_tien_to(tu_khoa)
+        if self._truy_van_truc_tiep:
+            tim = self._handler_hien_tai.tim_theo_ma
+            return [nv for nv in (tim(self._file_hien_tai, ma) for ma in cac_ma) if nv is not None]
+        return [self._chi_muc_ma[ma] for ma in cac_ma]
+
+    def thong_ke(self) -> dict[str, dict]:
+        """
+        Số liệu theo từng chức vụ và dòng "Tổng": số lượng, tổng lương, tổng thu nhập,
+        tổng thuế, thu nhập trung bình/độ lệch chuẩn/thấp nhất/cao nhất.
+        Lấy từ các tổng được cập nhật dần nên không phải duyệt danh sách.
+        """
+        if self._truy_van_truc_tiep:
+            return self._handler_hien_tai.thong_ke(self._file_hien_tai)
+        return self._thong_ke.ket_qua()
+
+    # --- API lập trình: không dùng input()/print(), dữ liệu sai thì báo bằng ngoại lệ ---
+    # Các thao tác có hỏi người dùng nằm ở menu (asm_gd2.py) và chỉ gọi tới các hàm này
+    def _kiem_tra_truong(self, loai: type, truong: dict) -> dict:
+        """Kiểm tra tên và giá trị các trường của loại nhân viên, trả về giá trị đã chuẩn hóa."""
+        hop_le = self.TRUONG_THEO_LOAI[loai]
+        ket_qua = {}
+        for ten, gia_tri in truong.items():
+            if ten not in hop_le:
+                raise ValueError(f"Nhân viên {loai.chuc_vu} không có trường '{ten}' (chỉ có {', '.join(hop_le)}).")
+            if ten == "ho_ten":
+                if not isinstance(gia_tri, str) or not gia_tri.strip():
+                    raise ValueError("Tên không được để trống.")
+            else:
+                try:
+                    gia_tri = float(gia_tri)
+                except (ValueError, TypeError):
+                    raise ValueError(f"{self.NHAN_TRUONG[ten]} '{gia_tri}' không hợp lệ.") from None
+            ket_qua[ten] = gia_tri
+        return ket_qua
+
+    def _tao_nhan_vien(self, ban_ghi) -> NhanVien:
+        """
+        Nhân viên từ một đối tượng nhân viên (kiểm tra các trường rồi dùng luôn) hoặc dict gồm "chuc_vu"
+        ("Hành Chính", "Tiếp Thị", "Trưởng Phòng"), "ho_ten", các trường số của loại đó và "ma_nv" (tùy chọn).
+        """
+        if isinstance(ban_ghi, NhanVien):
+            loai = type(ban_ghi)
+            if loai not in self.TRUONG_THEO_LOAI:
+                raise ValueError(f"Loại nhân viên {loai.__name__} không được hỗ trợ.")
+            # Đối tượng tạo rỗng (chưa có họ tên) cũng phải bị chặn trước khi ghi xuống file
+            self._kiem_tra_truong(loai, {ten: getattr(ban_ghi, ten) for ten in self.TRUONG_THEO_LOAI[loai]})
+            return ban_ghi
+        truong = dict(ban_ghi)
+        loai = CLASS_MAP.get(truong.pop("chuc_vu", None))
+        if loai is None:
+            raise ValueError(f"Chức vụ không hợp lệ, chọn một trong {tuple(CLASS_MAP)}.")
+        ma_nv = truong.pop("ma_nv", None)
+        truong = self._kiem_tra_truong(loai, truong)
+        if "ho_ten" not in truong:
+            raise ValueError("Thiếu họ tên nhân viên.")
+        nv = loai()
+        if ma_nv:
+            nv.ma_nv = ma_nv.strip().upper()
+        for ten, gia_tri in truong.items():
+            setattr(nv, ten, gia_tri)
+        return nv
+
+    def lay(self, ma_nv: str) -> NhanVien | None:
+        """Nhân viên có mã ma_nv (không phân biệt hoa thường), None nếu không có."""
+        ma_nv = ma_nv.strip().upper()
+        if self._truy_van_truc_tiep:
+            return self._handler_hien_tai.tim_theo_ma(self._file_hien_tai, ma_nv)
+        return self._chi_muc_ma.get(ma_nv)
+
+    def them(self, cac_ban_ghi) -> list[NhanVien]:
+        """
+        Thêm một hoặc nhiều nhân viên (đối tượng hoặc dict, xem _tao_nhan_vien); nhân viên chưa có
+        mã được cấp mã tự động. Cả nhóm được ghi thêm vào file trong một lần ghi.\n
+        Báo ValueError và không thêm ai nếu có dữ liệu sai hoặc mã bị trùng. Trả về các nhân viên đã thêm.
+        """
+        if isinstance(cac_ban_ghi, (NhanVien, dict)):
+            cac_ban_ghi = [cac_ban_ghi]
+        self.dong_bo_file()  # để mã mới không trùng với dữ liệu do nơi khác vừa ghi
+        cac_nv = [self._tao_nhan_vien(ban_ghi) for ban_ghi in cac_ban_ghi]
+        da_co = set()
+        for nv in cac_nv:
+            if not nv.ma_nv:
+                continue
+            if not self.ma_hop_le(nv.ma_nv):
+                raise ValueError(f"Mã nhân viên '{nv.ma_nv}' không hợp lệ.")
+            if nv.ma_nv in da_co or self.lay(nv.ma_nv) is not None:
+                raise ValueError(f"Mã nhân viên '{nv.ma_nv}' đã tồn tại.")
+            da_co.add(nv.ma_nv)
+        if not cac_nv:
+            return []
+
+        for ma_nv in da_co:
+            self._bo_cap_ma.ghi_nhan(ma_nv)
+        chua_co_ma = {}
+        for nv in cac_nv:
+            if not nv.ma_nv:
+                chua_co_ma.setdefault(type(nv).__name__, []).append(nv)
+        for ten_lop, nhom in chua_co_ma.items():
+            # Cấp cả khối mã cho mỗi loại một lần
+            for nv, ma_nv in zip(nhom, self.dat_truoc_ma(ten_lop, len(nhom))):
+                nv.ma_nv = ma_nv
+
+        # Ghi thêm vào file rồi cập nhật thẳng danh sách trong bộ nhớ, không đọc lại file
+        if self._ghi_nen_duoc:
+            for nv in cac_nv:
+                self._gui_ghi_nen(THEM, nv)
+        else:
+            self._handler_hien_tai.ghi_them_nhieu(self._file_hien_tai, cac_nv)
+            self._dau_vet_file = self._lay_dau_vet_file()
+        for nv in cac_nv:
+            if self._truy_van_truc_tiep:
+                self._chi_muc_tim_ten.them(nv.ma_nv, nv.ho_ten)
             else:
-                print("Lựa chọn không hợp lệ.")
-        except ValueError:
-            print("Vui lòng nhập một số.")
+                self._them_vao_chi_muc(nv)
+        return cac_nv
+
+    def xoa(self, cac_ma) -> list[NhanVien]:
+        """
+        Xóa các nhân viên theo mã (một mã hoặc list mã), mã không có thì bỏ qua.
+        Cả nhóm được lưu xuống file một lần. Trả về các nhân viên đã xóa.
+        """
+        if isinstance(cac_ma, str):
+            cac_ma = [cac_ma]
+        self.dong_bo_file()
+        da_xoa = []
+        for ma_nv in dict.fromkeys(ma.strip().upper() for ma in cac_ma):
+            nv = self.lay(ma_nv)
+            if nv is None:
+                continue
+            self._xoa_khoi_chi_muc(nv.ma_nv)
+            self._danh_dau_thay_doi(XOA, nv)
+            da_xoa.append(nv)
+        self.luu_thay_doi()
+        return da_xoa
+
+    def cap_nhat(self, ma_nv: str, **truong) -> NhanVien:
+        """
+        Cập nhật các trường của nhân viên (ho_ten, luong và doanh_so, hoa_hong hoặc
+        luong_trach_nhiem tùy loại) rồi lưu xuống file. Không cập nhật được mã nhân viên.\n
+        Báo KeyError nếu không có nhân viên, ValueError nếu có trường sai (khi đó không
+        trường nào bị đổi). Trả về nhân viên đã cập nhật.
+        """
+        self.dong_bo_file()
+        nv = self.lay(ma_nv)
+        if nv is None:
+            raise KeyError(f"Không tìm thấy nhân viên có mã {ma_nv}.")
+        for ten, gia_tri in self._kiem_tra_truong(type(nv), truong).items():
+            setattr(nv, ten, gia_tri)
+        self._cap_nhat_chi_muc(nv)
+        self._danh_dau_thay_doi(SUA, nv)
+        self.luu_thay_doi()
+        return nv
+
+    # --- Phần tương tác với File Handlers ---
+    @property
+    def _handler_hien_tai(self):
+        return self._handlers[self._current_file_type]
+
+    @property
+    def _file_hien_tai(self) -> str:
+        return self._file_name_base + self._current_file_type
+
+    @property
+    def _truy_van_truc_tiep(self) -> bool:
+        """
+        File hiện tại truy vấn được trực tiếp (CSDL .db, file cột .bin): truy vấn thẳng
+        trên file, không giữ danh sách trong bộ nhớ.
+        """
+        return self._handler_hien_tai.ho_tro_truy_van
+
+    @property
+    def cac_dinh_dang(self) -> list[str]:
+        """Các định dạng file làm việc được (".txt", ".csv", ...)."""
+        return list(self._handlers)
+
+    @property
+    def dinh_dang_hien_tai(self) -> str:
+        """Định dạng của file đang làm việc."""
+        return self._current_file_type
+
+    def ten_file(self, dinh_dang: str | None = None) -> str:
+        """Đường dẫn file dữ liệu theo định dạng (mặc định là định dạng đang làm việc)."""
+        return self._file_name_base + (dinh_dang or self._current_file_type)
+
+    def _kiem_tra_dinh_dang(self, dinh_dang: str) -> None:
+        if dinh_dang not in self._handlers:
+            raise ValueError(f"Định dạng '{dinh_dang}' không được hỗ trợ, chọn một trong {tuple(self._handlers)}.")
+
+    def doi_dinh_dang(self, dinh_dang: str) -> None:
+        """Chuyển sang làm việc với file có định dạng dinh_dang và đọc dữ liệu từ file đó."""
+        self._kiem_tra_dinh_dang(dinh_dang)
+        self.gop_nhat_ky()  # Đưa hết thay đổi vào file cũ trước khi chuyển
+        with self._khoa_file:
+            self._current_file_type = dinh_dang
+        self.doc_file() # Đọc lại dữ liệu từ file có định dạng mới
+
+    def chuyen_sang(self, dinh_dang: str) -> str:
+        """
+        Xuất dữ liệu hiện tại sang file có định dạng dinh_dang (ghi đè nếu đã có), trả về đường dẫn file đích.
+        Đọc dần file hiện tại (kèm các thay đổi trong nhật ký) và ghi dần sang file đích
+        theo từng lô, không cần tải cả danh sách.\n
+        Lỗi khi đọc/ghi (xem chuyendoi.LOI_CHUYEN_DOI) được ném ra, khi đó file đích không bị thay đổi.
+        """
+        self._kiem_tra_dinh_dang(dinh_dang)
+        if dinh_dang == self._current_file_type:
+            raise ValueError("File nguồn và file đích trùng nhau.")
+        self.luu_thay_doi()
+        file_dich = self.ten_file(dinh_dang)
+        chuyen_luong(self.duyet_file(), self._handlers[dinh_dang], file_dich)
+        return file_dich
 
     def luu_file(self, data: list[HanhChinh | TiepThi | TruongPhong | list] ):
         """Ủy quyền việc ghi file cho handler hiện tại."""
-        file_path = self._file_name_base + self._current_file_type
-        handler = self._handlers[self._current_file_type]
-        handler.write(file_path, data)
-
-        print(f"Đã lưu thành công vào file '{file_path}'.")
+        with self._khoa_file:
+            file_path = self._file_name_base + self._current_file_type
+            handler = self._handlers[self._current_file_type]
+            handler.write(file_path, data)
+            self._dau_vet_file = self._lay_dau_vet_file()
+        log.info("Đã lưu thành công vào file '%s'.", file_path)
 
     def doc_file(self):
-        """Ủy quyền việc đọc file cho handler hiện tại."""
+        """
+        Ủy quyền việc đọc file cho handler hiện tại.
+        Ném lại lỗi ghi nền (nếu có) thay vì đọc một file còn thiếu các thay đổi đó.
+        """
+        self.flush()  # đọc file sau khi các thay đổi đang chờ đã được ghi
+        with self._khoa_file:
+            file_path = self._file_name_base + self._current_file_type
+            handler = self._handlers[self._current_file_type]
+            if handler.ho_tro_truy_van:
+                # Chỉ cần các mã đang dùng để cấp mã mới, dữ liệu được truy vấn khi cần
+                self._danh_sach_nv = []
+                self._bo_cap_ma.khoi_tao(handler.cac_ma(file_path))
+                self._chi_muc_tim_ten.xay_dung(handler.cac_ten(file_path))
+                self._dau_vet_file = self._lay_dau_vet_file()
+                log.info("Đã mở '%s' (%d nhân viên), truy vấn trực tiếp trên file.", file_path, handler.dem(file_path))
+                return
+            nhat_ky = self._nhat_ky
+            # Áp dụng lại các thay đổi còn nằm trong nhật ký lên dữ liệu của file gốc
+            self._danh_sach_nv = list(nhat_ky.phu_len(handler.read(file_path)))
+            for ma_nv in nhat_ky.cac_ma():
+                # Mã đã bị xóa trong nhật ký không được cấp lại cho tới khi gộp nhật ký
+                self._bo_cap_ma.ghi_nhan(ma_nv)
+            self._dau_vet_file = self._lay_dau_vet_file()
+            log.info("Đã tải %d nhân viên từ file '%s'.", len(self._danh_sach_nv), file_path)
+            if len(nhat_ky):
+                log.info("Đã áp dụng %d thay đổi từ nhật ký '%s'.", len(nhat_ky), nhat_ky.file_path)
+
+    @property
+    def _nhat_ky(self) -> NhatKy:
+        """Nhật ký thay đổi của file dữ liệu hiện tại."""
         file_path = self._file_name_base + self._current_file_type
-        handler = self._handlers[self._current_file_type]
-        self._danh_sach_nv = handler.read(file_path)
-        print(f"Đã tải {len(self._danh_sach_nv)} nhân viên từ file '{file_path}'.")
+        if self._nhat_ky_hien_tai is None or self._nhat_ky_hien_tai.file_path != file_path + NhatKy.DUOI_FILE:
+            self._nhat_ky_hien_tai = NhatKy(file_path)
+        return self._nhat_ky_hien_tai
 
-    def tao_ma_nv(self, chuc_vu_class_name: str) -> str:
-        """Tạo mã nhân viên tự động theo prefix và số thứ tự."""
-        prefix_map = {"HanhChinh": "HC", "TiepThi": "TT", "TruongPhong": "TP"}
-        prefix = prefix_map.get(chuc_vu_class_name, "XX")
-        max_id = 0
-        for nv in self._danh_sach_nv:
-            if nv.ma_nv and nv.ma_nv.startswith(prefix):
-                try: max_id = max(max_id, int(nv.ma_nv[len(prefix):]))
-                except ValueError: continue
-        return f"{prefix}{max_id + 1:04d}"
-
-    def them_nhan_vien(self) -> None:
-        """Y1: Thêm nhân viên mới và lưu vào file."""
-        self._nv_moi = self._nhap_thong_tin_nv_moi()
-        if not self._nv_moi:
+    def _danh_dau_thay_doi(self, thao_tac: str, nv: NhanVien) -> None:
+        """Đánh dấu một nhân viên đã bị sửa/xóa và cần lưu xuống file."""
+        self._ban_ghi_thay_doi.pop(nv.ma_nv, None)
+        self._ban_ghi_thay_doi[nv.ma_nv] = (thao_tac, nv)
+
+    def luu_thay_doi(self) -> None:
+        """
+        Lưu các nhân viên đã đánh dấu thay đổi mà không ghi lại cả file:\n
+        - Định dạng hỗ trợ vá bản ghi (.txt, .csv): sửa/xóa trực tiếp từng dòng trong file.\n
+        - Định dạng khác (.json, .xml): ghi từng thao tác vào nhật ký.\n
+        Khi file có quá nhiều chỗ trống hoặc nhật ký quá dài thì ghi lại toàn bộ để thu gọn.
+        """
+        if not self._ban_ghi_thay_doi:
             return
-        
-        self.luu_file(self._nv_moi)
-        self._nv_moi = None  # Reset sau khi lưu
-        self.doc_file()
-        print("Đã thêm nhân viên thành công và cập nhật file.")
-
-    def _nhap_thong_tin_nv_moi(self):
-        """
-        Hàm phụ trợ để lấy thông tin nhân viên mới từ người dùng.
-        - Gồm loại nhận viên, họ tên, lương và các thông tin khác nếu có.
-        - Gọi hàm tạo mã nhân viên.
-        """
-        print("Chọn loại nhân viên để thêm:")
-        for i, cls_name in enumerate(CLASS_MAP.keys(), 1):
-            print(f"{i}. {cls_name}")
-        loai_nv = int(input("Chọn loại nhân viên: "))
-        
-        if loai_nv == 1: nv, cls_name = HanhChinh(), "HanhChinh"
-        elif loai_nv == 2: nv, cls_name = TiepThi(), "TiepThi"
-        elif loai_nv == 3: nv, cls_name = TruongPhong(), "TruongPhong"
-        else: print("Lựa chọn không hợp lệ."); return None
-        
-        nv.ma_nv = self.tao_ma_nv(cls_name)
-        nv.ho_ten = input("Nhập họ tên: ")
-        nv.luong = float(input("Nhập lương cơ bản: "))
-        
-        if isinstance(nv, TiepThi):
-            nv.doanh_so = float(input("Nhập doanh số: "))
-            nv.hoa_hong = float(input("Nhập tỉ lệ hoa hồng (vd: 0.1): "))
-        elif isinstance(nv, TruongPhong):
-            nv.luong_trach_nhiem = float(input("Nhập lương trách nhiệm: "))
-        return nv
-    
-    def _xuat_danh_sach(self, danh_sach: list) -> None:
-        """Y2: Xuất danh sách nhân viên ra màn hình."""
-        if not danh_sach:
-            print("Danh sách nhân viên trống.")
+        thay_doi, self._ban_ghi_thay_doi = self._ban_ghi_thay_doi, {}
+        if self._ghi_nen_duoc:
+            for thao_tac, nv in thay_doi.values():
+                self._gui_ghi_nen(thao_tac, nv)
             return
-        print(f"\n--- Danh sách nhân viên ({len(danh_sach)} nhân viên) ---")
-        print(f"{'Mã NV':<6}| {'Họ Tên':<30}| {'Chức Vụ':<13}| {'Lương':<16}| {'Doanh số':<16}| {'Hoa hồng':<10}| {'Lương trách nhiệm':<18}| {'Thu Nhập':<16}| {'Thuế TN':<16}")
-        for nv in danh_sach:
-            nv.xuat_thong_tin()
-    
-    def xuat_danh_sach_all(self) ->None:
-        """Xuất toàn bộ danh sách nhân viên."""
-        self._xuat_danh_sach(self._danh_sach_nv)
-
-    def _is_valid_ma_nv(self, ma_nv: str) -> bool:
-        """Kiểm tra định dạng mã nhân viên."""
-        if not ma_nv or len(ma_nv) != 6:
-            return False
-        prefix = ma_nv[:2].upper()
-        return prefix in {"HC", "TT", "TP"} and ma_nv[2:].isdigit()
-
-    def tim_nhan_vien_theo_ma(self, search_ma_nv: str) -> NhanVien | None:
-        """Y3: Tìm nhân viên theo mã."""
-        if self._is_valid_ma_nv(search_ma_nv) == False:
-            print("Mã nhân viên không hợp lệ. Mã Phải bắt đầu bằng HC, TT, TP và theo sau là 4 chữ số.")
-            return None
-        for nv in self._danh_sach_nv:
-            if nv.ma_nv == search_ma_nv.upper():
-                return nv
-        return None
-
-    def xoa_nhan_vien_theo_ma(self, search_ma_nv: str) -> None:
-        """Y4: Xóa nhân viên và cập nhật file."""
-        nv = self.tim_nhan_vien_theo_ma(search_ma_nv)
-        if nv:
-            nv.xuat_thong_tin()
-            confirm = input(f"Bạn có chắc chắn muốn xóa nhân viên {nv.ma_nv}? (y/n): ").strip().lower()
-            if confirm == 'y':
-                self._danh_sach_nv.remove(nv)
-                print(f"Đã xóa nhân viên: {nv.ho_ten}")
-                self.luu_file(self._danh_sach_nv)
-                print("Đã xóa và cập nhật file.")
-        else:
-            print("Không tìm thấy nhân viên.")
+        handler = self._handlers[self._current_file_type]
+        file_path = self._file_name_base + self._current_file_type
 
-    def cap_nhat_thong_tin(self) -> None:
-        """Y5: Cập nhật thông tin nhân viên và lưu file."""
-        ma_nv = input("Nhập mã nhân viên cần cập nhật: ").strip()
-        nv = self.tim_nhan_vien_theo_ma(ma_nv)
+        if not handler.ho_tro_va_ban_ghi:
+            nhat_ky = self._nhat_ky
+            nhat_ky.ghi_nhieu(thay_doi.values())
+            log.info("Đã ghi nhận %d thay đổi vào nhật ký '%s'.", len(thay_doi), nhat_ky.file_path)
+            if len(nhat_ky) >= self.NGUONG_GOP_NHAT_KY:
+                self.gop_nhat_ky()
+            return
 
-        if not nv:
-            print("Không tìm thấy nhân viên cần cập nhật.")
+        if len(self._nhat_ky):
+            # Vá file gốc khi nhật ký cũ còn thì lúc đọc lại nhật ký sẽ đè lên bản mới
+            self.gop_nhat_ky()
             return
-        
-        print("Thông tin hiện tại của nhân viên:")
-        nv.xuat_thong_tin()
-        print("Thông tin bạn muốn cập nhật (Không thể cập nhật mã nhân viên) bỏ trống (enter) nếu bạn muốn giữa nguyên:")
-        if isinstance(nv, TiepThi):
-            if (new_ho_ten := input(f"Họ tên ({nv.ho_ten}): ")) != "":
-                nv.ho_ten = new_ho_ten
-            if (new_luong := input(f"Lương cơ bản ({nv.luong}): ")) != "":
-                nv.luong = new_luong
-            if (new_doanh_so := input(f"Doanh số ({nv.doanh_so}): ")) != "":
-                nv.doanh_so = new_doanh_so
-            if (new_hoa_hong := input(f"Tỉ lệ hoa hồng ({nv.hoa_hong}): ")) != "":
-                nv.hoa_hong = new_hoa_hong
-        elif isinstance(nv, TruongPhong):
-            if (new_ho_ten := input(f"Họ tên ({nv.ho_ten}): ")) != "":
-                nv.ho_ten = new_ho_ten
-            if (new_luong := input(f"Lương cơ bản ({nv.luong}): ")) != "":
-                nv.luong = new_luong
-            if (new_luong_trach_nhiem := input(f"Lương trách nhiệm ({nv.luong_trach_nhiem}): ")) != "":
-                nv.luong_trach_nhiem = new_luong_trach_nhiem
-        else:
-            if (new_ho_ten := input(f"Họ tên ({nv.ho_ten}): ")) != "":
-                nv.ho_ten = new_ho_ten
-            if (new_luong := input(f"Lương cơ bản ({nv.luong}): ")) != "":
-                nv.luong = new_luong
-
-        self.luu_file(self._danh_sach_nv)
-        print("Đã cập nhật và lưu file.")
-
-    def tim_theo_khoang_luong(self):
-        """Y6: Tìm nhân viên theo khoảng lương."""
-        try: 
-            min_luong = float(input("Nhập mức lượng thấp nhất: "))
-            max_luong = float(input("Nhập mức lương cao nhất: "))
-            if min_luong > max_luong:
-                print("Mức lương thấp nhất phải nhỏ hơn mức lương cao nhất.")
-                return
-        except ValueError:
-            print("Vui lòng nhập số hợp lệ.")
+        khong_va_duoc = handler.va_nhieu_ban_ghi(
+            file_path, [nv for thao_tac, nv in thay_doi.values() if thao_tac != XOA],
+            [ma_nv for ma_nv, (thao_tac, _) in thay_doi.items() if thao_tac == XOA])
+        if khong_va_duoc and not handler.ho_tro_truy_van:
+            # File không khớp với danh sách trong bộ nhớ: ghi lại toàn bộ
+            self.luu_file(self._danh_sach_nv)
             return
-        nv_trong_khoang_luong = [nv for nv in self._danh_sach_nv if min_luong <= nv.luong <= max_luong]
-        if not nv_trong_khoang_luong:
-            print(f"Không có nhân viên nào trong khoảng lương {min_luong:,} - {max_luong:,}")
+        for ma_nv in khong_va_duoc:
+            log.warning("Không tìm thấy nhân viên %s trong '%s'.", ma_nv, file_path)
+        self._dau_vet_file = self._lay_dau_vet_file()
+        log.info("Đã cập nhật %d bản ghi trong file '%s'.", len(thay_doi), file_path)
+        self.gop_nhat_ky()  # thu gọn nếu số bia mộ đã vượt ngưỡng
+
+    def gop_nhat_ky(self) -> None:
+        """
+        Gộp nhật ký vào file gốc và thu gọn file: ghi lại toàn bộ (atomic) rồi xóa nhật ký.
+        Chỉ ghi khi nhật ký còn thao tác hoặc handler.can_nen() báo file có quá nhiều bia mộ.\n
+        Với .txt/.csv, file được ghi lại theo thứ tự danh sách trong bộ nhớ, nên các bản ghi
+        đã bị chuyển xuống cuối file (sửa dài hơn dòng cũ) trở về đúng chỗ.
+        Định dạng truy vấn trực tiếp (.bin, .db) không có danh sách trong bộ nhớ:
+        file mới được dựng bằng cách đọc dần chính file đó và áp dụng nhật ký.\n
+        Ném lại lỗi ghi nền (nếu có), khi đó nhật ký được giữ nguyên.
+        """
+        self.flush()
+        with self._khoa_file:
+            nhat_ky = self._nhat_ky
+            handler = self._handlers[self._current_file_type]
+            file_path = self._file_name_base + self._current_file_type
+            if not len(nhat_ky) and not handler.can_nen(file_path):
+                return
+            if handler.ho_tro_truy_van:
+                handler.ghi_luong(file_path, nhat_ky.phu_len(handler.iter_read(file_path)))
+                self._dau_vet_file = self._lay_dau_vet_file()
+            else:
+                self.luu_file(self._danh_sach_nv)
+            nhat_ky.xoa()
+
+    def _lay_dau_vet_file(self) -> tuple[int, int] | None:
+        """Lấy (mtime_ns, size) của file hiện tại, None nếu file chưa tồn tại."""
+        try:
+            st = os.stat(self._file_name_base + self._current_file_type)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def dong_bo_file(self) -> bool:
+        """
+        Đọc lại file chỉ khi nó đã bị thay đổi từ bên ngoài kể từ lần đọc/ghi gần nhất.
+        Danh sách trong bộ nhớ là nguồn dữ liệu chính nên bình thường không cần đọc lại.
+        Trả về True nếu đã đọc lại.
+        """
+        if self._bo_ghi_nen is not None and self._bo_ghi_nen.dang_cho:
+            return False  # file đang được chính luồng ghi nền cập nhật
+        with self._khoa_file:
+            if self._lay_dau_vet_file() == self._dau_vet_file:
+                return False
+        log.info("File dữ liệu đã bị thay đổi từ bên ngoài, đang đọc lại...")
+        self.doc_file()
+        return True
+
+    def duyet_file(self):
+        """
+        Đọc dần file hiện tại và trả về lần lượt từng nhân viên mà không tải cả danh sách.
+        Dùng làm nguồn cho các hàm trong truyvan hoặc tham số nguon của top_k.
+        Ném lại lỗi ghi nền (nếu có) thay vì đọc một file còn thiếu các thay đổi đó.
+        """
+        self.flush()
+        file_path = self._file_name_base + self._current_file_type
+        return self._nhat_ky.phu_len(self._handlers[self._current_file_type].iter_read(file_path))
+
+    # --- Ghi nền (write-behind) ---
+    @property
+    def _ghi_nen_duoc(self) -> bool:
+        """
+        Thay đổi được ghi trên luồng nền. Với CSDL và file .bin thì vẫn ghi ngay vì mọi
+        truy vấn đọc thẳng từ file, và mỗi lần ghi chỉ vá vài bản ghi.
+        """
+        return self._bo_ghi_nen is not None and not self._truy_van_truc_tiep
+
+    def bat_ghi_nen(self, kich_thuoc_hang_doi: int | None = None, thoi_gian_gom: float | None = None) -> None:
+        """
+        Bật chế độ ghi nền: thêm/sửa/xóa chỉ cập nhật danh sách trong bộ nhớ rồi đưa thay đổi
+        vào hàng đợi (tối đa kich_thuoc_hang_doi thao tác, đầy thì chờ). Luồng nền gom các
+        thay đổi tới liền nhau (trong thoi_gian_gom giây) và ghi xuống file một lần.
+        Gọi flush() để chờ ghi xong, tat_ghi_nen() để dừng (cũng được gọi khi thoát chương trình).
+        """
+        if self._bo_ghi_nen is not None:
             return
-        self._xuat_danh_sach(nv_trong_khoang_luong)
-
-    def sap_xep_theo_ten(self):
-        """Y7: Sắp xếp nhân viên theo họ và tên."""
-        # Sử dụng lambda để sắp xếp theo thuộc tính ho_ten
-        self._danh_sach_nv.sort(key=lambda nv: nv.ho_ten)
-        print("Đã sắp xếp danh sách theo tên.")
-        self._xuat_danh_sach(self._danh_sach_nv)
-
-    def sap_xep_theo_thu_nhap(self):
-        """Y8: Sắp xếp nhân viên theo thu nhập giảm dần."""
-        # Sử dụng lambda để sắp xếp dựa trên kết quả của phương thức get_thu_nhap()
-        self._danh_sach_nv.sort(key=lambda nv: nv.thu_nhap, reverse=True)
-        print("Đã sắp xếp danh sách theo thu nhập giảm dần.")
-        self._xuat_danh_sach(self._danh_sach_nv)
-
-    def top_5_thu_nhap_cao(self):
-        """Y9: Xuất 5 nhân viên có thu nhập cao nhất."""
-        # Sắp xếp và lấy 5 phần tử đầu tiên
-        sorted_list = sorted(self._danh_sach_nv, key=lambda nv: nv.thu_nhap, reverse=True)
-        top_5 = sorted_list[:5]
-        print("Top 5 nhân viên có thu nhập cao nhất:")
-        self._xuat_danh_sach(top_5)
+        self._bo_ghi_nen = BoGhiNen(self._ghi_thay_doi_nen, kich_thuoc_hang_doi, thoi_gian_gom)
+        atexit.register(self._tat_ghi_nen_khi_thoat)
+
+    def tat_ghi_nen(self) -> None:
+        """
+        Ghi nốt các thay đổi đang chờ, dừng luồng ghi nền và trở lại ghi trực tiếp.
+        Ném lại lỗi ghi nền (nếu có): các thay đổi đó chưa có trong file, chỉ còn trong bộ nhớ.
+        """
+        bo_ghi_nen, self._bo_ghi_nen = self._bo_ghi_nen, None
+        if bo_ghi_nen is not None:
+            atexit.unregister(self._tat_ghi_nen_khi_thoat)
+            bo_ghi_nen.dong()
 
+    def _tat_ghi_nen_khi_thoat(self) -> None:
+        """Gọi khi thoát chương trình mà chưa tắt ghi nền: không còn ai nhận ngoại lệ nên ghi lỗi vào log."""
+        try:
+            self.tat_ghi_nen()
+        except Exception as e:
+            log.error("Lỗi khi ghi file lúc thoát, các thay đổi cuối chưa được lưu: %s", e)
+
+    def flush(self) -> None:
+        """Chờ tới khi mọi thay đổi đang ghi nền đã xuống file. Ném lại lỗi (vd: OSError) nếu có lần ghi bị lỗi."""
+        if self._bo_ghi_nen is not None:
+            self._bo_ghi_nen.flush()
 
+    def _gui_ghi_nen(self, thao_tac: str, nv: NhanVien) -> None:
+        """Gửi một thay đổi cho luồng ghi nền, kèm nơi ghi là handler, file và nhật ký hiện tại."""
+        self._bo_ghi_nen.gui(thao_tac, nv, (self._handler_hien_tai, self._file_hien_tai, self._nhat_ky))
+
+    def _ghi_thay_doi_nen(self, thay_doi: dict[str, tuple[str, NhanVien]], dich: tuple) -> None:
+        """
+        Chạy trên luồng ghi nền: ghi một nhóm thay đổi đã gộp xuống nơi ghi dich
+        (handler, file, nhật ký lấy lúc gửi, xem _gui_ghi_nen).\n
+        - Thêm: ghi thêm cả nhóm vào cuối file trong một lần ghi.
+        - Sửa/xóa: vá từng dòng (.txt, .csv, .bin) nếu được, còn lại ghi cả nhóm vào nhật ký
+          với một lần fsync.
+        - Khi cần thu gọn, file mới được dựng bằng cách đọc dần file cũ và áp dụng nhật ký,
+          không dùng tới danh sách trong bộ nhớ (đang được luồng chính sửa tiếp).
+        """
+        handler, file_path, nhat_ky = dich
+        with self._khoa_file:
+            handler.ghi_them_nhieu(file_path, [nv for thao_tac, nv in thay_doi.values() if thao_tac == THEM])
+            sua_xoa = [(thao_tac, nv) for thao_tac, nv in thay_doi.values() if thao_tac != THEM]
+            if handler.ho_tro_va_ban_ghi and not len(nhat_ky):
+                # Bản ghi không vá được (file không khớp) thì đưa vào nhật ký rồi thu gọn bên dưới
+                khong_va_duoc = handler.va_nhieu_ban_ghi(
+                    file_path, [nv for thao_tac, nv in sua_xoa if thao_tac != XOA],
+                    [nv.ma_nv for thao_tac, nv in sua_xoa if thao_tac == XOA])
+                sua_xoa = [(thao_tac, nv) for thao_tac, nv in sua_xoa if nv.ma_nv in khong_va_duoc]
+            nhat_ky.ghi_nhieu(sua_xoa)
+            if (len(nhat_ky) and handler.ho_tro_va_ban_ghi) or len(nhat_ky) >= self.NGUONG_GOP_NHAT_KY \
+                    or handler.can_nen(file_path):
+                handler.ghi_luong(file_path, nhat_ky.phu_len(handler.iter_read(file_path)))
+                nhat_ky.xoa()
+            if file_path == self._file_hien_tai:
+                self._dau_vet_file = self._lay_dau_vet_file()
+
+    def tao_ma_nv(self, chuc_vu_class_name: str) -> str:
+        """
+        Tạo mã nhân viên tự động theo prefix và số thứ tự.
+        Chỉ xem trước mã kế tiếp, bộ đếm được tăng khi nhân viên thực sự được thêm.
+        """
+        prefix = PREFIX_MAP.get(chuc_vu_class_name, "XX")
+        return self._bo_cap_ma.ma_tiep_theo(prefix)
+
+    def dat_truoc_ma(self, chuc_vu_class_name: str, so_luong: int) -> list[str]:
+        """Đặt trước một khối mã liên tiếp để nhập hàng loạt nhân viên cùng loại."""
+        prefix = PREFIX_MAP.get(chuc_vu_class_name, "XX")
+        return self._bo_cap_ma.dat_truoc(prefix, so_luong)
+
+    def bang_luong(self) -> BangLuong:
+        """Tính thu nhập và thuế của toàn bộ danh sách hiện tại trong một lượt."""
+        return tinh_bang_luong(self.tat_ca_nhan_vien())
+
+    def tat_ca_nhan_vien(self) -> list:
+        """Toàn bộ nhân viên: danh sách trong bộ nhớ, hoặc đọc từ file khi truy vấn trực tiếp."""
+        if self._truy_van_truc_tiep:
+            return self._handler_hien_tai.read(self._file_hien_tai)
+        return self._danh_sach_nv
+
+    def xuat_danh_sach_all(self, out, offset: int = 0, limit: int | None = None, dinh_dang: str = "bang") -> int:
+        """
+        Ghi toàn bộ danh sách nhân viên ra out (file đang mở) theo dinh_dang ("bang", "csv", "jsonl"),
+        không kèm thông báo và không phân trang. Trả về số dòng đã ghi.
+        """
+        return xuat_bang(self.tat_ca_nhan_vien(), out, offset=offset, limit=limit, dinh_dang=dinh_dang)
+
+    def ma_hop_le(self, ma_nv: str) -> bool:
+        """Kiểm tra định dạng mã nhân viên (cho phép hơn 4 chữ số khi vượt 9999)."""
+        tach = BoCapMa.tach_ma(ma_nv)
+        return tach is not None and tach[0] in {"HC", "TT", "TP"}
+
+    def top_k(self, k: int = 5, giam_dan: bool = True, chuc_vu: str | None = None, nguon=None) -> list:
+        """
+        Lấy k nhân viên có thu nhập cao nhất (hoặc thấp nhất nếu giam_dan=False),
+        có thể lọc theo chức vụ. nguon mặc định là danh sách hiện tại, hoặc truyền
+        vào một iterator bản ghi đọc từ file để không phải tải toàn bộ danh sách.
+        """
+        if nguon is None and self._truy_van_truc_tiep:
+            return self._handler_hien_tai.top_k(self._file_hien_tai, k, giam_dan=giam_dan, chuc_vu=chuc_vu)
+        if nguon is None:
+            nguon = self._chi_muc_ma.values()
+        return top_k(nguon, k, giam_dan=giam_dan, chuc_vu=chuc_vu)
@@ -1,11 +1,39 @@
 import os
 from abc import ABC, abstractmethod
+from array import array
+import contextlib
+from contextlib import contextmanager
 import csv
+import heapq
+import io
 import json
+import logging
+import math
+import mmap
+import re
+import shutil
+import sqlite3
+import stat
+import struct
+import tempfile
+import textwrap
 import xml.etree.ElementTree as ETree
-from xml.dom import minidom
+from itertools import islice
 from typing import TypeVar, Union
-from nhansu import HanhChinh, TiepThi, TruongPhong
+from nhansu import HanhChinh, TiepThi, TruongPhong, tao_hang_loat, tao_theo_lo
+from bangluong import tinh_bang_luong
+from bieuthue import bo_thue
+from thongke import gop_ket_qua, tong_hop_nhom
+from tiengviet import khoa_sap_xep, khoa_sap_xep_chuoi
+from danhsachcot import MA_CHUC_VU, DanhSachCot
+import docsongsong
+
+log = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là tùy chọn
+    np = None
 EmployeeType = TypeVar('EmployeeType', HanhChinh, TiepThi, TruongPhong)
 
 # Utility: Ánh xạ chuỗi chức vụ với Lớp tương ứng để tái tạo đối tượng
@@ -15,16 +43,304 @@ CLASS_MAP = {
     "Trưởng Phòng": TruongPhong
 }
 
+@contextmanager
+def ghi_nguyen_tu(file_path: str, mode: str = "w", **kwargs):
+    """
+    Mở file để ghi đè một cách an toàn (atomic).\n
+    Dữ liệu được ghi vào một file tạm cùng thư mục, fsync xuống đĩa rồi mới đổi tên
+    đè lên file đích. Nếu chương trình dừng giữa chừng thì file cũ vẫn còn nguyên.
+    """
+    thu_muc = os.path.dirname(os.path.abspath(file_path))
+    fd, file_tam = tempfile.mkstemp(dir=thu_muc, prefix=os.path.basename(file_path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # Giữ quyền truy cập của file cũ (mkstemp tạo file chỉ chủ sở hữu đọc được)
+        quyen = stat.S_IMODE(os.stat(file_path).st_mode) if os.path.exists(file_path) else 0o644
+        os.chmod(file_tam, quyen)
+        os.replace(file_tam, file_path)
+    except BaseException:
+        if os.path.exists(file_tam):
+            os.remove(file_tam)
+        raise
+    _fsync_thu_muc(thu_muc)
+
+
+def _fsync_thu_muc(thu_muc: str) -> None:
+    """Đồng bộ thư mục để việc đổi tên file được ghi xuống đĩa (bỏ qua nếu hệ điều hành không hỗ trợ)."""
+    try:
+        fd = os.open(thu_muc, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 class FileHandler(ABC):
     """Lớp cơ sở trừu tượng định nghĩa 'khung' cho các lớp xử lý file."""
     @abstractmethod
     def read(self, file_path: str) -> list:
         pass
+    def iter_read(self, file_path: str):
+        """
+        Đọc file và trả về lần lượt từng nhân viên (generator).
+        Lớp con ghi đè để đọc dần từng bản ghi với bộ nhớ giới hạn;
+        mặc định thì đọc cả danh sách rồi trả về từng phần tử.
+        """
+        yield from self.read(file_path)
+
+    @staticmethod
+    def _tim_tu_cuoi_file(f, chuoi: bytes, kich_thuoc_duoi: int = 4096) -> tuple[int, bytes]:
+        """
+        Tìm lần xuất hiện cuối cùng của `chuoi` trong phần đuôi của file nhị phân f.
+        Trả về (vị trí byte tính từ đầu file hoặc -1, phần đuôi đã đọc).
+        Chỉ đọc tối đa kich_thuoc_duoi byte cuối nên chi phí không phụ thuộc kích thước file.
+        """
+        f.seek(0, os.SEEK_END)
+        bat_dau = max(0, f.tell() - kich_thuoc_duoi)
+        f.seek(bat_dau)
+        duoi = f.read()
+        i = duoi.rfind(chuoi)
+        return (bat_dau + i if i >= 0 else -1), duoi[:i] if i >= 0 else duoi
     @abstractmethod
     def write(self, file_path: str, data: list[HanhChinh | TiepThi | TruongPhong]) -> None:
         pass
 
-class QuanLyTxt(FileHandler):
+    # Vá từng bản ghi: mặc định không hỗ trợ, QuanLyNhanSu sẽ dùng nhật ký thay thế
+    ho_tro_va_ban_ghi = False
+    # Truy vấn trực tiếp trên file (CSDL): QuanLyNhanSu không cần tải cả danh sách vào bộ nhớ
+    ho_tro_truy_van = False
+
+    def cap_nhat_ban_ghi(self, file_path: str, nv) -> bool:
+        """Ghi đè bản ghi của nv trong file. Trả về False nếu không vá được."""
+        return False
+
+    def xoa_ban_ghi(self, file_path: str, ma_nv: str) -> bool:
+        """Xóa bản ghi có mã ma_nv khỏi file. Trả về False nếu không vá được."""
+        return False
+
+    def can_nen(self, file_path: str) -> bool:
+        """File có nhiều chỗ trống do vá bản ghi, nên ghi lại toàn bộ để thu gọn."""
+        return False
+
+    def va_nhieu_ban_ghi(self, file_path: str, cac_nv_sua: list, cac_ma_xoa: list) -> set[str]:
+        """
+        Ghi đè các bản ghi của cac_nv_sua và xóa các mã cac_ma_xoa.
+        Trả về tập mã không vá được. Lớp con ghi đè để vá cả nhóm trong một lần ghi.
+        """
+        loi = {nv.ma_nv for nv in cac_nv_sua if not self.cap_nhat_ban_ghi(file_path, nv)}
+        loi.update(ma_nv for ma_nv in cac_ma_xoa if not self.xoa_ban_ghi(file_path, ma_nv))
+        return loi
+
+    def ghi_them_nhieu(self, file_path: str, cac_nv: list) -> None:
+        """Ghi thêm nhiều nhân viên vào cuối file. Lớp con ghi đè để ghi cả nhóm một lần."""
+        for nv in cac_nv:
+            self.write(file_path, nv)
+
+    @staticmethod
+    def _dau_vet(file_path: str) -> tuple[int, int]:
+        """(mtime_ns, size) của file, dùng để biết chỉ mục vị trí còn khớp với file hay không."""
+        thong_tin = os.stat(file_path)
+        return thong_tin.st_mtime_ns, thong_tin.st_size
+
+    # Ghi dần từ một nguồn bất kỳ (dùng khi chuyển đổi định dạng)
+    KICH_THUOC_LO_GHI = 8192  # Số nhân viên mỗi lô khi ghi dần
+
+    @staticmethod
+    def _chia_lo(nguon, kich_thuoc_lo: int):
+        """Gom nguồn nhân viên (list hoặc iterator) thành từng lô (list)."""
+        nguon = iter(nguon)
+        while lo := list(islice(nguon, kich_thuoc_lo)):
+            yield lo
+
+    def ghi_luong(self, file_path: str, nguon, kich_thuoc_lo: int | None = None, bao_tien_do=None) -> int:
+        """
+        Ghi lại toàn bộ file từ một nguồn nhân viên (list hoặc iterator) theo từng lô,
+        gọi bao_tien_do(số bản ghi đã ghi) sau mỗi lô. Trả về số bản ghi đã ghi.\n
+        Lớp con ghi đè để chỉ giữ một lô trong bộ nhớ; mặc định thì gom cả nguồn rồi gọi write.
+        """
+        danh_sach = list(nguon)
+        self.write(file_path, danh_sach)
+        if bao_tien_do is not None:
+            bao_tien_do(len(danh_sach))
+        return len(danh_sach)
+
+
+class FileTheoDong(FileHandler):
+    """
+    Lớp cơ sở cho các định dạng mỗi nhân viên một dòng (.txt, .csv).\n
+    Giữ chỉ mục vị trí byte của từng dòng theo mã nhân viên để sửa/xóa một bản ghi
+    mà không phải ghi lại cả file:\n
+    - Sửa: dòng mới vừa chỗ cũ thì ghi đè tại chỗ (phần thừa lấp bằng KY_TU_LAP),
+      nếu dài hơn thì ghi dòng mới vào cuối file rồi xóa dòng cũ.\n
+    - Xóa: ghi đè dòng bằng KY_TU_LAP (bia mộ), khi đọc file dòng trống được bỏ qua.\n
+    Bản ghi bị chuyển xuống cuối file nên thứ tự trong file (và khi đọc lại) khác thứ tự
+    lúc ghi. Khi số bia mộ vượt BIA_MO_TOI_THIEU và TI_LE_NEN so với số bản ghi, can_nen()
+    báo để QuanLyNhanSu.gop_nhat_ky() ghi lại toàn bộ file (thu gọn) theo thứ tự trong bộ nhớ.
+    """
+    TIEU_DE = [
+        'Mã NV', 'Họ Tên', 'Chức Vụ', 'Lương', 'Doanh số',
+        'Hoa hồng', 'Lương trách nhiệm', 'Thu Nhập', 'Thuế TN'
+    ]
+    BIA_MO_TOI_THIEU = 16  # Số bia mộ tối thiểu trước khi xét thu gọn
+    TI_LE_NEN = 0.25       # Thu gọn khi số bia mộ vượt tỉ lệ này so với số bản ghi
+    ho_tro_va_ban_ghi = True
+    KY_TU_LAP = b' '       # Ký tự lấp phần thừa khi ghi đè tại chỗ và làm bia mộ
+
+    def __init__(self):
+        # file_path -> [dấu vết (mtime_ns, size), {ma_nv: (vị trí, độ dài dòng)}, số bia mộ]
+        self._chi_muc_dong: dict[str, list] = {}
+
+    @abstractmethod
+    def _tao_dong(self, nv, thu_nhap=None, thue_tn=None) -> str:
+        """Tạo một dòng dữ liệu (kể cả ký tự xuống dòng) cho nhân viên."""
+
+    def _dong_tieu_de(self) -> str:
+        return ','.join(self.TIEU_DE) + '\n'
+
+    def _ghi_lo(self, f, lo: list, bang_luong) -> None:
+        """Ghi một lô nhân viên (thu nhập/thuế đã tính sẵn) vào file đang mở."""
+        f.write(''.join([self._tao_dong(nv, thu_nhap, thue) for nv, thu_nhap, thue
+                         in zip(lo, bang_luong.thu_nhap, bang_luong.thue_thu_nhap)]))
+
+    def ghi_luong(self, file_path: str, nguon, kich_thuoc_lo: int | None = None, bao_tien_do=None) -> int:
+        """Ghi lại toàn bộ file (atomic) từ nguồn nhân viên, mỗi lần một lô."""
+        so_ban_ghi = 0
+        with ghi_nguyen_tu(file_path, 'w', newline='', encoding='utf-8') as f:
+            f.write(self._dong_tieu_de())
+            for lo in self._chia_lo(nguon, kich_thuoc_lo or self.KICH_THUOC_LO_GHI):
+                self._ghi_lo(f, lo, tinh_bang_luong(lo))
+                so_ban_ghi += len(lo)
+                if bao_tien_do is not None:
+                    bao_tien_do(so_ban_ghi)
+        self._chi_muc_dong.pop(file_path, None)  # file mới không còn bia mộ, dựng lại chỉ mục khi cần
+        return so_ban_ghi
+
+    def _lay_chi_muc_dong(self, file_path: str) -> list | None:
+        """Trả về chỉ mục vị trí dòng của file, dựng lại nếu file đã bị thay đổi từ bên ngoài."""
+        if not os.path.exists(file_path):
+            return None
+        dau_vet = self._dau_vet(file_path)
+        chi_muc = self._chi_muc_dong.get(file_path)
+        if chi_muc is not None and chi_muc[0] == dau_vet:
+            return chi_muc
+
+        vi_tri, so_bia_mo, offset, dong_truoc_trong = {}, 0, 0, False
+        with open(file_path, 'rb') as f:
+            for dong in f:
+                noi_dung = dong.rstrip(b'\r\n')
+                if noi_dung.strip():
+                    vi_tri[noi_dung.split(b',', 1)[0].decode('utf-8')] = (offset, len(noi_dung))
+                elif noi_dung or not dong_truoc_trong:
+                    # Dòng toàn khoảng trắng, hoặc một đoạn dòng trống liền nhau (bia mộ lấp bằng '\n';
+                    # các bia mộ kề nhau được tính là một, chỉ dùng để ước lượng khi nào cần thu gọn)
+                    so_bia_mo += 1
+                dong_truoc_trong = not noi_dung
+                offset += len(dong)
+        chi_muc = self._chi_muc_dong[file_path] = [dau_vet, vi_tri, so_bia_mo]
+        return chi_muc
+
+    def _ghi_them_dong(self, file_path: str, cac_nv: list) -> None:
+        """Ghi thêm các dòng vào cuối file trong một lần ghi và cập nhật chỉ mục nếu đã có."""
+        if not cac_nv:
+            return
+        cac_dong = [self._tao_dong(nv).encode('utf-8') for nv in cac_nv]
+        chi_muc = self._chi_muc_dong.get(file_path)
+        if chi_muc is not None and (not os.path.exists(file_path) or chi_muc[0] != self._dau_vet(file_path)):
+            del self._chi_muc_dong[file_path]  # chỉ mục đã cũ, lần sau sẽ dựng lại
+            chi_muc = None
+        with open(file_path, 'ab') as f:
+            if f.tell() == 0:
+                f.write(self._dong_tieu_de().encode('utf-8'))
+            vi_tri = f.tell()
+            f.write(b''.join(cac_dong))
+        if chi_muc is not None:
+            for nv, dong in zip(cac_nv, cac_dong):
+                chi_muc[1][nv.ma_nv] = (vi_tri, len(dong.rstrip(b'\r\n')))
+                vi_tri += len(dong)
+            chi_muc[0] = self._dau_vet(file_path)
+
+    def ghi_them_nhieu(self, file_path: str, cac_nv: list) -> None:
+        self._ghi_them_dong(file_path, cac_nv)
+
+    def _ghi_de_dong(self, file_path: str, ma_nv: str, nv=None) -> bool:
+        """Ghi đè dòng của ma_nv bằng dữ liệu của nv, hoặc bằng bia mộ nếu nv là None."""
+        chi_muc = self._lay_chi_muc_dong(file_path)
+        if chi_muc is None or ma_nv not in chi_muc[1]:
+            return False
+        vi_tri, do_dai = chi_muc[1][ma_nv]
+        with open(file_path, 'r+b') as f:
+            if nv is None:
+                f.seek(vi_tri)
+                f.write(self.KY_TU_LAP * do_dai)
+                del chi_muc[1][ma_nv]
+                chi_muc[2] += 1
+            else:
+                dong = self._tao_dong(nv).encode('utf-8')
+                noi_dung = dong.rstrip(b'\r\n')
+                if len(noi_dung) <= do_dai:
+                    f.seek(vi_tri)
+                    f.write(noi_dung.ljust(do_dai, self.KY_TU_LAP))
+                else:
+                    # Ghi dòng mới trước rồi mới xóa dòng cũ: nếu dừng giữa chừng thì
+                    # chỉ bị trùng mã (khi đọc giữ bản ghi sau cùng) chứ không mất dữ liệu
+                    f.seek(0, os.SEEK_END)
+                    vi_tri_moi = f.tell()
+                    f.write(dong)
+                    f.flush()
+                    f.seek(vi_tri)
+                    f.write(self.KY_TU_LAP * do_dai)
+                    chi_muc[1][ma_nv] = (vi_tri_moi, len(noi_dung))
+                    chi_muc[2] += 1
+            f.flush()
+            os.fsync(f.fileno())
+        chi_muc[0] = self._dau_vet(file_path)
+        return True
+
+    def cap_nhat_ban_ghi(self, file_path: str, nv) -> bool:
+        return self._ghi_de_dong(file_path, nv.ma_nv, nv)
+
+    def xoa_ban_ghi(self, file_path: str, ma_nv: str) -> bool:
+        return self._ghi_de_dong(file_path, ma_nv)
+
+    # --- Đọc song song ---
+    SO_TIEN_TRINH = None  # Số tiến trình khi đọc song song, None = số CPU
+    KICH_THUOC_KHOI = docsongsong.KICH_THUOC_KHOI
+    la_csv = False
+
+    def _vi_tri_cot(self, file_path: str) -> tuple:
+        """Chỉ số các cột ma_nv, ho_ten, chuc_vu, luong, doanh_so, hoa_hong, luong_trach_nhiem."""
+        return tuple(range(7))
+
+    def doc_song_song(self, file_path: str, so_tien_trinh: int | None = None,
+                      kich_thuoc_khoi: int | None = None) -> DanhSachCot:
+        """
+        Đọc file lớn bằng nhiều tiến trình, trả về DanhSachCot (cùng thứ tự với read()).
+        Mặc định dùng SO_TIEN_TRINH và KICH_THUOC_KHOI của lớp.
+        """
+        if not os.path.exists(file_path):
+            log.warning("File '%s' không tồn tại.", file_path)
+            return DanhSachCot()
+        return docsongsong.doc_song_song(
+            file_path, self.la_csv, self._vi_tri_cot(file_path),
+            so_tien_trinh=so_tien_trinh or self.SO_TIEN_TRINH,
+            kich_thuoc_khoi=kich_thuoc_khoi or self.KICH_THUOC_KHOI)
+
+    def can_nen(self, file_path: str) -> bool:
+        chi_muc = self._chi_muc_dong.get(file_path)
+        if chi_muc is None:
+            return False
+        so_bia_mo = chi_muc[2]
+        return so_bia_mo >= max(self.BIA_MO_TOI_THIEU, len(chi_muc[1]) * self.TI_LE_NEN)
+
+
+class QuanLyTxt(FileTheoDong):
     """
     Xử lý việc đọc/ghi file định dạng .txt.\n
     File lưu theo kiểu: ma_nv, ho_ten, chuc_vu, luong, thong_tin_them1, thong_tin_them2\n
@@ -36,42 +352,35 @@ class QuanLyTxt(FileHandler):
     """
 
     def read(self, file_path: str) -> list:
-        danh_sach = []
+        return list(self.iter_read(file_path))
 
+    def iter_read(self, file_path: str):
+        """Đọc từng dòng của file và trả về lần lượt từng nhân viên."""
         if not os.path.exists(file_path): # kiểm tra file tồn tại
-            print(f"File '{file_path}' không tồn tại.")
-            return []
+            log.warning("File '%s' không tồn tại.", file_path)
+            return
 
         with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue # bỏ qua dòng trống
-
-                parts = line.split(',')
-                if len(parts) < 4:
-                    continue  # bỏ qua dòng sai định dạng
-
-                ma_nv, ho_ten, chuc_vu, luong = parts[:4]
-                NhanVienClass = CLASS_MAP.get(chuc_vu)
-                if not NhanVienClass:
-                    continue
-
-                nv = NhanVienClass()
-                nv.ma_nv = ma_nv
-                nv.ho_ten = ho_ten
-                nv.luong = float(luong)
+            yield from tao_theo_lo(self._tach_dong(f))
 
-                # Nếu là nhân viên đặc biệt có thêm thông tin
-                if isinstance(nv, TiepThi):
-                    nv.doanh_so = float(parts[4])
-                    nv.hoa_hong = float(parts[5])
-                elif isinstance(nv, TruongPhong):
-                    nv.luong_trach_nhiem = float(parts[6])
+    @staticmethod
+    def _tach_dong(f):
+        """Tách từng dòng thành (lop, ma_nv, ho_ten, luong, doanh_so, hoa_hong, luong_trach_nhiem)."""
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue # bỏ qua dòng trống
 
-                danh_sach.append(nv)
+            parts = line.split(',')
+            if len(parts) < 4:
+                continue  # bỏ qua dòng sai định dạng
 
-        return danh_sach
+            NhanVienClass = CLASS_MAP.get(parts[2])
+            if not NhanVienClass:
+                continue
+            if len(parts) < 7:
+                parts += ['0'] * (7 - len(parts))  # thiếu cột thông tin thêm thì coi là 0
+            yield NhanVienClass, parts[0], parts[1], parts[3], parts[4], parts[5], parts[6]
 
     # write method chia ra làm 2 phần, ghi dữ liệu nhân viên mới và cập nhật lại danh sách gồm (thay đổi, xóa nhân viên)
     def write(self, file_path: str, nv_moi) -> None:
@@ -79,159 +388,121 @@ class QuanLyTxt(FileHandler):
         Ghi dữ liệu ra file với các cột cố định.
         Mở file ở chế độ 'a' (append) để ghi thêm dữ liệu mà không làm mất dữ liệu cũ
         """
-        # Định nghĩa tiêu đề cho các cột
-        headers = [
-            'Mã NV', 'Họ Tên', 'Chức Vụ', 'Lương', 'Doanh số', 
-            'Hoa hồng', 'Lương trách nhiệm', 'Thu Nhập', 'Thuế TN'
-        ]
-        
         # Nếu nv_moi là một đối tượng nhân viên với thì mở file ở chế độ 'a'
         # Nếu là một danh sách thì mở file ở chế độ 'w' để ghi đè
         if isinstance(nv_moi, list):
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                # Ghi dòng tiêu đề
-                f.write(','.join(headers) + '\n')
-                for nv in nv_moi:
-                    # Chuẩn bị các giá trị mặc định cho các cột có thể trống
-                    doanh_so = 0.0
-                    hoa_hong = 0.0
-                    luong_trach_nhiem = 0.0
-
-                    chuc_vu = nv.chuc_vu
-
-                    # Cập nhật giá trị riêng tùy theo loại nhân viên
-                    if isinstance(nv, TiepThi):
-                        doanh_so = nv.doanh_so
-                        hoa_hong = nv.hoa_hong
-                    elif isinstance(nv, TruongPhong):
-                        luong_trach_nhiem = nv.luong_trach_nhiem
-                    
-                    # Tạo một hàng dữ liệu theo đúng thứ tự của tiêu đề
-                    row = [
-                        nv.ma_nv,
-                        nv.ho_ten,
-                        chuc_vu,
-                        nv.luong,
-                        doanh_so,
-                        hoa_hong,
-                        luong_trach_nhiem,
-                        nv.thu_nhap,
-                        nv.thue_thu_nhap
-                    ]
-                    f.write(','.join(map(str, row)) + '\n')
+            # Ghi dòng tiêu đề rồi ghi theo lô, thu nhập/thuế tính cho cả lô một lần
+            self.ghi_luong(file_path, nv_moi)
         elif isinstance(nv_moi, (HanhChinh, TiepThi, TruongPhong)):
-            with open(file_path, 'a', newline='', encoding='utf-8') as f:
-                # Ghi dòng tiêu đề nếu file mới hoặc trống
-                if os.path.getsize(file_path) == 0:
-                    f.write(','.join(headers) + '\n')
-                
-                # Chuẩn bị các giá trị mặc định cho các cột có thể trống
-                doanh_so = 0.0
-                hoa_hong = 0.0
-                luong_trach_nhiem = 0.0
-
-                chuc_vu = nv_moi.chuc_vu
-
-                # Cập nhật giá trị riêng tùy theo loại nhân viên
-                if isinstance(nv_moi, TiepThi):
-                    doanh_so = nv_moi.doanh_so
-                    hoa_hong = nv_moi.hoa_hong
-                elif isinstance(nv_moi, TruongPhong):
-                    luong_trach_nhiem = nv_moi.luong_trach_nhiem
-                
-                # Tạo một hàng dữ liệu theo đúng thứ tự của tiêu đề
-                row = [
-                    nv_moi.ma_nv,
-                    nv_moi.ho_ten,
-                    chuc_vu,
-                    nv_moi.luong,
-                    doanh_so,
-                    hoa_hong,
-                    luong_trach_nhiem,
-                    nv_moi.thu_nhap,
-                    nv_moi.thue_thu_nhap
-                ]
-                f.write(','.join(map(str, row)) + '\n')
+            self._ghi_them_dong(file_path, [nv_moi])
         else:
             raise ValueError("Dữ liệu không hợp lệ. Phải là đối tượng nhân viên hoặc danh sách nhân viên.")
 
+    def _tao_dong(self, nv, thu_nhap=None, thue_tn=None) -> str:
+        """Tạo một dòng dữ liệu theo đúng thứ tự của tiêu đề."""
+        if thu_nhap is None:
+            thu_nhap, thue_tn = nv.thu_nhap, nv.thue_thu_nhap
+        # Chuẩn bị các giá trị mặc định cho các cột có thể trống
+        doanh_so = 0.0
+        hoa_hong = 0.0
+        luong_trach_nhiem = 0.0
 
-class QuanLyCsv(FileHandler):
+        # Cập nhật giá trị riêng tùy theo loại nhân viên
+        if isinstance(nv, TiepThi):
+            doanh_so = nv.doanh_so
+            hoa_hong = nv.hoa_hong
+        elif isinstance(nv, TruongPhong):
+            luong_trach_nhiem = nv.luong_trach_nhiem
+
+        row = [
+            nv.ma_nv,
+            nv.ho_ten,
+            nv.chuc_vu,
+            nv.luong,
+            doanh_so,
+            hoa_hong,
+            luong_trach_nhiem,
+            thu_nhap,
+            thue_tn
+        ]
+        return ','.join(map(str, row)) + '\n'
+
+
+class QuanLyCsv(FileTheoDong):
     """Xử lý việc đọc/ghi file định dạng .csv."""
     
     def read(self, file_path: str) -> list:
-        danh_sach = []
-        
+        return list(self.iter_read(file_path))
+
+    def iter_read(self, file_path: str):
+        """Đọc từng dòng CSV và trả về lần lượt từng nhân viên."""
         if not os.path.exists(file_path):
-            print(f"File '{file_path}' không tồn tại.")
-            return danh_sach
+            log.warning("File '%s' không tồn tại.", file_path)
+            return
             
         try:
             with open(file_path, 'r', encoding='utf-8', newline='') as f:
                 reader = csv.DictReader(f)
-                for row in reader:
-                    chuc_vu = row['Chức Vụ']
-                    NhanVienClass = CLASS_MAP.get(chuc_vu)
-                    
-                    if not NhanVienClass:
-                        continue
-                    
-                    nv = NhanVienClass()
-                    nv.ma_nv = row['Mã NV']
-                    nv.ho_ten = row['Họ Tên']
-                    nv.luong = float(row['Lương'])
-                    
-                    if isinstance(nv, TiepThi):
-                        nv.doanh_so = float(row['Doanh số'])
-                        nv.hoa_hong = float(row['Hoa hồng'])
-                    elif isinstance(nv, TruongPhong):
-                        nv.luong_trach_nhiem = float(row['Lương trách nhiệm'])
-                    
-                    danh_sach.append(nv)
+                cac_dong = (
+                    (CLASS_MAP[row['Chức Vụ']], row['Mã NV'], row['Họ Tên'], row['Lương'],
+                     row['Doanh số'], row['Hoa hồng'], row['Lương trách nhiệm'])
+                    for row in reader if row['Chức Vụ'] in CLASS_MAP
+                )
+                yield from tao_theo_lo(cac_dong)
                     
         except Exception as e:
-            print(f"Lỗi khi đọc file CSV '{file_path}': {e}")
-            
-        return danh_sach
+            log.error("Lỗi khi đọc file CSV '%s': %s", file_path, e)
 
     def write(self, file_path: str, data) -> None:
-        headers = [
-            'Mã NV', 'Họ Tên', 'Chức Vụ', 'Lương', 'Doanh số', 
-            'Hoa hồng', 'Lương trách nhiệm', 'Thu Nhập', 'Thuế TN'
-        ]
-        
         try:
             if isinstance(data, list):
                 # Ghi toàn bộ danh sách
-                with open(file_path, 'w', encoding='utf-8', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=headers)
-                    writer.writeheader()
-                    
-                    for nv in data:
-                        row = self._tao_dong_du_lieu(nv)
-                        writer.writerow(row)
-                        
+                self.ghi_luong(file_path, data)
+
             elif isinstance(data, (HanhChinh, TiepThi, TruongPhong)):
                 # Ghi thêm một nhân viên mới
-                file_exists = os.path.exists(file_path)
-                
-                with open(file_path, 'a', encoding='utf-8', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=headers)
-                    
-                    if not file_exists or os.path.getsize(file_path) == 0:
-                        writer.writeheader()
-                    
-                    row = self._tao_dong_du_lieu(data)
-                    writer.writerow(row)
+                self._ghi_them_dong(file_path, [data])
                     
             else:
                 raise ValueError("Dữ liệu không hợp lệ. Phải là đối tượng nhân viên hoặc danh sách nhân viên.")
                 
         except Exception as e:
-            print(f"Lỗi khi ghi file CSV '{file_path}': {e}")
+            log.error("Lỗi khi ghi file CSV '%s': %s", file_path, e)
+
+    la_csv = True
+    # Khoảng trắng lấp sau dòng sẽ dính vào trường cuối ("Thuế TN") với chương trình đọc CSV
+    # khác, còn dòng trống thì mọi chương trình đọc CSV đều bỏ qua
+    KY_TU_LAP = b'\n'
+
+    def _dong_tieu_de(self) -> str:
+        return ','.join(self.TIEU_DE) + '\r\n'  # csv.writer mặc định kết thúc dòng bằng '\r\n'
+
+    def _vi_tri_cot(self, file_path: str) -> tuple:
+        """Lấy chỉ số các cột theo dòng tiêu đề của file (giống csv.DictReader)."""
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            tieu_de = next(csv.reader(f), [])
+        if not set(self.TIEU_DE[:7]) <= set(tieu_de):
+            return super()._vi_tri_cot(file_path)
+        return tuple(tieu_de.index(ten) for ten in self.TIEU_DE[:7])
+
+    def _ghi_lo(self, f, lo: list, bang_luong) -> None:
+        csv.DictWriter(f, fieldnames=self.TIEU_DE).writerows(
+            self._tao_dong_du_lieu(nv, thu_nhap, thue) for nv, thu_nhap, thue
+            in zip(lo, bang_luong.thu_nhap, bang_luong.thue_thu_nhap))
 
-    def _tao_dong_du_lieu(self, nv):
-        """Tạo dictionary chứa dữ liệu của một nhân viên để ghi vào CSV"""
+    def _tao_dong(self, nv, thu_nhap=None, thue_tn=None) -> str:
+        """Tạo một dòng CSV (đã quote khi cần) giống như csv.DictWriter ghi ra."""
+        buf = io.StringIO()
+        csv.DictWriter(buf, fieldnames=self.TIEU_DE).writerow(self._tao_dong_du_lieu(nv, thu_nhap, thue_tn))
+        return buf.getvalue()
+
+    def _tao_dong_du_lieu(self, nv, thu_nhap=None, thue_tn=None):
+        """
+        Tạo dictionary chứa dữ liệu của một nhân viên để ghi vào CSV.
+        Có thể truyền sẵn thu nhập/thuế đã tính hàng loạt để không tính lại.
+        """
+        if thu_nhap is None:
+            thu_nhap, thue_tn = nv.thu_nhap, nv.thue_thu_nhap
         doanh_so = 0.0
         hoa_hong = 0.0
         luong_trach_nhiem = 0.0
@@ -250,8 +521,8 @@ class QuanLyCsv(FileHandler):
             'Doanh số': doanh_so,
             'Hoa hồng': hoa_hong,
             'Lương trách nhiệm': luong_trach_nhiem,
-            'Thu Nhập': nv.thu_nhap,
-            'Thuế TN': nv.thue_thu_nhap
+            'Thu Nhập': thu_nhap,
+            'Thuế TN': thue_tn
         }
 
 class QuanLyJson(FileHandler):
@@ -260,8 +531,10 @@ class QuanLyJson(FileHandler):
     def __init__(self):
         super().__init__()
 
-    def _nv_to_dict(self, nv):
+    def _nv_to_dict(self, nv, thu_nhap=None, thue_tn=None):
         """Chuẩn hóa object nhân viên về dict để ghi JSON."""
+        if thu_nhap is None:
+            thu_nhap, thue_tn = nv.thu_nhap, nv.thue_thu_nhap
         data = {
             "ma_nv": nv.ma_nv,
             "ho_ten": nv.ho_ten,
@@ -270,8 +543,8 @@ class QuanLyJson(FileHandler):
             "doanh_so": 0.0,
             "hoa_hong": 0.0,
             "luong_trach_nhiem": 0.0,
-            "thu_nhap": nv.thu_nhap,
-            "thue_tn": nv.thue_thu_nhap,
+            "thu_nhap": thu_nhap,
+            "thue_tn": thue_tn,
         }
         # Bổ sung theo loại
         if isinstance(nv, TiepThi):
@@ -283,90 +556,212 @@ class QuanLyJson(FileHandler):
 
     def _dict_to_nv(self, d: dict):
         """Từ 1 dict trong JSON dựng lại đúng class nhân viên."""
-        chuc_vu = d.get("chuc_vu", "").strip()
-        NhanVienClass = CLASS_MAP.get(chuc_vu)
+        dong = self._dict_to_dong(d)
+        return tao_hang_loat([dong])[0] if dong else None
+
+    def _dict_to_dong(self, d: dict) -> tuple | None:
+        """Lấy (lop, ma_nv, ho_ten, luong, doanh_so, hoa_hong, luong_trach_nhiem) từ 1 dict trong JSON."""
+        NhanVienClass = CLASS_MAP.get(d.get("chuc_vu", "").strip())
         if not NhanVienClass:
             return None
+        return (NhanVienClass, d.get("ma_nv", ""), d.get("ho_ten", ""), d.get("luong", 0.0),
+                d.get("doanh_so", 0.0), d.get("hoa_hong", 0.0), d.get("luong_trach_nhiem", 0.0))
 
-        nv = NhanVienClass()
-        nv.ma_nv = d.get("ma_nv", "")
-        nv.ho_ten = d.get("ho_ten", "")
-        nv.luong = d.get("luong", 0.0)
-
-        # Tùy loại mà gán thêm trường
-        if isinstance(nv, TiepThi):
-            nv.doanh_so = d.get("doanh_so", 0.0)
-            nv.hoa_hong = d.get("hoa_hong", 0.0)
-        elif isinstance(nv, TruongPhong):
-            nv.luong_trach_nhiem = d.get("luong_trach_nhiem", 0.0)
-
-        return nv
+    KICH_THUOC_KHOI = 64 * 1024  # Số ký tự đọc mỗi lần khi giải mã dần mảng JSON
 
     def read(self, file_path: str) -> list:
         if not os.path.exists(file_path):
-            print(f"File '{file_path}' chưa tồn tại → trả về list rỗng.")
+            log.warning("File '%s' chưa tồn tại → trả về list rỗng.", file_path)
             return []
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
+            ds = list(self.iter_read(file_path))
         except json.JSONDecodeError:
-            print("File JSON rỗng hoặc sai định dạng → trả về list rỗng.")
+            log.warning("File JSON rỗng hoặc sai định dạng → trả về list rỗng.")
             return []
         except Exception as e:
-            print(f"Lỗi đọc file JSON: {e}")
+            log.error("Lỗi đọc file JSON: %s", e)
             return []
 
-        # Nếu là object bọc list, lấy list đầu tiên bắt gặp
-        if isinstance(raw, dict):
+        log.info("Đã đọc %d nhân viên từ '%s'.", len(ds), file_path)
+        return ds
+
+    def iter_read(self, file_path: str):
+        """
+        Đọc dần mảng JSON và trả về lần lượt từng nhân viên.
+        Ném json.JSONDecodeError nếu file rỗng hoặc sai định dạng.
+        """
+        if not os.path.exists(file_path):
+            return
+        with open(file_path, "r", encoding="utf-8") as f:
+            cac_dong = (self._dict_to_dong(item) for item in self._iter_json_array(f) if isinstance(item, dict))
+            yield from tao_theo_lo(dong for dong in cac_dong if dong)
+
+    def _iter_json_array(self, f):
+        """
+        Bộ giải mã JSON dạng luồng: đọc file theo từng khối và dùng raw_decode
+        để lấy ra lần lượt từng phần tử của mảng gốc, không cần tải cả file.
+        """
+        decoder = json.JSONDecoder()
+        buf = f.read(self.KICH_THUOC_KHOI)
+
+        def bo_khoang_trang(buf, idx):
+            while idx < len(buf) and buf[idx] in " \t\r\n":
+                idx += 1
+            return idx
+
+        idx = bo_khoang_trang(buf, 0)
+        if buf[idx:idx + 1] == "{":
+            # Nếu là object bọc list thì phải đọc cả file, lấy list đầu tiên bắt gặp
+            raw = json.loads(buf[idx:] + f.read())
             for v in raw.values():
                 if isinstance(v, list):
-                    raw = v
-                    break
-
-        ds = []
-        if isinstance(raw, list):
-            for item in raw:
-                if isinstance(item, dict):
-                    nv = self._dict_to_nv(item)
-                    if nv:
-                        ds.append(nv)
-
-        print(f"Đã đọc {len(ds)} nhân viên từ '{file_path}'.")
-        return ds
+                    yield from v
+                    return
+            return
+        if buf[idx:idx + 1] != "[":
+            # File rỗng hoặc không phải mảng: để json báo lỗi như json.load
+            json.loads(buf[idx:] + f.read())
+            return
+        idx += 1
+
+        while True:
+            idx = bo_khoang_trang(buf, idx)
+            # Cần ít nhất một ký tự để biết là phần tử tiếp theo, dấu phẩy hay ']'
+            if idx >= len(buf):
+                khoi = f.read(self.KICH_THUOC_KHOI)
+                if not khoi:
+                    raise json.JSONDecodeError("Mảng JSON chưa được đóng", buf, idx)
+                buf, idx = buf[idx:] + khoi, 0
+                continue
+            if buf[idx] == "]":
+                return
+            if buf[idx] == ",":
+                idx += 1
+                continue
+            try:
+                item, het = decoder.raw_decode(buf, idx)
+                # Số nằm sát cuối khối có thể vẫn còn chữ số ở khối sau
+                cat_ngang = het >= len(buf)
+            except json.JSONDecodeError:
+                cat_ngang = True
+            if cat_ngang:
+                # Phần tử có thể bị cắt ngang ở cuối khối: đọc thêm rồi thử lại
+                khoi = f.read(self.KICH_THUOC_KHOI)
+                if khoi:
+                    buf, idx = buf[idx:] + khoi, 0
+                    continue
+                item, het = decoder.raw_decode(buf, idx)
+            yield item
+            idx = het
     
+    def _ghi_them(self, file_path: str, cac_nv: list) -> bool:
+        """
+        Ghi thêm các nhân viên bằng cách chèn trực tiếp trước dấu ']' cuối file,
+        chỉ ghi phần bản ghi mới nên chi phí không tăng theo kích thước file.
+        Kết quả giống hệt khi json.dump cả danh sách với indent=2.
+        Trả về False nếu file không có dạng mảng JSON để chèn (gọi hàm ghi đầy đủ).
+        """
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return False
+        # Phần tử trong mảng gốc được json.dump thụt thêm 2 dấu cách
+        ban_ghi = ",\n".join(textwrap.indent(json.dumps(self._nv_to_dict(nv), ensure_ascii=False, indent=2), "  ")
+                             for nv in cac_nv)
+        with open(file_path, "r+b") as f:
+            vi_tri, truoc = self._tim_tu_cuoi_file(f, b"]")
+            if vi_tri < 0:
+                return False
+            f.seek(vi_tri)
+            if f.read().strip() != b"]":
+                return False
+            # Ký tự có nghĩa ngay trước ']' cho biết mảng đang rỗng hay không;
+            # bản ghi mới được ghi đè từ ngay sau ký tự đó (bỏ khoảng trắng cũ)
+            khoang_trang = len(truoc) - len(truoc.rstrip())
+            truoc = truoc.rstrip()
+            if truoc.endswith(b"["):
+                noi_dung = "\n" + ban_ghi + "\n]"
+            elif truoc.endswith(b"}"):
+                noi_dung = ",\n" + ban_ghi + "\n]"
+            else:
+                return False
+            f.seek(vi_tri - khoang_trang)
+            f.write(noi_dung.encode("utf-8"))
+            f.truncate()
+        return True
+
+    def ghi_luong(self, file_path: str, nguon, kich_thuoc_lo: int | None = None, bao_tien_do=None) -> int:
+        """
+        Ghi lại toàn bộ mảng JSON (atomic) từ nguồn nhân viên, mỗi lần một lô.
+        Kết quả giống hệt json.dump cả danh sách với indent=2.
+        """
+        so_ban_ghi = 0
+        with ghi_nguyen_tu(file_path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for lo in self._chia_lo(nguon, kich_thuoc_lo or self.KICH_THUOC_LO_GHI):
+                bang_luong = tinh_bang_luong(lo)
+                # Mỗi phần tử của mảng gốc thụt thêm 2 dấu cách (chuỗi JSON không chứa xuống dòng thật)
+                cac_phan_tu = ["  " + json.dumps(self._nv_to_dict(nv, tn, thue), ensure_ascii=False,
+                                                 indent=2).replace("\n", "\n  ")
+                               for nv, tn, thue in zip(lo, bang_luong.thu_nhap, bang_luong.thue_thu_nhap)]
+                f.write(("," if so_ban_ghi else "") + "\n" + ",\n".join(cac_phan_tu))
+                so_ban_ghi += len(lo)
+                if bao_tien_do is not None:
+                    bao_tien_do(so_ban_ghi)
+            f.write("\n]" if so_ban_ghi else "]")
+        return so_ban_ghi
+
     def write(self, file_path: str, data) -> None:
-        # Đọc dữ liệu cũ (để hỗ trợ append khi ghi 1 nhân viên)
+        if isinstance(data, list):
+            so_ban_ghi = self.ghi_luong(file_path, data)
+            log.info("Đã ghi %d nhân viên vào '%s'.", so_ban_ghi, file_path)
+            return
+        if isinstance(data, (HanhChinh, TiepThi, TruongPhong)):
+            self.ghi_them_nhieu(file_path, [data])
+            return
+        raise ValueError("Dữ liệu ghi JSON phải là list nhân viên hoặc 1 đối tượng nhân viên.")
+
+    def ghi_them_nhieu(self, file_path: str, cac_nv: list) -> None:
+        if not cac_nv:
+            return
+        if self._ghi_them(file_path, cac_nv):
+            log.info("Đã ghi thêm %d nhân viên vào '%s'.", len(cac_nv), file_path)
+            return
+        # File chưa có hoặc không phải mảng JSON: đọc dữ liệu cũ rồi ghi lại toàn bộ
         old = []
         if os.path.exists(file_path):
             try:
                 with open(file_path, "r", encoding="utf-8") as f:
                     old = json.load(f)
                     if not isinstance(old, list):
-                            old = []
-            except Exception:
                         old = []
+            except Exception:
+                old = []
+        payload = old + [self._nv_to_dict(nv) for nv in cac_nv]
 
-        if isinstance(data, list):
-            payload = [self._nv_to_dict(nv) for nv in data]
-        elif isinstance(data, (HanhChinh, TiepThi, TruongPhong)):
-            payload = old + [self._nv_to_dict(data)]
-        else:
-            raise ValueError("Dữ liệu ghi JSON phải là list nhân viên hoặc 1 đối tượng nhân viên.")
-
-        with open(file_path, "w", encoding="utf-8") as f:
+        with ghi_nguyen_tu(file_path, "w", encoding="utf-8") as f:
             json.dump(payload, f, ensure_ascii=False, indent=2)
 
-        print(f" Đã ghi {len(payload)} nhân viên vào '{file_path}'.")
+        log.info("Đã ghi %d nhân viên vào '%s'.", len(payload), file_path)
 
 class QuanLyXml(FileHandler):
-    """Xử lý việc đọc/ghi file định dạng .xml."""
+    """
+    Xử lý việc đọc/ghi file định dạng .xml.\n
+    File được ghi trực tiếp bằng ElementTree (không qua minidom), thụt lề mỗi mức
+    bằng THUT_LE; đặt THUT_LE = "" để ghi dạng liền không khoảng trắng.
+    """
+    KHAI_BAO = b'<?xml version="1.0" encoding="utf-8"?>\n'
 
-    def _append_nv_to_root(self, root_elem, nv):
+    def __init__(self, thut_le: str = "  "):
+        super().__init__()
+        self.THUT_LE = thut_le
+
+    def _append_nv_to_root(self, root_elem, nv, thu_nhap=None, thue_tn=None):
         """
         Hàm trợ giúp: Tạo một nhánh <NhanVien> và thêm nó vào root.
         Hàm này cũng thêm tất cả các thuộc tính của nhân viên làm thẻ con.
         """
+        if thu_nhap is None:
+            thu_nhap, thue_tn = nv.thu_nhap, nv.thue_thu_nhap
         nv_elem = ETree.SubElement(root_elem, "NhanVien")
         
         # Hàm nội tuyến (inner function) để tạo thẻ con và gán text
@@ -395,99 +790,1011 @@ class QuanLyXml(FileHandler):
         create_sub("DoanhSo", doanh_so)
         create_sub("HoaHong", hoa_hong)
         create_sub("LuongTrachNhiem", luong_trach_nhiem)
-        create_sub("ThuNhap", nv.thu_nhap)
-        create_sub("ThueTN", nv.thue_thu_nhap)
+        create_sub("ThuNhap", thu_nhap)
+        create_sub("ThueTN", thue_tn)
+        return nv_elem
 
     def read(self, file_path: str) -> list:
-        danh_sach = []
         if not os.path.exists(file_path):
-            print(f"File '{file_path}' không tồn tại.")
-            return danh_sach
+            log.warning("File '%s' không tồn tại.", file_path)
+            return []
 
         try:
-            tree = ETree.parse(file_path)
-            root = tree.getroot()
-        except ETree.ParseError:
-            print(f"Lỗi: File XML '{file_path}' rỗng, hỏng hoặc sai định dạng.")
+            danh_sach = list(self.iter_read(file_path))
+            if self._can_nen(file_path):
+                self.nen_file(file_path)
+                log.info("Đã định dạng lại file XML '%s' để bỏ khoảng trắng thừa.", file_path)
             return danh_sach
+        except ETree.ParseError:
+            log.error("Lỗi: File XML '%s' rỗng, hỏng hoặc sai định dạng.", file_path)
+            return []
         except Exception as e:
-            print(f"Lỗi không xác định khi đọc XML: {e}")
-            return danh_sach
+            log.error("Lỗi không xác định khi đọc XML: %s", e)
+            return []
 
-        # Duyệt qua tất cả các thẻ <NhanVien> con của <DanhSachNhanVien>
-        for nv_elem in root.findall('NhanVien'):
-            try:
-                # Lấy chức vụ để xác định loại Class
-                chuc_vu_text = nv_elem.find('ChucVu').text
-                NhanVienClass = CLASS_MAP.get(chuc_vu_text)
-                
-                if not NhanVienClass:
-                    print(f"Bỏ qua nhân viên có chức vụ không rõ: {chuc_vu_text}")
-                    continue
-                
-                nv = NhanVienClass()
-                nv.ma_nv = nv_elem.find('MaNV').text
-                nv.ho_ten = nv_elem.find('HoTen').text
-                nv.luong = float(nv_elem.find('Luong').text)
-                
-                # Gán các trường riêng biệt
-                if isinstance(nv, TiepThi):
-                    nv.doanh_so = float(nv_elem.find('DoanhSo').text)
-                    nv.hoa_hong = float(nv_elem.find('HoaHong').text)
-                elif isinstance(nv, TruongPhong):
-                    nv.luong_trach_nhiem = float(nv_elem.find('LuongTrachNhiem').text)
-                
-                danh_sach.append(nv)
-                
-            except (AttributeError, ValueError, TypeError) as e:
-                # AttributeError: nếu .find() trả về None (thiếu thẻ) rồi .text
-                # ValueError/TypeError: nếu float() thất bại
-                print(f"Bỏ qua một nhân viên trong XML do thiếu dữ liệu hoặc sai định dạng: {e}")
+    def _iter_dong(self, file_path: str):
+        """Duyệt file XML bằng iterparse, trả về dữ liệu từng thẻ <NhanVien> dưới dạng dòng."""
+        if not os.path.exists(file_path):
+            return
+        root = None
+        do_sau = 0  # độ sâu hiện tại trong cây, root có độ sâu 1
+        for event, elem in ETree.iterparse(file_path, events=("start", "end")):
+            if event == "start":
+                do_sau += 1
+                if root is None:
+                    root = elem  # thẻ mở đầu tiên là <DanhSachNhanVien>
                 continue
-                
-        return danh_sach
+            do_sau -= 1
+            # Chỉ xử lý các thẻ <NhanVien> con trực tiếp của root khi đã đóng
+            if do_sau != 1 or elem.tag != "NhanVien":
+                continue
+            dong = self._elem_to_dong(elem)
+            root.clear()
+            if dong:
+                yield dong
+
+    def iter_read(self, file_path: str):
+        """
+        Đọc dần file XML bằng iterparse và trả về lần lượt từng nhân viên.
+        Mỗi thẻ <NhanVien> được xóa khỏi cây ngay sau khi xử lý nên bộ nhớ
+        không tăng theo kích thước file. Ném ETree.ParseError nếu file hỏng.
+        """
+        yield from tao_theo_lo(self._iter_dong(file_path))
+
+    def _elem_to_nv(self, nv_elem):
+        """Dựng lại đối tượng nhân viên từ một thẻ <NhanVien>, trả về None nếu lỗi."""
+        dong = self._elem_to_dong(nv_elem)
+        return tao_hang_loat([dong])[0] if dong else None
+
+    def _elem_to_dong(self, nv_elem) -> tuple | None:
+        """
+        Lấy (lop, ma_nv, ho_ten, luong, doanh_so, hoa_hong, luong_trach_nhiem) từ một thẻ
+        <NhanVien>, trả về None nếu thiếu thẻ hoặc số sai định dạng.
+        """
+        try:
+            # Lấy chức vụ để xác định loại Class
+            chuc_vu_text = nv_elem.find('ChucVu').text
+            NhanVienClass = CLASS_MAP.get(chuc_vu_text)
+            
+            if not NhanVienClass:
+                log.warning("Bỏ qua nhân viên có chức vụ không rõ: %s", chuc_vu_text)
+                return None
+            
+            doanh_so = hoa_hong = luong_trach_nhiem = 0.0
+            # Lấy các trường riêng biệt
+            if issubclass(NhanVienClass, TiepThi):
+                doanh_so = float(nv_elem.find('DoanhSo').text)
+                hoa_hong = float(nv_elem.find('HoaHong').text)
+            elif issubclass(NhanVienClass, TruongPhong):
+                luong_trach_nhiem = float(nv_elem.find('LuongTrachNhiem').text)
+
+            ho_ten = nv_elem.find('HoTen').text
+            if ho_ten is None:
+                raise ValueError("thiếu họ tên")
+            return (NhanVienClass, nv_elem.find('MaNV').text, ho_ten,
+                    float(nv_elem.find('Luong').text), doanh_so, hoa_hong, luong_trach_nhiem)
+            
+        except (AttributeError, ValueError, TypeError) as e:
+            # AttributeError: nếu .find() trả về None (thiếu thẻ) rồi .text
+            # ValueError/TypeError: nếu float() thất bại
+            log.warning("Bỏ qua một nhân viên trong XML do thiếu dữ liệu hoặc sai định dạng: %s", e)
+            return None
+
+    def _dinh_dang_phan_tu(self, nv_elem) -> bytes:
+        """
+        Chuyển một thẻ <NhanVien> thành bytes đúng định dạng của file:
+        thụt lề THUT_LE (thẻ ở mức 1, thẻ con ở mức 2) hoặc viết liền nếu THUT_LE rỗng.
+        """
+        if self.THUT_LE:
+            ETree.indent(nv_elem, space=self.THUT_LE, level=1)
+            nv_elem.tail = "\n"
+            return (self.THUT_LE + ETree.tostring(nv_elem, encoding="unicode")).encode("utf-8")
+        nv_elem.tail = None
+        return ETree.tostring(nv_elem, encoding="utf-8", xml_declaration=False)
+
+    def _ghi_them(self, file_path: str, cac_nv: list) -> bool:
+        """
+        Ghi thêm các nhân viên bằng cách chèn các thẻ <NhanVien> mới ngay trước
+        thẻ đóng </DanhSachNhanVien>, không phải phân tích và ghi lại cả cây.
+        Trả về False nếu không tìm thấy thẻ đóng để chèn (gọi hàm ghi đầy đủ).
+        """
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return False
+        ban_ghi = b"".join(self._dinh_dang_phan_tu(self._append_nv_to_root(ETree.Element("DanhSachNhanVien"), nv))
+                           for nv in cac_nv)
+        with open(file_path, "r+b") as f:
+            vi_tri, _ = self._tim_tu_cuoi_file(f, b"</DanhSachNhanVien>")
+            if vi_tri < 0:
+                return False
+            f.seek(vi_tri)
+            phan_cuoi = f.read()
+            if phan_cuoi.strip() != b"</DanhSachNhanVien>":
+                return False
+            f.seek(vi_tri)
+            f.write(ban_ghi + phan_cuoi)
+            f.truncate()
+        return True
+
+    def ghi_luong(self, file_path: str, nguon, kich_thuoc_lo: int | None = None, bao_tien_do=None) -> int:
+        """
+        Ghi toàn bộ danh sách theo kiểu luồng: mỗi nhân viên được tạo thành một thẻ,
+        định dạng và ghi ra file ngay, không dựng cả cây trong bộ nhớ.
+        Nguồn được đọc theo từng lô để tính thu nhập/thuế cho cả lô một lần.
+        """
+        so_ban_ghi = 0
+        cha = ETree.Element("DanhSachNhanVien")  # thẻ cha tạm, xóa sau mỗi nhân viên
+        xuong_dong = b"\n" if self.THUT_LE else b""
+        with ghi_nguyen_tu(file_path, "wb") as f:
+            f.write(self.KHAI_BAO + b"<DanhSachNhanVien>" + xuong_dong)
+            for lo in self._chia_lo(nguon, kich_thuoc_lo or self.KICH_THUOC_LO_GHI):
+                bang_luong = tinh_bang_luong(lo)
+                for nv, tn, thue in zip(lo, bang_luong.thu_nhap, bang_luong.thue_thu_nhap):
+                    f.write(self._dinh_dang_phan_tu(self._append_nv_to_root(cha, nv, tn, thue)))
+                    cha.clear()
+                so_ban_ghi += len(lo)
+                if bao_tien_do is not None:
+                    bao_tien_do(so_ban_ghi)
+            f.write(b"</DanhSachNhanVien>" + xuong_dong)
+        return so_ban_ghi
+
+    def _ghi_cay(self, file_path: str, root) -> None:
+        """Ghi cả cây XML ra file, bỏ khoảng trắng thừa cũ rồi thụt lề lại theo THUT_LE."""
+        for elem in root.iter():
+            if elem.text is not None and not elem.text.strip():
+                elem.text = None
+            if elem.tail is not None and not elem.tail.strip():
+                elem.tail = None
+        if self.THUT_LE:
+            ETree.indent(root, space=self.THUT_LE)
+            if len(root) == 0:
+                root.text = "\n"  # để lần ghi thêm sau vẫn chèn được trước thẻ đóng
+        xuong_dong = b"\n" if self.THUT_LE else b""
+        with ghi_nguyen_tu(file_path, "wb") as f:
+            f.write(self.KHAI_BAO)
+            ETree.ElementTree(root).write(f, encoding="utf-8", xml_declaration=False)
+            f.write(xuong_dong)
+
+    def _can_nen(self, file_path: str) -> bool:
+        """
+        Kiểm tra phần đầu file có dòng chỉ chứa khoảng trắng hay không. Đây là dấu hiệu
+        file bị phình do cách ghi cũ (minidom định dạng lại nhiều lần); file do
+        các hàm ghi hiện tại tạo ra không bao giờ có dòng như vậy.
+        """
+        with open(file_path, "rb") as f:
+            dau_file = f.read(64 * 1024)
+        return re.search(rb"\n[ \t]*\r?\n", dau_file) is not None
+
+    def nen_file(self, file_path: str) -> None:
+        """Định dạng lại file XML đang bị phình về dạng chuẩn, giữ nguyên toàn bộ nội dung."""
+        self._ghi_cay(file_path, ETree.parse(file_path).getroot())
 
     def write(self, file_path: str, data) -> None:
+        try:
+            if isinstance(data, list):
+                # 1. Ghi đè (Overwrite): data là một list
+                self.ghi_luong(file_path, data)
+
+            elif isinstance(data, (HanhChinh, TiepThi, TruongPhong)):
+                # 2. Ghi thêm (Append): data là một nhân viên
+                self.ghi_them_nhieu(file_path, [data])
+
+            else:
+                raise ValueError("Dữ liệu không hợp lệ. Phải là đối tượng nhân viên hoặc danh sách nhân viên.")
+
+        except OSError as e:
+            log.error("Lỗi khi ghi file XML '%s': %s", file_path, e)
+
+    def ghi_them_nhieu(self, file_path: str, cac_nv: list) -> None:
+        # Chèn trực tiếp vào cuối file nếu được
+        if not cac_nv or self._ghi_them(file_path, cac_nv):
+            return
+        # Kiểm tra file tồn tại và đọc cấu trúc cũ
         root = None
-        
-        if isinstance(data, list):
-            # 1. Ghi đè (Overwrite): data là một list
+        if os.path.exists(file_path):
+            try:
+                root = ETree.parse(file_path).getroot()
+            except ETree.ParseError:
+                # File tồn tại nhưng rỗng hoặc hỏng, tạo root mới
+                root = None
+        if root is None:
             root = ETree.Element("DanhSachNhanVien")
-            for nv in data:
-                self._append_nv_to_root(root, nv)
-                
-        elif isinstance(data, (HanhChinh, TiepThi, TruongPhong)):
-            # 2. Ghi thêm (Append): data là một nhân viên
-            # Kiểm tra file tồn tại và đọc cấu trúc cũ
-            if os.path.exists(file_path):
-                try:
-                    tree = ETree.parse(file_path)
-                    root = tree.getroot()
-                except ETree.ParseError:
-                    # File tồn tại nhưng rỗng hoặc hỏng, tạo root mới
-                    root = ETree.Element("DanhSachNhanVien")
+
+        # Thêm nhân viên mới vào root rồi ghi lại cả cây
+        for nv in cac_nv:
+            self._append_nv_to_root(root, nv)
+        self._ghi_cay(file_path, root)
+
+
+class BangNhiPhan:
+    """
+    Bảng nhân viên trong file nhị phân .bin, đọc qua mmap (dùng với `with`).\n
+    Mở bảng chỉ đọc phần đầu file nên tốn O(1). Các cột số (luong, thu_nhap...) là
+    memoryview trỏ thẳng vào vùng nhớ của file, nên Y6/Y8/Y9 quét được trên cột
+    mà chỉ tạo đối tượng nhân viên cho các dòng cần trả về.
+    Các truy vấn trả về list đã tạo xong, dùng được cả sau khi bảng đã đóng.
+    """
+    def __init__(self, file_path: str):
+        self._views = []
+        self._f = open(file_path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._f.close()
+            raise ValueError(f"File '{file_path}' rỗng.")
+        dau = QuanLyBin._doc_dau(self._mm[:QuanLyBin.KICH_THUOC_DAU])
+        if dau is None:
+            self.dong()
+            raise ValueError(f"File '{file_path}' không phải file nhị phân nhân viên.")
+        self.so_dong, self._suc_chua, self.so_bia_mo, _ = dau
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.dong()
+
+    def dong(self) -> None:
+        """Giải phóng các cột đã mở và đóng mmap."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mm.close()
+        self._f.close()
+
+    def __len__(self) -> int:
+        """Số nhân viên còn trong bảng (không tính dòng đã xóa)."""
+        return self.so_dong - self.so_bia_mo
+
+    def cot(self, ten: str) -> memoryview:
+        """Trả về cột `ten` (so_dong phần tử, kể cả dòng đã xóa có chuc_vu = -1)."""
+        kieu, kich_thuoc = QuanLyBin.COT[ten]
+        bat_dau = QuanLyBin._vi_tri_cot(ten, self._suc_chua)
+        view = memoryview(self._mm)[bat_dau:bat_dau + kich_thuoc * self.so_dong]
+        self._views.append(view)
+        if kieu.endswith('s'):
+            return view
+        view = view.cast(kieu)
+        self._views.append(view)
+        return view
+
+    def _dong_con(self):
+        """Chỉ số các dòng chưa bị xóa."""
+        chuc_vu = self.cot("chuc_vu")
+        if not self.so_bia_mo:
+            return range(self.so_dong)
+        return [i for i, cv in enumerate(chuc_vu) if cv >= 0]
+
+    def nhan_vien(self, i: int):
+        """Tạo đối tượng nhân viên cho dòng thứ i."""
+        QB = QuanLyBin
+        mm, suc_chua = self._mm, self._suc_chua
+
+        def doc(ten):
+            kieu, kich_thuoc = QB.COT[ten]
+            return struct.unpack_from('=' + kieu, mm, QB._vi_tri_cot(ten, suc_chua) + i * kich_thuoc)[0]
+
+        # Số trong file đã là float nên tạo thẳng bằng from_row
+        vi_tri_ten = doc("ho_ten_vt")
+        return QB.LOP_THEO_MA[doc("chuc_vu")].from_row(
+            doc("ma_nv").rstrip(b'\0').decode('utf-8'),
+            mm[vi_tri_ten:vi_tri_ten + doc("ho_ten_dd")].decode('utf-8'),
+            doc("luong"), doc("doanh_so"), doc("hoa_hong"), doc("luong_trach_nhiem"))
+
+    def __iter__(self):
+        for i in self._dong_con():
+            yield self.nhan_vien(i)
+
+    def ho_ten(self, i: int) -> str:
+        """Họ tên của dòng thứ i (không tạo đối tượng nhân viên)."""
+        QB = QuanLyBin
+        vi_tri_ten = struct.unpack_from('=Q', self._mm, QB._vi_tri_cot("ho_ten_vt", self._suc_chua) + i * 8)[0]
+        do_dai = struct.unpack_from('=I', self._mm, QB._vi_tri_cot("ho_ten_dd", self._suc_chua) + i * 4)[0]
+        return self._mm[vi_tri_ten:vi_tri_ten + do_dai].decode('utf-8')
+
+    def ma_nv(self, i: int) -> str:
+        """Mã nhân viên của dòng thứ i."""
+        vi_tri = QuanLyBin._vi_tri_cot("ma_nv", self._suc_chua) + i * 16
+        return self._mm[vi_tri:vi_tri + 16].rstrip(b'\0').decode('utf-8')
+
+    def _dong_cua_chuc_vu(self, chuc_vu: str | None):
+        """Chỉ số các dòng chưa bị xóa, chỉ lấy chức vụ chuc_vu nếu có."""
+        if chuc_vu is None:
+            return self._dong_con()
+        lop = CLASS_MAP.get(chuc_vu)
+        if lop is None:
+            return []
+        ma = MA_CHUC_VU[lop]
+        cot_chuc_vu = self.cot("chuc_vu")
+        return [i for i in range(self.so_dong) if cot_chuc_vu[i] == ma]
+
+    def loc_theo_khoang(self, min_gia_tri: float, max_gia_tri: float, cot: str = "luong") -> list:
+        """Y6: Các nhân viên có giá trị cột trong đoạn [min, max], tăng dần theo giá trị (bằng nhau thì theo dòng)."""
+        gia_tri = self.cot(cot)
+        if np is not None:
+            mang = np.frombuffer(gia_tri, dtype=np.float64)
+            dieu_kien = (mang >= min_gia_tri) & (mang <= max_gia_tri)
+            if self.so_bia_mo:
+                dieu_kien &= np.frombuffer(self.cot("chuc_vu"), dtype=np.int8) >= 0
+            chon = np.flatnonzero(dieu_kien)
+            chon = chon[np.argsort(mang[chon], kind="stable")].tolist()
+        else:
+            chon = sorted((i for i in self._dong_con() if min_gia_tri <= gia_tri[i] <= max_gia_tri),
+                          key=gia_tri.__getitem__)
+        return [self.nhan_vien(i) for i in chon]
+
+    def top_k(self, k: int = 5, giam_dan: bool = True, cot: str = "thu_nhap", chuc_vu: str | None = None) -> list:
+        """Y9: k nhân viên có giá trị cột cao nhất (hoặc thấp nhất), chỉ tạo k đối tượng."""
+        if k <= 0:
+            return []
+        gia_tri = self.cot(cot)
+        chon = heapq.nlargest if giam_dan else heapq.nsmallest
+        return [self.nhan_vien(i) for i in chon(k, self._dong_cua_chuc_vu(chuc_vu), key=gia_tri.__getitem__)]
+
+    def sap_xep_theo(self, cot: str = "thu_nhap", giam_dan: bool = False) -> list:
+        """
+        Y7/Y8: Các nhân viên theo thứ tự của cột, sắp xếp trên chỉ số dòng (bằng nhau thì theo dòng).
+        cot="ho_ten" sắp theo bảng chữ cái tiếng Việt (tiengviet.khoa_sap_xep).
+        """
+        khoa = ((lambda i: khoa_sap_xep(self.ho_ten(i))) if cot == "ho_ten" else self.cot(cot).__getitem__)
+        thu_tu = sorted(self._dong_con(), key=khoa, reverse=giam_dan)
+        return [self.nhan_vien(i) for i in thu_tu]
+
+    def thong_ke(self) -> dict[str, dict]:
+        """Số liệu theo chức vụ (cùng dạng với ThongKeChucVu.ket_qua), quét trên cột lương và thu nhập."""
+        chuc_vu, luong, thu_nhap = self.cot("chuc_vu"), self.cot("luong"), self.cot("thu_nhap")
+        theo_ma: dict[int, list[int]] = {}
+        for i in self._dong_con():
+            theo_ma.setdefault(chuc_vu[i], []).append(i)
+        ket_qua = {QuanLyBin.LOP_THEO_MA[ma].chuc_vu: tong_hop_nhom([luong[i] for i in dong], [thu_nhap[i] for i in dong])
+                   for ma, dong in sorted(theo_ma.items())}
+        ket_qua["Tổng"] = gop_ket_qua(ket_qua.values())
+        return ket_qua
+
+
+class QuanLyBin(FileHandler):
+    """
+    Xử lý việc đọc/ghi file nhị phân dạng cột .bin.\n
+    Cấu trúc file: phần đầu KICH_THUOC_DAU byte, sau đó mỗi cột trong COT là một mảng
+    `suc_chua` phần tử kích thước cố định nằm liền nhau, cuối cùng là bảng chuỗi chứa
+    họ tên (cột ho_ten_vt/ho_ten_dd trỏ vào đây). Số được lưu theo byte order của máy.\n
+    Mỗi nhân viên chiếm một ô cố định trong từng cột nên:\n
+    - Ghi thêm: ghi vào ô trống tiếp theo, hết chỗ thì ghi lại file với sức chứa gấp rưỡi.\n
+    - Sửa: ghi đè ô theo vị trí; họ tên đổi thì thêm chuỗi mới vào cuối bảng chuỗi.\n
+    - Xóa: đặt chuc_vu = -1 (bia mộ).
+    """
+    MA_FILE = b"NSCOT\0\0\1"
+    PHIEN_BAN = 1
+    # Phần đầu: mã file, phiên bản, số dòng, sức chứa, số bia mộ, số byte chuỗi bỏ đi
+    DAU = struct.Struct('=8sIQQQQ')
+    KICH_THUOC_DAU = 64
+    # Tên cột -> (kiểu struct, kích thước). Cột 8 byte đứng trước để mọi cột đều căn lề.
+    COT = {
+        "luong": ('d', 8),
+        "doanh_so": ('d', 8),
+        "hoa_hong": ('d', 8),
+        "luong_trach_nhiem": ('d', 8),
+        "thu_nhap": ('d', 8),
+        "thue_thu_nhap": ('d', 8),
+        "ho_ten_vt": ('Q', 8),
+        "ma_nv": ('16s', 16),
+        "ho_ten_dd": ('I', 4),
+        "chuc_vu": ('b', 1),
+    }
+    KICH_THUOC_DONG = sum(kich_thuoc for _, kich_thuoc in COT.values())
+    LOP_THEO_MA = {ma: lop for lop, ma in MA_CHUC_VU.items()}
+    SUC_CHUA_TOI_THIEU = 64
+    BIA_MO_TOI_THIEU = 16
+    TI_LE_NEN = 0.25
+    ho_tro_va_ban_ghi = True
+    ho_tro_truy_van = True  # Truy vấn quét thẳng trên các cột của file, không tải cả danh sách
+    COT_TRUY_VAN = {"luong", "thu_nhap"}  # Cột số; sap_xep nhận thêm "ho_ten"
+
+    def __init__(self):
+        # file_path -> [dấu vết (mtime_ns, size), {ma_nv: số thứ tự dòng}]
+        self._chi_muc_dong: dict[str, list] = {}
+
+    # --- Cấu trúc file ---
+    @classmethod
+    def _vi_tri_cot(cls, ten: str, suc_chua: int) -> int:
+        vi_tri = cls.KICH_THUOC_DAU
+        for ten_cot, (_, kich_thuoc) in cls.COT.items():
+            if ten_cot == ten:
+                return vi_tri
+            vi_tri += kich_thuoc * suc_chua
+        raise KeyError(ten)
+
+    @classmethod
+    def _vi_tri_bang_chuoi(cls, suc_chua: int) -> int:
+        return cls.KICH_THUOC_DAU + cls.KICH_THUOC_DONG * suc_chua
+
+    @classmethod
+    def _suc_chua_cho(cls, so_dong: int) -> int:
+        """Sức chứa cho so_dong nhân viên, chừa thêm một nửa để ghi thêm, làm tròn lên bội của 8."""
+        return max(cls.SUC_CHUA_TOI_THIEU, (so_dong + so_dong // 2 + 7) // 8 * 8)
+
+    @classmethod
+    def _doc_dau(cls, du_lieu: bytes) -> list | None:
+        """Đọc phần đầu file: [số dòng, sức chứa, số bia mộ, số byte chuỗi bỏ đi], None nếu sai định dạng."""
+        if len(du_lieu) < cls.DAU.size:
+            return None
+        ma_file, phien_ban, *dau = cls.DAU.unpack_from(du_lieu)
+        if ma_file != cls.MA_FILE or phien_ban != cls.PHIEN_BAN:
+            return None
+        return dau
+
+    @classmethod
+    def _ghi_dau(cls, f, dau: list) -> None:
+        f.seek(0)
+        f.write(cls.DAU.pack(cls.MA_FILE, cls.PHIEN_BAN, *dau).ljust(cls.KICH_THUOC_DAU, b'\0'))
+
+    @staticmethod
+    def _ma_nv_bytes(ma_nv: str) -> bytes:
+        ma = ma_nv.encode('utf-8')
+        if len(ma) > 16:
+            raise ValueError(f"Mã nhân viên '{ma_nv}' dài quá 16 byte.")
+        return ma
+
+    @classmethod
+    def _gia_tri_dong(cls, nv, vi_tri_ten: int, do_dai_ten: int, thu_nhap=None, thue_tn=None) -> dict:
+        """Giá trị các cột của một nhân viên."""
+        if thu_nhap is None:
+            thu_nhap, thue_tn = nv.thu_nhap, nv.thue_thu_nhap
+        return {
+            "luong": nv.luong,
+            "doanh_so": nv.doanh_so if isinstance(nv, TiepThi) else 0.0,
+            "hoa_hong": nv.hoa_hong if isinstance(nv, TiepThi) else 0.0,
+            "luong_trach_nhiem": nv.luong_trach_nhiem if isinstance(nv, TruongPhong) else 0.0,
+            "thu_nhap": thu_nhap,
+            "thue_thu_nhap": thue_tn,
+            "ho_ten_vt": vi_tri_ten,
+            "ma_nv": cls._ma_nv_bytes(nv.ma_nv),
+            "ho_ten_dd": do_dai_ten,
+            "chuc_vu": cls._ma_chuc_vu(nv),
+        }
+
+    @staticmethod
+    def _ma_chuc_vu(nv) -> int:
+        if isinstance(nv, TiepThi):
+            return MA_CHUC_VU[TiepThi]
+        if isinstance(nv, TruongPhong):
+            return MA_CHUC_VU[TruongPhong]
+        return MA_CHUC_VU[HanhChinh]
+
+    @classmethod
+    def _ghi_o(cls, f, suc_chua: int, i: int, gia_tri: dict) -> None:
+        """Ghi đè các cột có trong gia_tri tại dòng thứ i."""
+        for ten, gt in gia_tri.items():
+            kieu, kich_thuoc = cls.COT[ten]
+            f.seek(cls._vi_tri_cot(ten, suc_chua) + i * kich_thuoc)
+            f.write(struct.pack('=' + kieu, gt))
+
+    # --- Đọc ---
+    def mo_bang(self, file_path: str) -> BangNhiPhan:
+        """Mở file .bin dạng bảng cột để quét mà không tạo đối tượng nhân viên."""
+        return BangNhiPhan(file_path)
+
+    def _mo_de_truy_van(self, file_path: str) -> BangNhiPhan | None:
+        """Mở bảng để truy vấn, None nếu file chưa có, rỗng hoặc sai định dạng."""
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return None
+        try:
+            return BangNhiPhan(file_path)
+        except ValueError as e:
+            log.error("Lỗi khi đọc file nhị phân '%s': %s", file_path, e)
+            return None
+
+    def _truy_van(self, file_path: str, truy_van, mac_dinh):
+        """Chạy truy_van(bang) trên bảng của file rồi đóng bảng; trả về mac_dinh nếu không mở được."""
+        bang = self._mo_de_truy_van(file_path)
+        if bang is None:
+            return mac_dinh
+        with bang:
+            return truy_van(bang)
+
+    def _kiem_tra_cot(self, cot: str) -> str:
+        if cot not in self.COT_TRUY_VAN:
+            raise ValueError(f"Không hỗ trợ truy vấn theo cột '{cot}'.")
+        return cot
+
+    # --- Truy vấn trên cột (cùng giao diện với QuanLySqlite) ---
+    def dem(self, file_path: str) -> int:
+        return self._truy_van(file_path, len, 0)
+
+    def cac_ma(self, file_path: str) -> list[str]:
+        """Mã của mọi nhân viên (chỉ đọc cột ma_nv)."""
+        return self._truy_van(file_path, lambda bang: [bang.ma_nv(i) for i in bang._dong_con()], [])
+
+    def cac_ten(self, file_path: str) -> list[tuple[str, str]]:
+        """Các cặp (ma_nv, ho_ten) để dựng chỉ mục tìm theo tên, không tạo đối tượng nhân viên."""
+        return self._truy_van(file_path, lambda bang: [(bang.ma_nv(i), bang.ho_ten(i)) for i in bang._dong_con()], [])
+
+    def tim_theo_ma(self, file_path: str, ma_nv: str):
+        """Y3: Tìm nhân viên theo mã (qua chỉ mục dòng), None nếu không có."""
+        chi_muc = self._lay_chi_muc_dong(file_path)
+        if chi_muc is None or ma_nv not in chi_muc[1]:
+            return None
+        return self._truy_van(file_path, lambda bang: bang.nhan_vien(chi_muc[1][ma_nv]), None)
+
+    def loc_theo_khoang(self, file_path: str, min_gia_tri: float, max_gia_tri: float, cot: str = "luong") -> list:
+        """Y6: Nhân viên có giá trị cột trong đoạn [min, max], theo thứ tự tăng dần."""
+        cot = self._kiem_tra_cot(cot)
+        return self._truy_van(file_path, lambda bang: bang.loc_theo_khoang(min_gia_tri, max_gia_tri, cot), [])
+
+    def sap_xep(self, file_path: str, cot: str = "ho_ten", giam_dan: bool = False) -> list:
+        """Y7/Y8: Toàn bộ nhân viên theo thứ tự của cột (cùng giá trị thì giữ thứ tự đã thêm)."""
+        cot = cot if cot == "ho_ten" else self._kiem_tra_cot(cot)
+        return self._truy_van(file_path, lambda bang: bang.sap_xep_theo(cot, giam_dan), [])
+
+    def top_k(self, file_path: str, k: int = 5, giam_dan: bool = True, chuc_vu: str | None = None,
+              cot: str = "thu_nhap") -> list:
+        """Y9: k nhân viên có giá trị cột cao nhất (hoặc thấp nhất), có thể lọc theo chức vụ."""
+        cot = self._kiem_tra_cot(cot)
+        return self._truy_van(file_path, lambda bang: bang.top_k(k, giam_dan, cot, chuc_vu), [])
+
+    def thong_ke(self, file_path: str) -> dict[str, dict]:
+        """Số liệu theo chức vụ; thuế tính lại theo biểu thuế đang áp dụng."""
+        return self._truy_van(file_path, BangNhiPhan.thong_ke, {"Tổng": gop_ket_qua([])})
+
+    def read(self, file_path: str) -> list:
+        return list(self.iter_read(file_path))
+
+    def iter_read(self, file_path: str):
+        """Đọc lần lượt từng nhân viên từ file nhị phân."""
+        if not os.path.exists(file_path):
+            log.warning("File '%s' không tồn tại.", file_path)
+            return
+        if os.path.getsize(file_path) == 0:
+            return
+        try:
+            bang = BangNhiPhan(file_path)
+        except ValueError as e:
+            log.error("Lỗi khi đọc file nhị phân '%s': %s", file_path, e)
+            return
+        with bang:
+            yield from bang
+
+    # --- Ghi ---
+    def _cot_cua_lo(self, lo: list, bang_luong, vi_tri_ten: int) -> tuple[dict, list[bytes], int]:
+        """
+        Dữ liệu các cột của một lô nhân viên, họ tên bắt đầu tại vi_tri_ten trong file.
+        Trả về (tên cột -> bytes, các họ tên đã mã hóa, vị trí ngay sau họ tên cuối).
+        """
+        ten_bytes = [nv.ho_ten.encode('utf-8') for nv in lo]
+        cac_vi_tri_ten = []
+        for ten in ten_bytes:
+            cac_vi_tri_ten.append(vi_tri_ten)
+            vi_tri_ten += len(ten)
+        cot = {
+            "luong": array('d', [nv.luong for nv in lo]),
+            "doanh_so": array('d', [nv.doanh_so if isinstance(nv, TiepThi) else 0.0 for nv in lo]),
+            "hoa_hong": array('d', [nv.hoa_hong if isinstance(nv, TiepThi) else 0.0 for nv in lo]),
+            "luong_trach_nhiem": array('d', [nv.luong_trach_nhiem if isinstance(nv, TruongPhong) else 0.0
+                                             for nv in lo]),
+            "thu_nhap": array('d', bang_luong.thu_nhap),
+            "thue_thu_nhap": array('d', bang_luong.thue_thu_nhap),
+            "ho_ten_vt": array('Q', cac_vi_tri_ten),
+            "ma_nv": b''.join(self._ma_nv_bytes(nv.ma_nv).ljust(16, b'\0') for nv in lo),
+            "ho_ten_dd": array('I', [len(ten) for ten in ten_bytes]),
+            "chuc_vu": array('b', [self._ma_chuc_vu(nv) for nv in lo]),
+        }
+        return {ten: bytes(gia_tri) for ten, gia_tri in cot.items()}, ten_bytes, vi_tri_ten
+
+    def _ghi_danh_sach(self, file_path: str, data: list) -> None:
+        """Ghi lại toàn bộ file theo từng cột (atomic)."""
+        so_dong = len(data)
+        suc_chua = self._suc_chua_cho(so_dong)
+        cot, ten_bytes, _ = self._cot_cua_lo(data, tinh_bang_luong(data), self._vi_tri_bang_chuoi(suc_chua))
+        with ghi_nguyen_tu(file_path, 'wb') as f:
+            self._ghi_dau(f, [so_dong, suc_chua, 0, 0])
+            for ten, (_, kich_thuoc) in self.COT.items():
+                f.write(cot[ten])
+                f.write(bytes(kich_thuoc * (suc_chua - so_dong)))  # ô trống để ghi thêm
+            f.writelines(ten_bytes)
+        self._chi_muc_dong.pop(file_path, None)
+
+    def ghi_luong(self, file_path: str, nguon, kich_thuoc_lo: int | None = None, bao_tien_do=None) -> int:
+        """
+        Ghi lại toàn bộ file (atomic) từ nguồn nhân viên mà không giữ cả danh sách.\n
+        Sức chứa (và vị trí các cột) chỉ biết khi đã hết nguồn, nên mỗi lô được ghi tạm
+        vào một file riêng cho từng cột (ho_ten_vt lưu vị trí tương đối trong bảng chuỗi),
+        cuối cùng các cột được chép nối lại theo đúng cấu trúc file.
+        """
+        so_dong = 0
+        with contextlib.ExitStack() as stack:
+            tam = {ten: stack.enter_context(tempfile.TemporaryFile()) for ten in [*self.COT, "ho_ten"]}
+            vi_tri_ten = 0
+            for lo in self._chia_lo(nguon, kich_thuoc_lo or self.KICH_THUOC_LO_GHI):
+                cot, ten_bytes, vi_tri_ten = self._cot_cua_lo(lo, tinh_bang_luong(lo), vi_tri_ten)
+                for ten, du_lieu in cot.items():
+                    tam[ten].write(du_lieu)
+                tam["ho_ten"].writelines(ten_bytes)
+                so_dong += len(lo)
+                if bao_tien_do is not None:
+                    bao_tien_do(so_dong)
+
+            suc_chua = self._suc_chua_cho(so_dong)
+            goc_bang_chuoi = self._vi_tri_bang_chuoi(suc_chua)
+            with ghi_nguyen_tu(file_path, 'wb') as f:
+                self._ghi_dau(f, [so_dong, suc_chua, 0, 0])
+                for ten, (_, kich_thuoc) in self.COT.items():
+                    tam[ten].seek(0)
+                    if ten == "ho_ten_vt":
+                        # Đổi vị trí tương đối thành vị trí trong file
+                        while khoi := tam[ten].read(8 * self.KICH_THUOC_LO_GHI):
+                            vi_tri = array('Q', khoi)
+                            f.write(array('Q', [v + goc_bang_chuoi for v in vi_tri]))
+                    else:
+                        shutil.copyfileobj(tam[ten], f)
+                    f.write(bytes(kich_thuoc * (suc_chua - so_dong)))  # ô trống để ghi thêm
+                tam["ho_ten"].seek(0)
+                shutil.copyfileobj(tam["ho_ten"], f)
+        self._chi_muc_dong.pop(file_path, None)
+        return so_dong
+
+    def _ghi_them(self, file_path: str, cac_nv: list) -> bool:
+        """
+        Ghi các nhân viên vào các ô trống tiếp theo (mỗi cột một lần ghi).
+        Trả về False nếu file chưa có hoặc không còn đủ chỗ.
+        """
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return False
+        with open(file_path, 'r+b') as f:
+            dau = self._doc_dau(f.read(self.KICH_THUOC_DAU))
+            if dau is None or dau[0] + len(cac_nv) > dau[1]:
+                return False
+            f.seek(0, os.SEEK_END)
+            cot, ten_bytes, _ = self._cot_cua_lo(cac_nv, tinh_bang_luong(cac_nv), f.tell())
+            f.writelines(ten_bytes)
+            for ten, (_, kich_thuoc) in self.COT.items():
+                f.seek(self._vi_tri_cot(ten, dau[1]) + dau[0] * kich_thuoc)
+                f.write(cot[ten])
+            f.flush()
+            # Tăng số dòng sau cùng: nếu dừng giữa chừng thì dòng chưa ghi xong không được tính
+            dau[0] += len(cac_nv)
+            self._ghi_dau(f, dau)
+        chi_muc = self._chi_muc_dong.get(file_path)
+        if chi_muc is not None:
+            for i, nv in enumerate(cac_nv, dau[0] - len(cac_nv)):
+                chi_muc[1][nv.ma_nv] = i
+            chi_muc[0] = self._dau_vet(file_path)
+        return True
+
+    def ghi_them_nhieu(self, file_path: str, cac_nv: list) -> None:
+        if not cac_nv or self._ghi_them(file_path, cac_nv):
+            return
+        # File chưa có hoặc không đủ sức chứa: ghi lại với sức chứa lớn hơn
+        self._ghi_danh_sach(file_path, self.read(file_path) + cac_nv if os.path.exists(file_path) else cac_nv)
+
+    def write(self, file_path: str, data) -> None:
+        try:
+            if isinstance(data, list):
+                self._ghi_danh_sach(file_path, data)
+            elif isinstance(data, (HanhChinh, TiepThi, TruongPhong)):
+                self.ghi_them_nhieu(file_path, [data])
             else:
-                # File không tồn tại, tạo root mới
-                root = ETree.Element("DanhSachNhanVien")
-            
-            # Thêm nhân viên mới vào root
-            self._append_nv_to_root(root, data)
-            
+                raise ValueError("Dữ liệu không hợp lệ. Phải là đối tượng nhân viên hoặc danh sách nhân viên.")
+        except (OSError, ValueError) as e:
+            log.error("Lỗi khi ghi file nhị phân '%s': %s", file_path, e)
+
+    # --- Vá bản ghi ---
+    def _lay_chi_muc_dong(self, file_path: str) -> list | None:
+        """Chỉ mục ma_nv -> số thứ tự dòng, dựng lại từ cột ma_nv nếu file đã thay đổi."""
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return None
+        dau_vet = self._dau_vet(file_path)
+        chi_muc = self._chi_muc_dong.get(file_path)
+        if chi_muc is not None and chi_muc[0] == dau_vet:
+            return chi_muc
+        try:
+            bang = BangNhiPhan(file_path)
+        except ValueError:
+            return None
+        with bang:
+            ma_nv, chuc_vu = bang.cot("ma_nv"), bang.cot("chuc_vu")
+            vi_tri = {bytes(ma_nv[i * 16:(i + 1) * 16]).rstrip(b'\0').decode('utf-8'): i
+                      for i in range(bang.so_dong) if chuc_vu[i] >= 0}
+        chi_muc = self._chi_muc_dong[file_path] = [dau_vet, vi_tri]
+        return chi_muc
+
+    def _va_dong(self, file_path: str, ma_nv: str, nv=None) -> bool:
+        """Ghi đè dòng của ma_nv bằng dữ liệu của nv, hoặc đánh dấu xóa nếu nv là None."""
+        chi_muc = self._lay_chi_muc_dong(file_path)
+        if chi_muc is None or ma_nv not in chi_muc[1]:
+            return False
+        i = chi_muc[1][ma_nv]
+        with open(file_path, 'r+b') as f:
+            dau = self._doc_dau(f.read(self.KICH_THUOC_DAU))
+            suc_chua = dau[1]
+            f.seek(self._vi_tri_cot("ho_ten_vt", suc_chua) + i * 8)
+            vi_tri_ten = struct.unpack('=Q', f.read(8))[0]
+            f.seek(self._vi_tri_cot("ho_ten_dd", suc_chua) + i * 4)
+            do_dai_ten = struct.unpack('=I', f.read(4))[0]
+            if nv is None:
+                self._ghi_o(f, suc_chua, i, {"chuc_vu": -1})
+                del chi_muc[1][ma_nv]
+                dau[2] += 1
+                dau[3] += do_dai_ten
+            else:
+                ten = nv.ho_ten.encode('utf-8')
+                f.seek(vi_tri_ten)
+                if f.read(do_dai_ten) != ten:
+                    # Họ tên đổi: thêm chuỗi mới vào cuối bảng chuỗi, chuỗi cũ bỏ đi
+                    f.seek(0, os.SEEK_END)
+                    vi_tri_ten = f.tell()
+                    f.write(ten)
+                    dau[3] += do_dai_ten
+                self._ghi_o(f, suc_chua, i, self._gia_tri_dong(nv, vi_tri_ten, len(ten)))
+            self._ghi_dau(f, dau)
+            f.flush()
+            os.fsync(f.fileno())
+        chi_muc[0] = self._dau_vet(file_path)
+        return True
+
+    def cap_nhat_ban_ghi(self, file_path: str, nv) -> bool:
+        return self._va_dong(file_path, nv.ma_nv, nv)
+
+    def xoa_ban_ghi(self, file_path: str, ma_nv: str) -> bool:
+        return self._va_dong(file_path, ma_nv)
+
+    def can_nen(self, file_path: str) -> bool:
+        if not os.path.exists(file_path):
+            return False
+        with open(file_path, 'rb') as f:
+            dau = self._doc_dau(f.read(self.KICH_THUOC_DAU))
+            kich_thuoc = f.seek(0, os.SEEK_END)
+        if dau is None:
+            return False
+        so_dong, suc_chua, so_bia_mo, chuoi_bo_di = dau
+        bang_chuoi = kich_thuoc - self._vi_tri_bang_chuoi(suc_chua)
+        return (so_bia_mo >= max(self.BIA_MO_TOI_THIEU, (so_dong - so_bia_mo) * self.TI_LE_NEN)
+                or chuoi_bo_di > max(4096, bang_chuoi // 2))
+
+
+class QuanLySqlite(FileHandler):
+    """
+    Xử lý việc đọc/ghi CSDL SQLite (.db).\n
+    Nhân viên lưu trong bảng nhan_vien, có chỉ mục trên ma_nv (khóa chính), luong,
+    thu_nhap và khoa_ten (khóa sắp xếp tiếng Việt của họ tên, xem tiengviet.khoa_sap_xep_chuoi,
+    so sánh nhị phân nên chỉ mục dùng được cho ORDER BY). Tìm theo mã, lọc theo khoảng, sắp xếp và top-k chạy bằng câu
+    truy vấn dùng chỉ mục nên không cần tải cả danh sách. Thêm/sửa/xóa là một câu lệnh
+    trên một dòng trong một transaction.
+    """
+    BANG = "nhan_vien"
+    COT_DOC = "ma_nv, ho_ten, chuc_vu, luong, doanh_so, hoa_hong, luong_trach_nhiem"
+    COT_GHI = COT_DOC + ", thu_nhap, thue_tn, khoa_ten"
+    LENH_THEM = f"INSERT INTO {BANG} ({COT_GHI}) VALUES ({', '.join('?' * 10)})"
+    # Các cột được phép lọc/sắp xếp (tên cột không truyền được qua tham số của câu lệnh)
+    COT_TRUY_VAN = {"luong", "thu_nhap", "ho_ten"}
+    LENH_TAO_BANG = f"""
+        CREATE TABLE IF NOT EXISTS {BANG} (
+            ma_nv TEXT PRIMARY KEY,
+            ho_ten TEXT NOT NULL,
+            chuc_vu TEXT NOT NULL,
+            luong REAL NOT NULL,
+            doanh_so REAL NOT NULL DEFAULT 0,
+            hoa_hong REAL NOT NULL DEFAULT 0,
+            luong_trach_nhiem REAL NOT NULL DEFAULT 0,
+            thu_nhap REAL NOT NULL,
+            thue_tn REAL NOT NULL,
+            khoa_ten TEXT NOT NULL DEFAULT ''
+        );
+    """
+    LENH_TAO_CHI_MUC = f"""
+        DROP INDEX IF EXISTS idx_{BANG}_ho_ten;
+        CREATE INDEX IF NOT EXISTS idx_{BANG}_luong ON {BANG}(luong);
+        CREATE INDEX IF NOT EXISTS idx_{BANG}_khoa_ten ON {BANG}(khoa_ten);
+        CREATE INDEX IF NOT EXISTS idx_{BANG}_thu_nhap ON {BANG}(thu_nhap);
+    """
+    ho_tro_va_ban_ghi = True
+    ho_tro_truy_van = True
+
+    def __init__(self):
+        self._ket_noi: dict[str, sqlite3.Connection] = {}
+
+    def _mo(self, file_path: str, tao_moi: bool = False) -> sqlite3.Connection | None:
+        """Lấy kết nối tới CSDL (mở một lần rồi dùng lại). Trả về None nếu file chưa có và không tạo mới."""
+        ket_noi = self._ket_noi.get(file_path)
+        if os.path.exists(file_path):
+            if ket_noi is not None:
+                return ket_noi
         else:
-            raise ValueError("Dữ liệu không hợp lệ. Phải là đối tượng nhân viên hoặc danh sách nhân viên.")
+            if ket_noi is not None:  # file đã bị xóa từ bên ngoài
+                self._ket_noi.pop(file_path).close()
+            if not tao_moi:
+                return None
+        ket_noi = sqlite3.connect(file_path)
+        ket_noi.executescript(self.LENH_TAO_BANG)
+        if "khoa_ten" not in {cot for _, cot, *_ in ket_noi.execute(f"PRAGMA table_info({self.BANG})")}:
+            # CSDL tạo trước khi có cột khóa sắp xếp: thêm cột và tính khóa cho các dòng đã có
+            with ket_noi:
+                ket_noi.execute(f"ALTER TABLE {self.BANG} ADD COLUMN khoa_ten TEXT NOT NULL DEFAULT ''")
+                ket_noi.executemany(f"UPDATE {self.BANG} SET khoa_ten = ? WHERE rowid = ?", [
+                    (khoa_sap_xep_chuoi(ho_ten), rowid)
+                    for rowid, ho_ten in ket_noi.execute(f"SELECT rowid, ho_ten FROM {self.BANG}").fetchall()])
+        ket_noi.executescript(self.LENH_TAO_CHI_MUC)
+        self._ket_noi[file_path] = ket_noi
+        return ket_noi
+
+    def dong(self) -> None:
+        """Đóng mọi kết nối đang mở."""
+        for ket_noi in self._ket_noi.values():
+            ket_noi.close()
+        self._ket_noi = {}
+
+    def _gia_tri_dong(self, nv, thu_nhap=None, thue_tn=None) -> tuple:
+        if thu_nhap is None:
+            thu_nhap, thue_tn = nv.thu_nhap, nv.thue_thu_nhap
+        return (
+            nv.ma_nv, nv.ho_ten, nv.chuc_vu, nv.luong,
+            nv.doanh_so if isinstance(nv, TiepThi) else 0.0,
+            nv.hoa_hong if isinstance(nv, TiepThi) else 0.0,
+            nv.luong_trach_nhiem if isinstance(nv, TruongPhong) else 0.0,
+            thu_nhap, thue_tn, khoa_sap_xep_chuoi(nv.ho_ten),
+        )
+
+    def _truy_van(self, file_path: str, dieu_kien: str = "", tham_so: tuple = ()):
+        """Chạy SELECT trên bảng nhân viên và trả về lần lượt từng nhân viên."""
+        ket_noi = self._mo(file_path)
+        if ket_noi is None:
+            return
+        cac_dong = ket_noi.execute(f"SELECT {self.COT_DOC} FROM {self.BANG} {dieu_kien}", tham_so)
+        yield from tao_theo_lo(
+            (CLASS_MAP[chuc_vu], ma_nv, ho_ten, luong, doanh_so, hoa_hong, luong_trach_nhiem)
+            for ma_nv, ho_ten, chuc_vu, luong, doanh_so, hoa_hong, luong_trach_nhiem in cac_dong
+            if chuc_vu in CLASS_MAP)
+
+    def _kiem_tra_cot(self, cot: str) -> str:
+        """Cột dùng để so sánh/sắp xếp: họ tên so sánh qua cột khoa_ten (bảng chữ cái tiếng Việt)."""
+        if cot not in self.COT_TRUY_VAN:
+            raise ValueError(f"Không hỗ trợ truy vấn theo cột '{cot}'.")
+        return "khoa_ten" if cot == "ho_ten" else cot
+
+    # --- Đọc ---
+    def read(self, file_path: str) -> list:
+        return list(self.iter_read(file_path))
+
+    def iter_read(self, file_path: str):
+        """Đọc lần lượt toàn bộ nhân viên theo thứ tự đã thêm."""
+        if not os.path.exists(file_path):
+            log.warning("File '%s' không tồn tại.", file_path)
+            return
+        yield from self._truy_van(file_path, "ORDER BY rowid")
+
+    # --- Truy vấn dùng chỉ mục ---
+    def dem(self, file_path: str) -> int:
+        ket_noi = self._mo(file_path)
+        return 0 if ket_noi is None else ket_noi.execute(f"SELECT COUNT(*) FROM {self.BANG}").fetchone()[0]
+
+    def cac_ma(self, file_path: str) -> list[str]:
+        """Mã của mọi nhân viên (chỉ đọc chỉ mục khóa chính)."""
+        ket_noi = self._mo(file_path)
+        if ket_noi is None:
+            return []
+        return [ma for (ma,) in ket_noi.execute(f"SELECT ma_nv FROM {self.BANG}")]
+
+    def cac_ten(self, file_path: str) -> list[tuple[str, str]]:
+        """Các cặp (ma_nv, ho_ten) để dựng chỉ mục tìm theo tên, không tải cả bản ghi."""
+        ket_noi = self._mo(file_path)
+        if ket_noi is None:
+            return []
+        return ket_noi.execute(f"SELECT ma_nv, ho_ten FROM {self.BANG} ORDER BY rowid").fetchall()
 
-        # Sử dụng minidom để 'pretty print' (format) file XML
+    def tim_theo_ma(self, file_path: str, ma_nv: str):
+        """Y3: Tìm nhân viên theo mã, None nếu không có."""
+        return next(self._truy_van(file_path, "WHERE ma_nv = ?", (ma_nv,)), None)
+
+    def loc_theo_khoang(self, file_path: str, min_gia_tri: float, max_gia_tri: float, cot: str = "luong") -> list:
+        """Y6: Nhân viên có giá trị cột trong đoạn [min, max], theo thứ tự tăng dần."""
+        if cot == "ho_ten":
+            min_gia_tri, max_gia_tri = khoa_sap_xep_chuoi(min_gia_tri), khoa_sap_xep_chuoi(max_gia_tri)
+        cot = self._kiem_tra_cot(cot)
+        return list(self._truy_van(file_path, f"WHERE {cot} BETWEEN ? AND ? ORDER BY {cot}, rowid",
+                                   (min_gia_tri, max_gia_tri)))
+
+    def sap_xep(self, file_path: str, cot: str = "ho_ten", giam_dan: bool = False) -> list:
+        """Y7/Y8: Toàn bộ nhân viên theo thứ tự của cột (cùng giá trị thì giữ thứ tự đã thêm)."""
+        cot = self._kiem_tra_cot(cot)
+        return list(self._truy_van(file_path, f"ORDER BY {cot} {'DESC' if giam_dan else 'ASC'}, rowid"))
+
+    def top_k(self, file_path: str, k: int = 5, giam_dan: bool = True, chuc_vu: str | None = None,
+              cot: str = "thu_nhap") -> list:
+        """Y9: k nhân viên có giá trị cột cao nhất (hoặc thấp nhất), có thể lọc theo chức vụ."""
+        if k <= 0:
+            return []
+        cot = self._kiem_tra_cot(cot)
+        dieu_kien, tham_so = ("WHERE chuc_vu = ? ", (chuc_vu,)) if chuc_vu is not None else ("", ())
+        return list(self._truy_van(file_path, dieu_kien + f"ORDER BY {cot} {'DESC' if giam_dan else 'ASC'}, "
+                                   f"rowid LIMIT ?", tham_so + (k,)))
+
+    def thong_ke(self, file_path: str) -> dict[str, dict]:
+        """
+        Số liệu theo chức vụ (cùng dạng với ThongKeChucVu.ket_qua) tính bằng một câu GROUP BY.
+        Thuế tính lại trong SQL bằng biểu thức CASE theo các ngưỡng của biểu thuế đang áp dụng
+        (BieuThue.bieu_thuc_sql, cột thue_tn có thể đã cũ), độ lệch chuẩn tính từ độ lệch so với
+        trung bình của nhóm (truy vấn con).
+        """
+        ket_noi = self._mo(file_path)
+        ket_qua = {}
+        if ket_noi is not None:
+            thue, tham_so = bo_thue.hien_hanh.bieu_thuc_sql("thu_nhap")
+            for chuc_vu, n, tong_luong, tong_thu_nhap, trung_binh, tong_binh_phuong_lech, tong_thue, thap_nhat, \
+                    cao_nhat in ket_noi.execute(
+                    f"SELECT nv.chuc_vu, COUNT(*), SUM(luong), SUM(thu_nhap), nhom.trung_binh, "
+                    f"SUM((thu_nhap - nhom.trung_binh) * (thu_nhap - nhom.trung_binh)), SUM({thue}), "
+                    f"MIN(thu_nhap), MAX(thu_nhap) FROM {self.BANG} AS nv JOIN "
+                    f"(SELECT chuc_vu, AVG(thu_nhap) AS trung_binh FROM {self.BANG} GROUP BY chuc_vu) AS nhom "
+                    f"ON nv.chuc_vu = nhom.chuc_vu GROUP BY nv.chuc_vu", tham_so):
+                ket_qua[chuc_vu] = {
+                    "so_luong": n,
+                    "tong_luong": tong_luong,
+                    "tong_thu_nhap": tong_thu_nhap,
+                    "tong_thue": tong_thue,
+                    "thu_nhap_trung_binh": trung_binh,
+                    "do_lech_chuan": math.sqrt(tong_binh_phuong_lech / n),
+                    "thu_nhap_thap_nhat": thap_nhat,
+                    "thu_nhap_cao_nhat": cao_nhat,
+                }
+        ket_qua["Tổng"] = gop_ket_qua(ket_qua.values())
+        return ket_qua
+
+    # --- Ghi ---
+    def write(self, file_path: str, data) -> None:
         try:
-            # Chuyển cây ETree thành chuỗi byte thô
-            rough_string = ETree.tostring(root, 'utf-8')
-            # Phân tích chuỗi thô bằng minidom
-            reparsed = minidom.parseString(rough_string)
-            # Tạo chuỗi byte XML đã được format (thụt lề 2 dấu cách)
-            pretty_xml_as_bytes = reparsed.toprettyxml(indent="  ", encoding="utf-8")
-            
-            # Ghi ra file ở chế độ 'wb' (write bytes)
-            with open(file_path, "wb") as f:
-                f.write(pretty_xml_as_bytes)
-                
-        except Exception as e:
-            print(f"Lỗi khi ghi file XML '{file_path}': {e}")
\ No newline at end of file
+            if isinstance(data, list):
+                self.ghi_luong(file_path, data)
+            elif isinstance(data, (HanhChinh, TiepThi, TruongPhong)):
+                self.ghi_them_nhieu(file_path, [data])
+            else:
+                raise ValueError("Dữ liệu không hợp lệ. Phải là đối tượng nhân viên hoặc danh sách nhân viên.")
+        except sqlite3.Error as e:
+            log.error("Lỗi khi ghi CSDL '%s': %s", file_path, e)
+
+    def ghi_luong(self, file_path: str, nguon, kich_thuoc_lo: int | None = None, bao_tien_do=None) -> int:
+        """Ghi lại toàn bộ bảng trong một transaction, chèn nguồn nhân viên theo từng lô."""
+        ket_noi = self._mo(file_path, tao_moi=True)
+        so_ban_ghi = 0
+        with ket_noi:
+            ket_noi.execute(f"DELETE FROM {self.BANG}")
+            for lo in self._chia_lo(nguon, kich_thuoc_lo or self.KICH_THUOC_LO_GHI):
+                bang_luong = tinh_bang_luong(lo)
+                ket_noi.executemany(self.LENH_THEM, [
+                    self._gia_tri_dong(nv, tn, thue)
+                    for nv, tn, thue in zip(lo, bang_luong.thu_nhap, bang_luong.thue_thu_nhap)])
+                so_ban_ghi += len(lo)
+                if bao_tien_do is not None:
+                    bao_tien_do(so_ban_ghi)
+        return so_ban_ghi
+
+    def ghi_them_nhieu(self, file_path: str, cac_nv: list) -> None:
+        """Chèn các nhân viên trong một transaction."""
+        if not cac_nv:
+            return
+        ket_noi = self._mo(file_path, tao_moi=True)
+        with ket_noi:
+            ket_noi.executemany(self.LENH_THEM, [self._gia_tri_dong(nv) for nv in cac_nv])
+
+    def cap_nhat_ban_ghi(self, file_path: str, nv) -> bool:
+        return not self.va_nhieu_ban_ghi(file_path, [nv], [])
+
+    def xoa_ban_ghi(self, file_path: str, ma_nv: str) -> bool:
+        return not self.va_nhieu_ban_ghi(file_path, [], [ma_nv])
+
+    def va_nhieu_ban_ghi(self, file_path: str, cac_nv_sua: list, cac_ma_xoa: list) -> set[str]:
+        """Sửa/xóa cả nhóm trong một transaction; trả về các mã không có trong CSDL."""
+        ket_noi = self._mo(file_path)
+        if ket_noi is None:
+            return {nv.ma_nv for nv in cac_nv_sua} | set(cac_ma_xoa)
+        loi = set()
+        with ket_noi:
+            for nv in cac_nv_sua:
+                gia_tri = self._gia_tri_dong(nv)
+                con_tro = ket_noi.execute(
+                    f"UPDATE {self.BANG} SET ho_ten = ?, chuc_vu = ?, luong = ?, doanh_so = ?, hoa_hong = ?, "
+                    f"luong_trach_nhiem = ?, thu_nhap = ?, thue_tn = ?, khoa_ten = ? WHERE ma_nv = ?",
+                    gia_tri[1:] + gia_tri[:1])
+                if con_tro.rowcount <= 0:
+                    loi.add(nv.ma_nv)
+            for ma_nv in cac_ma_xoa:
+                if ket_noi.execute(f"DELETE FROM {self.BANG} WHERE ma_nv = ?", (ma_nv,)).rowcount <= 0:
+                    loi.add(ma_nv)
+        return loi
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+# Các module của chương trình nằm ở thư mục gốc của repo, không đóng gói thành package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nhansu import HanhChinh, TiepThi, TruongPhong  # noqa: E402
+from quanly import QuanLyNhanSu  # noqa: E402
+
+CAC_DINH_DANG = (".txt", ".csv", ".json", ".xml", ".bin", ".db")
+
+
+def tao_nv(lop, ma_nv, ho_ten, luong, doanh_so=0.0, hoa_hong=0.0, luong_trach_nhiem=0.0):
+    """Tạo nhân viên qua setter như khi nhập tay."""
+    nv = lop()
+    nv.ma_nv = ma_nv
+    nv.ho_ten = ho_ten
+    nv.luong = luong
+    if lop is TiepThi:
+        nv.doanh_so = doanh_so
+        nv.hoa_hong = hoa_hong
+    elif lop is TruongPhong:
+        nv.luong_trach_nhiem = luong_trach_nhiem
+    return nv
+
+
+def truong(nv) -> tuple:
+    """Các trường lưu trữ của nhân viên, để so sánh hai nhân viên theo giá trị."""
+    return (type(nv).__name__, nv.ma_nv, nv.ho_ten, nv.luong, getattr(nv, "doanh_so", 0.0),
+            getattr(nv, "hoa_hong", 0.0), getattr(nv, "luong_trach_nhiem", 0.0))
+
+
+@pytest.fixture
+def danh_sach():
+    """Danh sách mẫu có đủ ba loại nhân viên, tên có dấu và ký tự đặc biệt (không có dấu phẩy: .txt không hỗ trợ)."""
+    return [
+        tao_nv(HanhChinh, "HC0001", "Nguyễn Văn An", 9_000_000),
+        tao_nv(TiepThi, "TT0001", "Trần Thị Bích", 12_000_000, 80_000_000, 0.05),
+        tao_nv(TruongPhong, "TP0001", "Lê Hoàng \"Đức\" & <Minh>", 20_000_000, luong_trach_nhiem=5_000_000),
+        tao_nv(HanhChinh, "HC0002", "Phạm Ánh", 7_500_000.5),
+        tao_nv(TiepThi, "TT0002", "Đặng Thu", 6_000_000, 10_000_000, 0.1),
+    ]
+
+
+@pytest.fixture
+def tao_ql(tmp_path):
+    """Tạo QuanLyNhanSu làm việc với file <tmp_path>/data_nhansu<dinh_dang>, có thể ghi sẵn dữ liệu."""
+    cac_ql = []
+
+    def tao(dinh_dang: str, du_lieu: list | None = None) -> QuanLyNhanSu:
+        ql = QuanLyNhanSu()
+        ql._file_name_base = str(tmp_path / "data_nhansu")
+        ql._current_file_type = dinh_dang
+        if du_lieu is not None:
+            ql.luu_file(du_lieu)
+        ql.doc_file()
+        cac_ql.append(ql)
+        return ql
+
+    yield tao
+    for ql in cac_ql:
+        ql.tat_ghi_nen()
+        ql._handlers[".db"].dong()
@@ -0,0 +1,41 @@
+"""Tính lương theo cột phải cho cùng kết quả với property của từng nhân viên."""
+import pytest
+
+import bangluong
+from bieuthue import BIEU_THUE_MAC_DINH, BieuThue, bo_thue
+from danhsachcot import DanhSachCot
+from nhansu import HanhChinh, TiepThi, TruongPhong
+
+
+@pytest.fixture
+def nhan_vien_hon_hop(danh_sach):
+    """Nhân viên tạo qua setter, qua from_row (chưa có cache) và view của DanhSachCot."""
+    bang = DanhSachCot.tu_danh_sach(danh_sach)
+    return danh_sach + [
+        HanhChinh.from_row("HC0100", "Lẻ", 11_111_111.1),
+        TiepThi.from_row("TT0100", "Lẻ", 3_333_333.3, 123_456_789.01, 0.07),
+        TruongPhong.from_row("TP0100", "Lẻ", 40_000_000, luong_trach_nhiem=7_777_777.7),
+    ] + list(bang)
+
+
+@pytest.mark.parametrize("bieu_thue", [
+    BIEU_THUE_MAC_DINH,
+    BieuThue([(0, 0.0), (9_000_000, 0.10), (15_000_000, 0.2, True)], luy_tien=True, ten="Lũy tiến"),
+], ids=lambda bieu_thue: bieu_thue.ten)
+def test_tinh_theo_cot_giong_property(nhan_vien_hon_hop, bieu_thue):
+    bieu_cu = bo_thue.hien_hanh
+    bo_thue.ap_dung(bieu_thue)
+    try:
+        bang_luong = bangluong.tinh_bang_luong(nhan_vien_hon_hop)
+        assert bang_luong.thu_nhap == [nv.thu_nhap for nv in nhan_vien_hon_hop]
+        assert bang_luong.thue_thu_nhap == [nv.thue_thu_nhap for nv in nhan_vien_hon_hop]
+    finally:
+        bo_thue.ap_dung(bieu_cu)
+
+
+def test_numpy_va_python_thuan_nhu_nhau(nhan_vien_hon_hop, monkeypatch):
+    pytest.importorskip("numpy")
+    theo_cot = bangluong.tinh_bang_luong(nhan_vien_hon_hop)
+    monkeypatch.setattr(bangluong, "np", None)
+    thuan = bangluong.tinh_bang_luong(nhan_vien_hon_hop)
+    assert (theo_cot.thu_nhap, theo_cot.thue_thu_nhap) == (thuan.thu_nhap, thuan.thue_thu_nhap)
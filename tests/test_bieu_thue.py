@@ -0,0 +1,17 @@
+"""Biểu thuế: thuế theo bậc và cache có giới hạn."""
+import pytest
+
+from bieuthue import BIEU_THUE_MAC_DINH, BieuThue
+
+
+@pytest.mark.parametrize("thu_nhap, thue", [(8_999_999, 0), (9_000_000, 900_000), (15_000_000, 1_500_000),
+                                            (15_000_001, 1_800_000.12)])
+def test_bieu_thue_mac_dinh(thu_nhap, thue):
+    assert BIEU_THUE_MAC_DINH.tinh(thu_nhap) == pytest.approx(thue)
+
+
+def test_cache_thue_co_gioi_han(monkeypatch):
+    monkeypatch.setattr(BieuThue, "KICH_THUOC_CACHE", 8)
+    bieu_thue = BieuThue([(0, 0.0), (100, 0.1)], luy_tien=True)
+    assert [bieu_thue.tinh(float(x)) for x in range(1000)] == [bieu_thue._tinh(float(x)) for x in range(1000)]
+    assert bieu_thue._tinh_nho.cache_info().currsize == 8
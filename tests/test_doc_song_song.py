@@ -0,0 +1,64 @@
+"""Đọc song song file .txt/.csv phải cho cùng kết quả với read()."""
+import pytest
+
+from conftest import truong
+from quanlyfile import QuanLyCsv, QuanLyTxt
+
+# Dòng viết tay: thiếu cột, mã trùng, số sai, họ tên trống, họ tên có U+2028, kết thúc bằng \r\n
+DONG_THEM = {
+    ".txt": ["HC0009,Thiếu Cột,Hành Chính,5000000\r\n",
+             "TT0009,Thiếu Hoa Hồng,Tiếp Thị,1000,2000\n",
+             "HC0001,Trùng Mã,Hành Chính,1\n",
+             "HC0010,Lương Sai,Hành Chính,abc\n",
+             "HC0011, ,Hành Chính,5\n",
+             "TT0010,Tên\u2028Lạ,Tiếp Thị,1,2,0.5\n",
+             "XX0001,Chức Vụ Lạ,Bảo Vệ,1\n"],
+    ".csv": ["HC0009,Thiếu Cột,Hành Chính,5000000\r\n",
+             "TT0009,Thiếu Hoa Hồng,Tiếp Thị,1000,2000\r\n",
+             "HC0001,Trùng Mã,Hành Chính,1,0,0,0,1,0\r\n",
+             "HC0010,Lương Sai,Hành Chính,abc,0,0,0,0,0\r\n",
+             "TT0010,Tên\u2028Lạ,Tiếp Thị,1,2,0.5,0,3,0\r\n",
+             "XX0001,Chức Vụ Lạ,Bảo Vệ,1,0,0,0,1,0\r\n"],
+}
+
+
+def khoa(nv) -> tuple:
+    """View của DanhSachCot là lớp con của lớp nhân viên, nên so sánh theo chức vụ."""
+    return (nv.chuc_vu, nv.ma_nv, nv.ho_ten or "") + truong(nv)[3:]
+
+
+@pytest.mark.parametrize("so_tien_trinh", [1, 2])
+@pytest.mark.parametrize("lop", [QuanLyTxt, QuanLyCsv])
+def test_doc_song_song_giong_read(tmp_path, danh_sach, lop, so_tien_trinh):
+    handler = lop()
+    file_path = str(tmp_path / ("data.csv" if handler.la_csv else "data.txt"))
+    handler.write(file_path, danh_sach)
+    handler.xoa_ban_ghi(file_path, "TT0001")  # dòng bia mộ
+    with open(file_path, "a", encoding="utf-8", newline="") as f:
+        f.write("\n")
+        f.writelines(DONG_THEM[".csv" if handler.la_csv else ".txt"])
+
+    doc_tuan_tu = handler.read(file_path)
+    bang = handler.doc_song_song(file_path, so_tien_trinh=so_tien_trinh, kich_thuoc_khoi=64)
+    assert [khoa(nv) for nv in bang] == [khoa(nv) for nv in doc_tuan_tu]
+    assert "TT0001" not in bang.ma_nv and "XX0001" not in bang.ma_nv
+    assert bang.tim("HC0001").ho_ten == "Trùng Mã"  # mã trùng: dòng sau cùng thắng như khi nạp vào quản lý
+    assert bang.tim("TT0010").ho_ten == "Tên\u2028Lạ"
+    assert bang.tim("TT0009").hoa_hong == 0.0 and bang.tim("HC0010").luong == 0.0
+
+
+@pytest.mark.parametrize("so_tien_trinh", [1, 2])
+def test_doc_song_song_csv_o_nhieu_dong(tmp_path, danh_sach, so_tien_trinh):
+    handler = QuanLyCsv()
+    file_path = str(tmp_path / "data.csv")
+    danh_sach[1].ho_ten = "Trần Thị\nBích \"Hai Dòng\""
+    danh_sach[3].ho_ten = "Phạm\r\n\r\nÁnh, \"Ba\" dòng\n"
+    handler.write(file_path, danh_sach * 20)
+    with open(file_path, "rb") as f:
+        assert f.read().count(b"\n") > 6 * 20 + 1  # có ô nhiều dòng trong file
+
+    doc_tuan_tu = handler.read(file_path)
+    for kich_thuoc_khoi in (1, 7, 64, 300):  # điểm cắt rơi vào giữa các ô nhiều dòng
+        bang = handler.doc_song_song(file_path, so_tien_trinh=so_tien_trinh, kich_thuoc_khoi=kich_thuoc_khoi)
+        assert [khoa(nv) for nv in bang] == [khoa(nv) for nv in doc_tuan_tu]
+    assert bang.tim("TT0001").ho_ten == danh_sach[1].ho_ten
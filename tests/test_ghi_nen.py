@@ -0,0 +1,138 @@
+"""Ghi nền: gộp thao tác theo mã, ghi đúng file lúc gửi và báo lỗi ghi ở flush()."""
+import os
+
+import pytest
+
+from conftest import tao_nv, truong
+from ghinen import BoGhiNen
+from nhansu import HanhChinh
+from nhatky import SUA, THEM, XOA
+
+
+def nv_ma(ma_nv: str, luong: float = 1.0):
+    return tao_nv(HanhChinh, ma_nv, "Tên " + ma_nv, luong)
+
+
+@pytest.mark.parametrize("cac_thao_tac, ky_vong", [
+    ([THEM, SUA], [THEM]),
+    ([THEM, XOA], []),
+    ([SUA, XOA], [XOA]),
+    ([SUA, SUA], [SUA]),
+    ([XOA, THEM], [SUA]),  # bản ghi cũ còn trong file: thêm lại cùng mã là thay dòng cũ
+    ([XOA, THEM, XOA], [XOA]),
+    ([XOA, THEM, SUA], [SUA]),
+    ([THEM, XOA, THEM], [THEM]),
+])
+def test_gop_theo_ma(cac_thao_tac, ky_vong):
+    ban_cuoi = [nv_ma("HC0001", i) for i in range(len(cac_thao_tac))]
+    thay_doi = BoGhiNen.gop(zip(cac_thao_tac, ban_cuoi))
+    assert [thao_tac for thao_tac, _ in thay_doi.values()] == ky_vong
+    if ky_vong:
+        assert thay_doi["HC0001"][1] is ban_cuoi[-1]
+
+
+def test_gop_giu_thu_tu_them_va_xep_theo_thao_tac_cuoi():
+    a, b, c = nv_ma("HC0001"), nv_ma("HC0002"), nv_ma("HC0003")
+    thay_doi = BoGhiNen.gop([(THEM, a), (SUA, b), (THEM, c), (SUA, a), (XOA, b)])
+    assert [(ma, thao_tac) for ma, (thao_tac, _) in thay_doi.items()] == [
+        ("HC0001", THEM), ("HC0003", THEM), ("HC0002", XOA)]
+
+
+def test_flush_nem_lai_loi_ghi_mot_lan():
+    def ghi_loi(thay_doi, dich):
+        raise OSError("đĩa đầy")
+
+    bo_ghi_nen = BoGhiNen(ghi_loi, thoi_gian_gom=0)
+    bo_ghi_nen.gui(SUA, nv_ma("HC0001"))
+    with pytest.raises(OSError, match="đĩa đầy"):
+        bo_ghi_nen.flush()
+    bo_ghi_nen.flush()  # lỗi đã báo thì không báo lại
+    bo_ghi_nen.dong()
+
+
+def test_dong_nem_lai_loi_ghi_va_van_dung_luong():
+    def ghi_loi(thay_doi, dich):
+        raise OSError("đĩa đầy")
+
+    bo_ghi_nen = BoGhiNen(ghi_loi, thoi_gian_gom=0)
+    bo_ghi_nen.gui(SUA, nv_ma("HC0001"))
+    with pytest.raises(OSError, match="đĩa đầy"):
+        bo_ghi_nen.dong()
+    with pytest.raises(RuntimeError):
+        bo_ghi_nen.gui(SUA, nv_ma("HC0001"))  # luồng ghi đã dừng
+
+
+def test_ghi_theo_noi_ghi_luc_gui():
+    da_ghi = []
+    bo_ghi_nen = BoGhiNen(lambda thay_doi, dich: da_ghi.append((dich, list(thay_doi))), thoi_gian_gom=0.2)
+    bo_ghi_nen.gui(SUA, nv_ma("HC0001"), "a.txt")
+    bo_ghi_nen.gui(SUA, nv_ma("HC0002"), "a.txt")
+    bo_ghi_nen.gui(SUA, nv_ma("HC0003"), "b.csv")
+    bo_ghi_nen.dong()
+    assert da_ghi == [("a.txt", ["HC0001", "HC0002"]), ("b.csv", ["HC0003"])]
+
+
+@pytest.mark.parametrize("dinh_dang", [".txt", ".csv", ".json", ".xml"])
+def test_xoa_roi_them_lai_cung_ma_khong_de_lai_hai_dong(tao_ql, danh_sach, dinh_dang):
+    ql = tao_ql(dinh_dang, danh_sach)
+    ql.bat_ghi_nen(thoi_gian_gom=0.2)  # xóa và thêm nằm trong cùng một nhóm ghi
+    ql.xoa("HC0001")
+    ql.them({"ma_nv": "HC0001", "chuc_vu": "Hành Chính", "ho_ten": "Người Mới", "luong": 1_000_000})
+    ql.flush()
+    ky_vong = [truong(nv) for nv in ql._danh_sach_nv]
+    doc_lai = tao_ql(dinh_dang)
+    assert sorted(truong(nv) for nv in doc_lai._danh_sach_nv) == sorted(ky_vong)
+    doc_file = ql._handler_hien_tai.read(ql._file_hien_tai)
+    assert [nv.ma_nv for nv in doc_file].count("HC0001") == 1
+
+
+def test_doi_file_khi_con_thay_doi_cho_ghi(tao_ql, danh_sach):
+    ql = tao_ql(".txt", danh_sach)
+    ql.bat_ghi_nen(thoi_gian_gom=0.2)
+    ql.cap_nhat("TT0001", luong=1_234_567)
+    ql._current_file_type = ".csv"  # đổi file trước khi luồng nền kịp ghi
+    ql.flush()
+    ql._current_file_type = ".txt"
+    assert [nv.luong for nv in ql._handler_hien_tai.read(ql._file_hien_tai) if nv.ma_nv == "TT0001"] == [1_234_567]
+    assert not os.path.exists(ql._file_name_base + ".csv")
+
+
+def test_loi_ghi_nen_dung_doc_file(tao_ql, danh_sach, monkeypatch):
+    ql = tao_ql(".txt", danh_sach)
+    ql.bat_ghi_nen(thoi_gian_gom=0)
+
+    def va_loi(*args):
+        raise OSError("mất quyền ghi")
+
+    monkeypatch.setattr(ql._handler_hien_tai, "va_nhieu_ban_ghi", va_loi)
+    ql.cap_nhat("TT0001", luong=1_234_567)
+    with pytest.raises(OSError, match="mất quyền ghi"):
+        ql.doc_file()
+    assert ql.lay("TT0001").luong == 1_234_567  # danh sách trong bộ nhớ không bị đọc đè
+
+
+def test_tat_ghi_nen_bao_loi_ghi_con_cho(tao_ql, danh_sach, monkeypatch):
+    ql = tao_ql(".txt", danh_sach)
+    ql.bat_ghi_nen(thoi_gian_gom=0.2)  # thay đổi còn trong hàng đợi lúc tắt
+
+    def va_loi(*args):
+        raise OSError("mất quyền ghi")
+
+    monkeypatch.setattr(ql._handler_hien_tai, "va_nhieu_ban_ghi", va_loi)
+    ql.cap_nhat("TT0001", luong=1_234_567)
+    with pytest.raises(OSError, match="mất quyền ghi"):
+        ql.tat_ghi_nen()
+    assert ql._bo_ghi_nen is None
+
+
+def test_loi_ghi_luc_thoat_chuong_trinh_duoc_ghi_log(tao_ql, danh_sach, monkeypatch, caplog):
+    ql = tao_ql(".csv", danh_sach)
+    ql.bat_ghi_nen(thoi_gian_gom=0.2)
+
+    def va_loi(*args):
+        raise OSError("mất quyền ghi")
+
+    monkeypatch.setattr(ql._handler_hien_tai, "va_nhieu_ban_ghi", va_loi)
+    ql.xoa("HC0001")
+    ql._tat_ghi_nen_khi_thoat()  # hàm đăng ký với atexit
+    assert "chưa được lưu: mất quyền ghi" in caplog.text
@@ -0,0 +1,97 @@
+"""Ghi/đọc lại qua mọi handler, ghi atomic và áp dụng lại nhật ký sau khi chương trình dừng đột ngột."""
+import contextlib
+import os
+
+import pytest
+
+from conftest import CAC_DINH_DANG, truong
+from chuyendoi import CAC_DINH_DANG as HANDLER_THEO_DINH_DANG
+from nhatky import NhatKy, SUA, XOA
+from quanlyfile import ghi_nguyen_tu
+
+
+@pytest.mark.parametrize("dinh_dang", CAC_DINH_DANG)
+def test_ghi_roi_doc_lai_giu_nguyen_du_lieu(tmp_path, danh_sach, dinh_dang):
+    handler = HANDLER_THEO_DINH_DANG[dinh_dang]()
+    file_path = str(tmp_path / ("data" + dinh_dang))
+    handler.write(file_path, danh_sach)
+    assert [truong(nv) for nv in handler.read(file_path)] == [truong(nv) for nv in danh_sach]
+    assert [truong(nv) for nv in handler.iter_read(file_path)] == [truong(nv) for nv in danh_sach]
+
+
+@pytest.mark.parametrize("dinh_dang", CAC_DINH_DANG)
+def test_ghi_luong_cung_ket_qua_voi_write(tmp_path, danh_sach, dinh_dang):
+    handler = HANDLER_THEO_DINH_DANG[dinh_dang]()
+    file_path = str(tmp_path / ("data" + dinh_dang))
+    assert handler.ghi_luong(file_path, iter(danh_sach), kich_thuoc_lo=2) == len(danh_sach)
+    assert [truong(nv) for nv in handler.read(file_path)] == [truong(nv) for nv in danh_sach]
+
+
+def test_ghi_nguyen_tu_loi_giua_chung_giu_file_cu(tmp_path):
+    file_path = tmp_path / "data.txt"
+    file_path.write_text("cũ\n", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with ghi_nguyen_tu(str(file_path), encoding="utf-8") as f:
+            f.write("mới một nửa")
+            raise RuntimeError("dừng giữa chừng")
+    assert file_path.read_text(encoding="utf-8") == "cũ\n"
+    assert os.listdir(tmp_path) == ["data.txt"]  # không còn file tạm
+
+
+@pytest.mark.parametrize("dinh_dang", [".txt", ".csv", ".json", ".xml", ".bin"])
+def test_ghi_de_loi_khi_doi_ten_giu_file_cu(tmp_path, danh_sach, dinh_dang, monkeypatch):
+    handler = HANDLER_THEO_DINH_DANG[dinh_dang]()
+    file_path = str(tmp_path / ("data" + dinh_dang))
+    handler.write(file_path, danh_sach)
+
+    def doi_ten_loi(*args):
+        raise OSError("mất điện")
+
+    monkeypatch.setattr(os, "replace", doi_ten_loi)
+    with contextlib.suppress(OSError):  # handler có thể tự báo lỗi thay vì ném ra
+        handler.write(file_path, danh_sach[:1])
+    monkeypatch.undo()
+    assert [truong(nv) for nv in handler.read(file_path)] == [truong(nv) for nv in danh_sach]
+    assert sorted(os.listdir(tmp_path)) == ["data" + dinh_dang]
+
+
+@pytest.mark.parametrize("dinh_dang", [".json", ".xml"])
+def test_doc_lai_ap_dung_nhat_ky_chua_gop(tao_ql, danh_sach, dinh_dang):
+    ql = tao_ql(dinh_dang, danh_sach)
+    ql.cap_nhat("TT0001", luong=13_000_000)
+    ql.xoa("HC0001")
+    them = ql.them({"chuc_vu": "Hành Chính", "ho_ten": "Võ Mới", "luong": 5_000_000})[0]
+    assert len(ql._nhat_ky) == 2  # sửa/xóa nằm trong nhật ký, chưa gộp vào file gốc
+    ky_vong = [truong(nv) for nv in ql._danh_sach_nv]
+
+    # Chương trình dừng mà không gộp nhật ký: lần chạy sau vẫn thấy đủ thay đổi
+    ql_moi = tao_ql(dinh_dang)
+    assert [truong(nv) for nv in ql_moi._danh_sach_nv] == ky_vong
+    assert ql_moi.lay("TT0001").luong == 13_000_000
+    assert ql_moi.lay("HC0001") is None and ql_moi.lay(them.ma_nv) is not None
+
+    ql_moi.gop_nhat_ky()
+    assert not os.path.exists(ql_moi._nhat_ky.file_path)
+    handler = ql_moi._handler_hien_tai
+    assert [truong(nv) for nv in handler.read(ql_moi._file_hien_tai)] == ky_vong
+
+
+def test_nhat_ky_bo_qua_dong_ghi_do(tmp_path, danh_sach):
+    nhat_ky = NhatKy(str(tmp_path / "data.json"))
+    nhat_ky.ghi(SUA, danh_sach[1])
+    with open(nhat_ky.file_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "xoa", "ma_')  # dòng cuối bị cắt khi mất điện
+    assert [ban_ghi["ma_nv"] for ban_ghi in nhat_ky.doc()] == ["TT0001"]
+
+
+def test_phu_len_thay_tai_cho_bo_ban_da_xoa_va_them_o_cuoi(tmp_path, danh_sach):
+    nhat_ky = NhatKy(str(tmp_path / "data.json"))
+    sua = danh_sach[2]
+    sua.luong = 1.0
+    moi = danh_sach[0].__class__()
+    moi.ma_nv, moi.ho_ten, moi.luong = "HC0009", "Mới", 1.0
+    nhat_ky.ghi_nhieu([(SUA, sua), (XOA, danh_sach[0]), (SUA, moi), (XOA, moi), (SUA, moi)])
+    ket_qua = [nv.ma_nv for nv in nhat_ky.phu_len(iter(danh_sach))]
+    assert ket_qua == ["TT0001", "TP0001", "HC0002", "TT0002", "HC0009"]
+    # Áp dụng lại lần nữa cho cùng kết quả (thao tác là ghi đè theo mã)
+    assert [nv.ma_nv for nv in nhat_ky.phu_len(nhat_ky.phu_len(iter(danh_sach)))] == ket_qua
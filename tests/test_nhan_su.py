@@ -0,0 +1,51 @@
+"""Cache thu nhập/thuế của nhân viên và tạo nhân viên hàng loạt."""
+import pytest
+
+from bieuthue import BieuThue, bo_thue
+from conftest import tao_nv, truong
+from nhansu import HanhChinh, TiepThi, TruongPhong, _tao_qua_setter, tao_hang_loat
+
+
+@pytest.mark.parametrize("lop, truong_sua, gia_tri_moi", [
+    (HanhChinh, "luong", 11_000_000),
+    (TiepThi, "luong", 11_000_000),
+    (TiepThi, "doanh_so", 90_000_000),
+    (TiepThi, "hoa_hong", 0.2),
+    (TruongPhong, "luong_trach_nhiem", 9_000_000),
+])
+def test_setter_xoa_cache_thu_nhap_va_thue(lop, truong_sua, gia_tri_moi):
+    nv = tao_nv(lop, "NV0001", "Tên", 10_000_000, 50_000_000, 0.1, 3_000_000)
+    thu_nhap_cu, thue_cu = nv.thu_nhap, nv.thue_thu_nhap  # đã lưu vào cache
+    setattr(nv, truong_sua, gia_tri_moi)
+    moi = _tao_qua_setter(lop, "NV0001", "Tên", nv.luong, getattr(nv, "doanh_so", 0.0),
+                          getattr(nv, "hoa_hong", 0.0), getattr(nv, "luong_trach_nhiem", 0.0))
+    assert (nv.thu_nhap, nv.thue_thu_nhap) == (moi.thu_nhap, moi.thue_thu_nhap)
+    assert (nv.thu_nhap, nv.thue_thu_nhap) != (thu_nhap_cu, thue_cu)
+
+
+def test_doi_bieu_thue_thi_thue_da_cache_het_hieu_luc():
+    nv = tao_nv(HanhChinh, "HC0001", "Tên", 20_000_000)
+    thue_cu = nv.thue_thu_nhap
+    bieu_cu = bo_thue.hien_hanh
+    bo_thue.ap_dung(BieuThue([(0, 0.05)], ten="5%"))
+    try:
+        assert nv.thue_thu_nhap == 1_000_000 != thue_cu
+    finally:
+        bo_thue.ap_dung(bieu_cu)
+    assert nv.thue_thu_nhap == thue_cu
+
+
+def test_tao_hang_loat_giong_tao_qua_setter(capsys):
+    cac_dong = [
+        (HanhChinh, "HC0001", "Nguyễn Văn An", "9000000", "0", "0", "0"),
+        (TiepThi, "TT0001", "Trần Thị Bích", 12_000_000, "80000000", "0.05", 0),
+        (TruongPhong, "TP0001", "Lê Minh", "20000000", 0, 0, "5000000"),
+        (HanhChinh, "HC0002", "Lương Sai", "abc", "0", "0", "0"),  # lỗi: đi qua setter, lương về 0
+        (TiepThi, "TT0002", " ", "1", "2", "0.5", "0"),  # họ tên trống: setter báo lỗi
+    ]
+    nhanh = tao_hang_loat(cac_dong)
+    thong_bao_nhanh = capsys.readouterr().out
+    cham = [_tao_qua_setter(*dong) for dong in cac_dong]
+    assert [truong(nv) for nv in nhanh] == [truong(nv) for nv in cham]
+    assert [(nv.thu_nhap, nv.thue_thu_nhap) for nv in nhanh] == [(nv.thu_nhap, nv.thue_thu_nhap) for nv in cham]
+    assert thong_bao_nhanh == capsys.readouterr().out != ""  # dòng lỗi vẫn báo như trước
@@ -0,0 +1,88 @@
+"""File nhị phân .bin: ghi thêm quá sức chứa, vá/xóa, nén lại và truy vấn trực tiếp trên cột."""
+import pytest
+
+from conftest import tao_nv, truong
+from nhansu import HanhChinh
+from quanlyfile import BangNhiPhan, QuanLyBin
+
+
+@pytest.fixture
+def file_bin(tmp_path, danh_sach):
+    handler = QuanLyBin()
+    file_path = str(tmp_path / "data.bin")
+    handler.write(file_path, danh_sach)
+    return handler, file_path
+
+
+def test_ghi_them_qua_suc_chua_thi_ghi_lai_rong_hon(file_bin, danh_sach):
+    handler, file_path = file_bin
+    with BangNhiPhan(file_path) as bang:
+        suc_chua = bang._suc_chua
+    them = [tao_nv(HanhChinh, f"HC{i:04d}", f"Người {i}", 1_000_000 + i) for i in range(10, 10 + suc_chua)]
+    handler.ghi_them_nhieu(file_path, them[:suc_chua - len(danh_sach)])  # vừa đủ chỗ: ghi tại chỗ
+    with BangNhiPhan(file_path) as bang:
+        assert (len(bang), bang._suc_chua) == (suc_chua, suc_chua)
+    handler.ghi_them_nhieu(file_path, them[suc_chua - len(danh_sach):])
+    with BangNhiPhan(file_path) as bang:
+        assert len(bang) == len(danh_sach) + len(them)
+        assert bang._suc_chua == QuanLyBin._suc_chua_cho(len(bang)) > suc_chua
+    assert [truong(nv) for nv in handler.read(file_path)] == [truong(nv) for nv in danh_sach + them]
+
+
+def test_doi_ten_va_xoa_roi_nen_lai(file_bin, danh_sach):
+    handler, file_path = file_bin
+    handler.BIA_MO_TOI_THIEU = 2
+    danh_sach[1].ho_ten = "Tên Mới Dài Hơn Tên Cũ"
+    assert handler.cap_nhat_ban_ghi(file_path, danh_sach[1])
+    assert handler.xoa_ban_ghi(file_path, "HC0001")
+    assert not handler.can_nen(file_path)
+    assert handler.xoa_ban_ghi(file_path, "HC0002")
+    assert not handler.xoa_ban_ghi(file_path, "HC0002")
+    assert handler.can_nen(file_path)
+    con_lai = [truong(nv) for nv in (danh_sach[1], danh_sach[2], danh_sach[4])]
+    assert [truong(nv) for nv in handler.read(file_path)] == con_lai
+
+    handler.ghi_luong(file_path, handler.iter_read(file_path))
+    assert not handler.can_nen(file_path)
+    with BangNhiPhan(file_path) as bang:
+        assert (len(bang), bang.so_bia_mo) == (3, 0)
+    assert [truong(nv) for nv in handler.read(file_path)] == con_lai
+
+
+def test_quan_ly_nen_file_khi_luu(tao_ql, danh_sach):
+    ql = tao_ql(".bin", danh_sach)
+    ql._handler_hien_tai.BIA_MO_TOI_THIEU = 2
+    ql.xoa(["HC0001", "TT0002"])
+    with BangNhiPhan(ql._file_hien_tai) as bang:
+        assert (len(bang), bang.so_bia_mo) == (3, 0)
+    assert [nv.ma_nv for nv in ql.danh_sach_theo_ten()] == ["TP0001", "HC0002", "TT0001"]
+
+
+def test_truy_van_tren_file_giong_trong_bo_nho(tao_ql, danh_sach):
+    ql_bin, ql_txt = tao_ql(".bin", danh_sach), tao_ql(".txt", danh_sach)
+    assert ql_bin._truy_van_truc_tiep and not ql_bin._danh_sach_nv
+    for ql in (ql_bin, ql_txt):
+        ql.cap_nhat("TT0001", luong=9_000_000)
+        ql.xoa("HC0002")
+
+    def ket_qua(ql):
+        ma = lambda ds: [nv.ma_nv for nv in ds]
+        return (ma(ql.loc_theo_khoang(5_000_000, 20_000_000)),
+                ma(ql.loc_theo_khoang(0, 1e9, "thu_nhap")),
+                ma(ql.danh_sach_theo_ten()),
+                ma(ql.danh_sach_theo_thu_nhap()),
+                ma(ql.top_k(2)),
+                ma(ql.top_k(5, chuc_vu="Tiếp Thị")),
+                ql.lay("tt0001").luong,
+                {ten: {k: round(v, 6) for k, v in so_lieu.items()} for ten, so_lieu in ql.thong_ke().items()})
+
+    assert ket_qua(ql_bin) == ket_qua(ql_txt)
+
+
+def test_loc_theo_khoang_tra_ve_list_dung_duoc_sau_khi_dong(file_bin, danh_sach):
+    handler, file_path = file_bin
+    with handler.mo_bang(file_path) as bang:
+        ket_qua = bang.loc_theo_khoang(0, 1e12)
+    assert isinstance(ket_qua, list)
+    assert sorted(nv.ma_nv for nv in ket_qua) == sorted(nv.ma_nv for nv in danh_sach)
+    assert [nv.luong for nv in ket_qua] == sorted(nv.luong for nv in danh_sach)
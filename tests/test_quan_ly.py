@@ -0,0 +1,111 @@
+"""API của QuanLyNhanSu và các thao tác gọi từ menu (asm_gd2)."""
+import builtins
+import os
+
+import pytest
+
+import asm_gd2
+from conftest import CAC_DINH_DANG, truong
+from nhansu import HanhChinh, TiepThi
+
+
+def tra_loi(monkeypatch, *cac_cau_tra_loi):
+    """Giả lập người dùng nhập lần lượt các câu trả lời."""
+    cau_tra_loi = iter(cac_cau_tra_loi)
+    monkeypatch.setattr(builtins, "input", lambda _: next(cau_tra_loi))
+
+
+def test_chuyen_doi_file_nguon_hong_bao_loi_khong_nem_ra(tao_ql, danh_sach, monkeypatch, capsys):
+    ql = tao_ql(".xml", danh_sach)
+    with open(ql._file_hien_tai, "a", encoding="utf-8") as f:
+        f.write("<NhanVien><MaNV>")  # file nguồn bị cắt ngang
+    cac_dinh_dang = [dinh_dang for dinh_dang in ql.cac_dinh_dang if dinh_dang != ".xml"]
+    tra_loi(monkeypatch, str(cac_dinh_dang.index(".csv") + 1))
+    asm_gd2.chuyen_doi_dinh_dang(ql)
+    assert "Lỗi khi chuyển" in capsys.readouterr().out
+    assert not os.path.exists(ql._file_name_base + ".csv")  # file đích chưa có thì vẫn chưa có
+
+
+@pytest.mark.parametrize("nv", [HanhChinh(), TiepThi()])
+def test_them_doi_tuong_thieu_ho_ten_khong_ghi_gi(tao_ql, danh_sach, nv):
+    ql = tao_ql(".txt", danh_sach)
+    with open(ql._file_hien_tai, encoding="utf-8") as f:
+        truoc = f.read()
+    with pytest.raises(ValueError, match="Tên"):
+        ql.them(nv)
+    with open(ql._file_hien_tai, encoding="utf-8") as f:
+        assert f.read() == truoc
+    assert len(ql._danh_sach_nv) == len(danh_sach)
+
+
+@pytest.mark.parametrize("dinh_dang", CAC_DINH_DANG)
+def test_api_khong_in_ra_man_hinh(tao_ql, danh_sach, dinh_dang, capsys):
+    ql = tao_ql(dinh_dang, danh_sach)
+    capsys.readouterr()
+    ql.them([{"chuc_vu": "Hành Chính", "ho_ten": "Võ Mới", "luong": 5_000_000}])
+    ql.cap_nhat("TT0001", luong=13_000_000)
+    ql.xoa("HC0001")
+    ql.gop_nhat_ky()
+    ql.doc_file()
+    assert capsys.readouterr().out == ""
+
+
+def test_menu_them_nhan_vien_du_lieu_sai_khong_them(tao_ql, danh_sach, monkeypatch, capsys):
+    ql = tao_ql(".csv", danh_sach)
+    tra_loi(monkeypatch, "1", "Võ Mới", "năm triệu")
+    asm_gd2.them_nhan_vien(ql)
+    assert "Lương cơ bản 'năm triệu' không hợp lệ" in capsys.readouterr().out
+    assert sorted(map(truong, ql._handler_hien_tai.read(ql._file_hien_tai))) == sorted(map(truong, danh_sach))
+
+
+def test_menu_them_roi_xoa_qua_api(tao_ql, danh_sach, monkeypatch):
+    ql = tao_ql(".txt", danh_sach)
+    tra_loi(monkeypatch, "2", "Võ Mới", "5000000", "20000000", "0.1")
+    asm_gd2.them_nhan_vien(ql)
+    (nv,) = ql.tim_kiem_ten("vo moi")
+    assert (nv.ma_nv, nv.doanh_so) == ("TT0003", 20_000_000)
+    tra_loi(monkeypatch, "tt0003", "y")
+    asm_gd2.xoa_nhan_vien(ql)
+    assert ql.lay("TT0003") is None
+    assert "TT0003" not in [nv.ma_nv for nv in ql._handler_hien_tai.read(ql._file_hien_tai)]
+
+
+def test_menu_tim_theo_ma_sai_dinh_dang_bao_o_menu(tao_ql, danh_sach, capsys):
+    ql = tao_ql(".txt", danh_sach)
+    assert ql.lay("XX0001") is None and capsys.readouterr().out == ""  # API không in gì
+    assert asm_gd2.tim_nhan_vien_theo_ma(ql, "XX0001") is None
+    assert "Mã nhân viên không hợp lệ" in capsys.readouterr().out
+    assert asm_gd2.tim_nhan_vien_theo_ma(ql, "tt0001").ho_ten == "Trần Thị Bích"
+
+
+def test_menu_thong_ke_in_tu_so_lieu_cua_api(tao_ql, danh_sach, capsys):
+    ql = tao_ql(".csv", danh_sach)
+    asm_gd2.xuat_thong_ke(ql)
+    dong = {d.split("|")[0].strip(): d for d in capsys.readouterr().out.splitlines() if "|" in d}
+    assert f"{ql.thong_ke()['Tổng']['tong_thu_nhap']:,.0f}" in dong["Tổng"]
+
+
+@pytest.mark.parametrize("dinh_dang", [".txt", ".csv", ".json", ".xml"])
+def test_them_khong_doc_lai_ca_file(tao_ql, danh_sach, dinh_dang, monkeypatch):
+    ql = tao_ql(dinh_dang, danh_sach)
+    handler = ql._handler_hien_tai
+
+    def khong_duoc_doc(*_):
+        raise AssertionError("them() không được đọc lại cả file")
+
+    monkeypatch.setattr(handler, "read", khong_duoc_doc)
+    monkeypatch.setattr(handler, "iter_read", khong_duoc_doc)
+    (nv,) = ql.them({"chuc_vu": "Hành Chính", "ho_ten": "Võ Mới", "luong": 5_000_000})
+    assert nv.ma_nv == "HC0003" and ql.lay("HC0003") is nv
+    assert [x.ma_nv for x in ql.tim_kiem_ten("vo moi")] == ["HC0003"]
+    monkeypatch.undo()
+    assert [truong(x) for x in handler.read(ql.ten_file())] == [truong(x) for x in danh_sach + [nv]]
+
+
+def test_them_sau_khi_noi_khac_ghi_file_khong_trung_ma(tao_ql, danh_sach):
+    ql = tao_ql(".csv", danh_sach)
+    noi_khac = tao_ql(".csv")  # tiến trình khác làm việc trên cùng file
+    noi_khac.them({"chuc_vu": "Hành Chính", "ho_ten": "Ghi Ở Nơi Khác", "luong": 1})
+    (nv,) = ql.them({"chuc_vu": "Hành Chính", "ho_ten": "Võ Mới", "luong": 5_000_000})
+    assert nv.ma_nv == "HC0004"  # đã đọc lại file nên thấy HC0003
+    assert ql.lay("HC0003").ho_ten == "Ghi Ở Nơi Khác"
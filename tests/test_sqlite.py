@@ -0,0 +1,92 @@
+"""CSDL SQLite: thứ tự họ tên tiếng Việt và thống kê theo biểu thuế đang áp dụng."""
+import sqlite3
+
+import pytest
+
+from bieuthue import BIEU_THUE_MAC_DINH, BieuThue, bo_thue
+from conftest import tao_nv
+from nhansu import HanhChinh, TiepThi
+from quanlyfile import QuanLySqlite
+from thongke import ThongKeChucVu
+from tiengviet import khoa_sap_xep
+
+
+@pytest.fixture
+def csdl(tmp_path):
+    handler = QuanLySqlite()
+    file_path = str(tmp_path / "data.db")
+    danh_sach = [tao_nv(HanhChinh, "HC0001", "Đặng Văn Em", 9_000_000),
+                 tao_nv(HanhChinh, "HC0002", "Ánh Dương", 16_000_000),
+                 tao_nv(HanhChinh, "HC0003", "Bùi Hà", 1_000_000),
+                 tao_nv(HanhChinh, "HC0004", "Bùi Hạ", 15_000_000),  # đúng ngưỡng 15tr
+                 tao_nv(TiepThi, "TT0001", "Ân Minh", 5_000_000, 12_000_000, 0.1),
+                 tao_nv(TiepThi, "TT0002", "Dũng Lê", 20_000_000, 1_000_000, 0.1)]
+    handler.write(file_path, danh_sach)
+    yield handler, file_path, danh_sach
+    handler.dong()
+
+
+def test_sap_xep_ho_ten_theo_bang_chu_cai_tieng_viet(csdl):
+    handler, file_path, danh_sach = csdl
+    ky_vong = [nv.ma_nv for nv in sorted(danh_sach, key=lambda nv: khoa_sap_xep(nv.ho_ten))]
+    assert [nv.ma_nv for nv in handler.sap_xep(file_path, "ho_ten")] == ky_vong
+    assert [nv.ma_nv for nv in handler.sap_xep(file_path, "ho_ten", giam_dan=True)] == ky_vong[::-1]
+
+
+def test_sap_xep_ho_ten_dung_chi_muc(csdl):
+    handler, file_path, _ = csdl
+    ke_hoach = handler._mo(file_path).execute(
+        f"EXPLAIN QUERY PLAN SELECT * FROM {handler.BANG} ORDER BY {handler._kiem_tra_cot('ho_ten')}, rowid").fetchall()
+    assert [chi_tiet for *_, chi_tiet in ke_hoach] == [f"SCAN {handler.BANG} USING INDEX idx_{handler.BANG}_khoa_ten"]
+
+
+def test_csdl_cu_duoc_them_cot_khoa_ten(tmp_path, danh_sach):
+    file_path = str(tmp_path / "cu.db")
+    with sqlite3.connect(file_path) as ket_noi:  # lược đồ trước khi có cột khoa_ten
+        ket_noi.executescript(QuanLySqlite.LENH_TAO_BANG.replace(",\n            khoa_ten TEXT NOT NULL DEFAULT ''", "")
+                              + "CREATE INDEX idx_nhan_vien_ho_ten ON nhan_vien(ho_ten);")
+        ket_noi.executemany("INSERT INTO nhan_vien VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            [QuanLySqlite()._gia_tri_dong(nv)[:-1] for nv in danh_sach])
+    ket_noi.close()
+    handler = QuanLySqlite()
+    try:
+        ky_vong = [nv.ma_nv for nv in sorted(danh_sach, key=lambda nv: khoa_sap_xep(nv.ho_ten))]
+        assert [nv.ma_nv for nv in handler.sap_xep(file_path, "ho_ten")] == ky_vong
+        cac_chi_muc = {ten for (ten,) in handler._mo(file_path).execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+        assert cac_chi_muc == {"idx_nhan_vien_luong", "idx_nhan_vien_thu_nhap", "idx_nhan_vien_khoa_ten"}
+    finally:
+        handler.dong()
+
+
+@pytest.mark.parametrize("bieu_thue", [
+    BIEU_THUE_MAC_DINH,
+    BieuThue([(0, 0.05)], ten="5%"),
+    BieuThue([(0, 0.0), (9_000_000, 0.10), (15_000_000, 0.2, True)], luy_tien=True, ten="Lũy tiến"),
+], ids=lambda bieu_thue: bieu_thue.ten)
+def test_thong_ke_tinh_thue_trong_sql_theo_bieu_thue(csdl, bieu_thue):
+    handler, file_path, danh_sach = csdl
+    bieu_cu = bo_thue.hien_hanh
+    bo_thue.ap_dung(bieu_thue)
+    try:
+        ket_qua = handler.thong_ke(file_path)
+        ky_vong = sum(bieu_thue.tinh(nv.thu_nhap) for nv in danh_sach)
+    finally:
+        bo_thue.ap_dung(bieu_cu)
+    assert ket_qua["Tổng"]["tong_thue"] == pytest.approx(ky_vong)
+
+
+def test_thong_ke_tinh_lai_thue_khi_doi_bieu_thue(csdl):
+    handler, file_path, danh_sach = csdl
+    bieu_cu = bo_thue.hien_hanh
+    bo_thue.ap_dung(BieuThue([(0, 0.05)], ten="5%"))
+    try:
+        ket_qua = handler.thong_ke(file_path)
+        thong_ke = ThongKeChucVu()
+        thong_ke.xay_dung(danh_sach)
+        ky_vong = thong_ke.ket_qua()
+    finally:
+        bo_thue.ap_dung(bieu_cu)
+    assert ket_qua["Tổng"]["tong_thue"] == pytest.approx(0.05 * sum(nv.thu_nhap for nv in danh_sach))
+    for ten, so_lieu in ky_vong.items():
+        assert ket_qua[ten] == pytest.approx(so_lieu)
@@ -0,0 +1,83 @@
+"""Thống kê theo chức vụ cập nhật dần phải khớp với số liệu tính lại từ đầu."""
+import random
+
+import pytest
+
+from conftest import tao_nv
+from nhansu import HanhChinh, TruongPhong
+from thongke import ThongKeChucVu, gop_ket_qua, tong_hop_nhom
+
+
+def tinh_lai(danh_sach) -> dict:
+    """Số liệu tính thẳng từ danh sách, cùng dạng với ThongKeChucVu.ket_qua."""
+    ket_qua = {}
+    for chuc_vu in {nv.chuc_vu for nv in danh_sach}:
+        nhom = [nv for nv in danh_sach if nv.chuc_vu == chuc_vu]
+        ket_qua[chuc_vu] = tong_hop_nhom([nv.luong for nv in nhom], [nv.thu_nhap for nv in nhom])
+    ket_qua["Tổng"] = tong_hop_nhom([nv.luong for nv in danh_sach], [nv.thu_nhap for nv in danh_sach])
+    return ket_qua
+
+
+def so_sanh(thong_ke: ThongKeChucVu, danh_sach) -> None:
+    ket_qua, ky_vong = thong_ke.ket_qua(), tinh_lai(danh_sach)
+    assert ket_qua.keys() == ky_vong.keys()
+    for ten, so_lieu in ky_vong.items():
+        assert ket_qua[ten] == pytest.approx(so_lieu, rel=1e-9, abs=1e-6), ten
+
+
+def test_them_xoa_sua_ngau_nhien_khop_voi_tinh_lai():
+    rng = random.Random(7)
+    lop = (HanhChinh, TruongPhong)
+    danh_sach = [tao_nv(lop[i % 2], f"NV{i:04d}", "Tên", rng.choice([5e6, 7e6, 9e6, rng.uniform(1e6, 3e7)]),
+                        luong_trach_nhiem=1e6) for i in range(40)]
+    thong_ke = ThongKeChucVu()
+    thong_ke.xay_dung(danh_sach)
+    so_sanh(thong_ke, danh_sach)
+    for buoc in range(300):
+        nv = rng.choice(danh_sach)
+        if buoc % 3 == 0 and len(danh_sach) > 1:
+            # Hay xóa đúng người có thu nhập thấp nhất/cao nhất để buộc phải tìm lại
+            nv = min(danh_sach, key=lambda x: x.thu_nhap) if buoc % 2 else max(danh_sach, key=lambda x: x.thu_nhap)
+            danh_sach.remove(nv)
+            thong_ke.xoa(nv.ma_nv)
+        elif buoc % 3 == 1:
+            nv.luong = rng.choice([nv.luong, 5e6, rng.uniform(1e6, 3e7)])
+            thong_ke.cap_nhat(nv)
+        else:
+            moi = tao_nv(rng.choice(lop), f"MOI{buoc:04d}", "Tên", rng.uniform(1e6, 3e7), luong_trach_nhiem=2e6)
+            danh_sach.append(moi)
+            thong_ke.them(moi)
+        so_sanh(thong_ke, danh_sach)
+
+
+def test_do_lech_chuan_khong_mat_chinh_xac_khi_thu_nhap_lon():
+    # E[x^2] - E[x]^2 mất hết chữ số có nghĩa ở mức 1e9 với độ lệch chỉ vài đơn vị
+    danh_sach = [tao_nv(HanhChinh, f"HC{i:04d}", "Tên", 1e9 + i % 3) for i in range(1000)]
+    thong_ke = ThongKeChucVu()
+    thong_ke.xay_dung(danh_sach)
+    for nv in danh_sach[:500]:
+        thong_ke.xoa(nv.ma_nv)
+    assert thong_ke.ket_qua()["Hành Chính"]["do_lech_chuan"] == pytest.approx(
+        tinh_lai(danh_sach[500:])["Hành Chính"]["do_lech_chuan"], rel=1e-6)
+
+
+def test_gop_ket_qua_bang_tinh_tren_ca_danh_sach():
+    nhom_a, nhom_b = [1e9 + 1, 1e9 + 2, 1e9 + 6], [1e9 + 3, 1e9 + 7]  # trung bình gần nhau: dễ triệt tiêu
+    gop = gop_ket_qua([tong_hop_nhom(nhom_a, nhom_a), tong_hop_nhom(nhom_b, nhom_b)])
+    assert gop == pytest.approx(tong_hop_nhom(nhom_a + nhom_b, nhom_a + nhom_b))
+
+
+def test_xoa_lien_tuc_thap_nhat_cao_nhat_heap_khong_phinh():
+    danh_sach = [tao_nv(HanhChinh, f"HC{i:04d}", "Tên", 1e6 + i) for i in range(500)]
+    thong_ke = ThongKeChucVu()
+    thong_ke.xay_dung(danh_sach)
+    for i in range(200):
+        thong_ke.xoa(danh_sach[i].ma_nv)  # luôn xóa đúng người thấp nhất
+        thong_ke.xoa(danh_sach[-1 - i].ma_nv)  # và người cao nhất
+        moi = tao_nv(HanhChinh, f"MOI{i:04d}", "Tên", 2e6 + i)  # mức mới, lớn hơn mọi mức cũ
+        thong_ke.them(moi)
+        ket_qua = thong_ke.ket_qua()["Hành Chính"]
+        assert (ket_qua["thu_nhap_thap_nhat"], ket_qua["thu_nhap_cao_nhat"]) == (1e6 + i + 1, 2e6 + i)
+        thong_ke.xoa(moi.ma_nv)
+    tong_hop = thong_ke._theo_chuc_vu["Hành Chính"]
+    assert len(tong_hop._heap_thap) <= 2 * len(tong_hop.dem_thu_nhap) + 16
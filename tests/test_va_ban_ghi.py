@@ -0,0 +1,131 @@
+"""Vá/xóa từng bản ghi trong file .txt/.csv rồi đọc lại."""
+import csv
+
+import pytest
+
+from conftest import truong
+from nhatky import SUA
+from quanlyfile import QuanLyCsv, QuanLyTxt
+
+CAC_HANDLER = {".txt": QuanLyTxt, ".csv": QuanLyCsv}
+
+
+@pytest.fixture(params=list(CAC_HANDLER))
+def file_da_ghi(request, tmp_path, danh_sach):
+    handler = CAC_HANDLER[request.param]()
+    file_path = str(tmp_path / ("data" + request.param))
+    handler.write(file_path, danh_sach)
+    return handler, file_path
+
+
+def test_sua_ngan_hon_ghi_de_tai_cho(file_da_ghi, danh_sach):
+    handler, file_path = file_da_ghi
+    kich_thuoc = len(open(file_path, "rb").read())
+    danh_sach[1].ho_ten = "An"
+    danh_sach[1].hoa_hong = 0.0
+    assert handler.cap_nhat_ban_ghi(file_path, danh_sach[1])
+    assert len(open(file_path, "rb").read()) == kich_thuoc  # không ghi thêm gì vào cuối file
+    assert [truong(nv) for nv in handler.read(file_path)] == [truong(nv) for nv in danh_sach]
+
+
+def test_sua_dai_hon_chuyen_xuong_cuoi_file(file_da_ghi, danh_sach):
+    handler, file_path = file_da_ghi
+    danh_sach[0].ho_ten = "Nguyễn Văn An Có Tên Rất Dài Hơn Nhiều"
+    assert handler.cap_nhat_ban_ghi(file_path, danh_sach[0])
+    doc_lai = handler.read(file_path)
+    assert [truong(nv) for nv in doc_lai] == [truong(nv) for nv in danh_sach[1:] + danh_sach[:1]]
+
+
+def test_xoa_de_lai_bia_mo_bi_bo_qua_khi_doc(file_da_ghi, danh_sach):
+    handler, file_path = file_da_ghi
+    assert handler.xoa_ban_ghi(file_path, "TP0001")
+    assert not handler.xoa_ban_ghi(file_path, "TP0001")
+    assert [nv.ma_nv for nv in handler.read(file_path)] == ["HC0001", "TT0001", "HC0002", "TT0002"]
+
+
+def test_va_nhieu_ban_ghi_bao_ma_khong_co(file_da_ghi, danh_sach):
+    handler, file_path = file_da_ghi
+    danh_sach[3].luong = 1.0
+    assert handler.va_nhieu_ban_ghi(file_path, [danh_sach[3]], ["TT0002", "XX9999"]) == {"XX9999"}
+    assert [(nv.ma_nv, nv.luong) for nv in handler.read(file_path)][-1] == ("HC0002", 1.0)
+
+
+def test_chi_muc_dung_lai_tu_file_sau_khi_va(file_da_ghi, danh_sach):
+    handler, file_path = file_da_ghi
+    handler.xoa_ban_ghi(file_path, "HC0001")
+    handler.xoa_ban_ghi(file_path, "TP0001")
+    moi = type(handler)()  # tiến trình khác: dựng chỉ mục từ nội dung file
+    chi_muc = moi._lay_chi_muc_dong(file_path)
+    assert sorted(set(chi_muc[1]) - {"Mã NV"}) == ["HC0002", "TT0001", "TT0002"]  # dòng tiêu đề cũng có trong chỉ mục
+    assert chi_muc[2] == 2
+    danh_sach[4].luong = 2.0
+    assert moi.cap_nhat_ban_ghi(file_path, danh_sach[4])
+    assert [(nv.ma_nv, nv.luong) for nv in handler.read(file_path)][-1] == ("TT0002", 2.0)
+
+
+def test_csv_da_va_van_sach_voi_chuong_trinh_doc_csv_khac(tmp_path, danh_sach):
+    handler = QuanLyCsv()
+    file_path = str(tmp_path / "data.csv")
+    handler.write(file_path, danh_sach)
+    danh_sach[1].doanh_so = 0.0  # thu nhập/thuế ngắn lại: dòng mới ngắn hơn dòng cũ
+    handler.cap_nhat_ban_ghi(file_path, danh_sach[1])
+    handler.xoa_ban_ghi(file_path, "HC0002")
+    with open(file_path, newline="", encoding="utf-8") as f:
+        cac_dong = [dong for dong in csv.reader(f) if dong]
+    assert [dong[0] for dong in cac_dong[1:]] == ["HC0001", "TT0001", "TP0001", "TT0002"]
+    assert all(o == o.strip() for dong in cac_dong for o in dong)
+    assert float(cac_dong[2][-1]) == danh_sach[1].thue_thu_nhap
+
+
+def test_ghi_them_rong_khong_tao_file(tmp_path):
+    for handler in (QuanLyTxt(), QuanLyCsv()):
+        file_path = tmp_path / "chua_co.txt"
+        handler.ghi_them_nhieu(str(file_path), [])
+        assert not file_path.exists()
+
+
+def test_nhieu_bia_mo_thi_can_nen(file_da_ghi, danh_sach):
+    handler, file_path = file_da_ghi
+    handler.BIA_MO_TOI_THIEU = 2
+    assert not handler.can_nen(file_path)
+    handler.xoa_ban_ghi(file_path, "HC0001")
+    handler.xoa_ban_ghi(file_path, "HC0002")
+    assert handler.can_nen(file_path)
+    handler.write(file_path, handler.read(file_path))
+    assert not handler.can_nen(file_path)
+    assert "HC0001" not in open(file_path, encoding="utf-8").read()
+
+
+@pytest.mark.parametrize("dinh_dang", list(CAC_HANDLER))
+def test_quan_ly_thu_gon_khi_du_bia_mo(tao_ql, danh_sach, dinh_dang):
+    ql = tao_ql(dinh_dang, danh_sach)
+    ql._handlers[dinh_dang].BIA_MO_TOI_THIEU = 2
+    ql.xoa("HC0001")
+    assert not open(ql.ten_file(), encoding="utf-8").read().splitlines()[1].strip()  # còn bia mộ
+    ql.xoa("TP0001")
+    cac_dong = open(ql.ten_file(), encoding="utf-8").read().splitlines()
+    assert len(cac_dong) == 4 and all(dong.strip() for dong in cac_dong)  # đã thu gọn
+
+
+@pytest.mark.parametrize("dinh_dang", list(CAC_HANDLER))
+def test_thu_gon_tra_ban_ghi_bi_chuyen_ve_thu_tu_cu(tao_ql, danh_sach, dinh_dang):
+    ql = tao_ql(dinh_dang, danh_sach)
+    handler = ql._handlers[dinh_dang]
+    handler.BIA_MO_TOI_THIEU = 10**6  # chưa thu gọn
+    ql.cap_nhat("HC0001", ho_ten="Nguyễn Văn An Có Tên Rất Dài Hơn Nhiều")
+    assert [nv.ma_nv for nv in handler.read(ql.ten_file())][-1] == "HC0001"
+    ql.gop_nhat_ky()  # nhật ký trống, chưa tới ngưỡng: không ghi lại
+    assert [nv.ma_nv for nv in handler.read(ql.ten_file())][-1] == "HC0001"
+    handler.BIA_MO_TOI_THIEU, handler.TI_LE_NEN = 1, 0.0
+    ql.gop_nhat_ky()
+    assert [nv.ma_nv for nv in handler.read(ql.ten_file())] == [nv.ma_nv for nv in danh_sach]
+
+
+def test_gop_nhat_ky_con_sot_khong_xoa_file_truy_van_truc_tiep(tao_ql, danh_sach):
+    ql = tao_ql(".bin", danh_sach)
+    danh_sach[1].luong = 1.0
+    ql._nhat_ky.ghi_nhieu([(SUA, danh_sach[1])])  # nhật ký còn sót lại sau lần ghi bị ngắt
+    ql.gop_nhat_ky()
+    doc_lai = ql._handlers[".bin"].read(ql.ten_file())
+    assert [truong(nv) for nv in doc_lai] == [truong(nv) for nv in danh_sach]
+    assert not len(ql._nhat_ky)
@@ -0,0 +1,203 @@
+"""
+Module này chứa ThongKeChucVu: số liệu tổng hợp theo chức vụ được cập nhật dần.
+- Mỗi chức vụ giữ số lượng, tổng lương, tổng thu nhập và trung bình/M2 của thu nhập theo
+  Welford; thêm/xóa/sửa một nhân viên chỉ cộng/trừ phần đóng góp của người đó, không
+  duyệt lại danh sách.
+- Nhỏ nhất/lớn nhất lấy từ hai heap các mức thu nhập, xóa kiểu lười: mức không còn ai
+  (đã hết trong dict thu nhập -> số người) chỉ bị bỏ khi nổi lên đỉnh heap, nên mỗi lần
+  thêm/xóa tốn O(log n) khấu hao thay vì quét lại mọi mức thu nhập.
+- Tổng thuế được tính lại từ dict thu nhập đó (theo cột, không chạm tới các đối tượng)
+  chỉ khi biểu thuế đang áp dụng thay đổi.
+"""
+import heapq
+import math
+
+from bieuthue import bo_thue
+
+
+class _TongHop:
+    """Các tổng chạy của một chức vụ."""
+    __slots__ = ("so_luong", "tong_luong", "tong_thu_nhap", "trung_binh", "m2", "tong_thue",
+                 "dem_thu_nhap", "_heap_thap", "_heap_cao")
+
+    def __init__(self):
+        self.so_luong = 0
+        self.tong_luong = 0.0
+        self.tong_thu_nhap = 0.0
+        self.trung_binh = 0.0  # trung bình thu nhập (Welford)
+        self.m2 = 0.0  # tổng bình phương độ lệch so với trung bình (Welford)
+        self.tong_thue = 0.0
+        self.dem_thu_nhap: dict[float, int] = {}  # thu nhập -> số nhân viên có thu nhập đó
+        # Các mức thu nhập (heap nhỏ nhất, heap của số đối để lấy lớn nhất), có thể còn mức đã hết người
+        self._heap_thap: list[float] = []
+        self._heap_cao: list[float] = []
+
+    def cong(self, luong: float, thu_nhap: float, dau: int) -> None:
+        """Cộng (dau=1) hoặc trừ (dau=-1) phần đóng góp của một nhân viên."""
+        thue = bo_thue.hien_hanh.tinh(thu_nhap)
+        self.so_luong += dau
+        self.tong_luong += dau * luong
+        self.tong_thu_nhap += dau * thu_nhap
+        self.tong_thue += dau * thue
+        if not self.so_luong:
+            # Về 0 hẳn để sai số làm tròn của các lần cộng/trừ không tích lũy
+            self.__init__()
+            return
+        trung_binh_cu = self.trung_binh
+        self.trung_binh += dau * (thu_nhap - trung_binh_cu) / self.so_luong
+        self.m2 = max(self.m2 + dau * (thu_nhap - trung_binh_cu) * (thu_nhap - self.trung_binh), 0.0)
+        if dau > 0:
+            so_nguoi = self.dem_thu_nhap.get(thu_nhap, 0)
+            self.dem_thu_nhap[thu_nhap] = so_nguoi + 1
+            if not so_nguoi:
+                if len(self._heap_thap) >= 2 * len(self.dem_thu_nhap) + 16:
+                    self._dung_lai_heap()  # quá nhiều mức đã hết người: dựng lại, O(n) khấu hao
+                else:
+                    heapq.heappush(self._heap_thap, thu_nhap)
+                    heapq.heappush(self._heap_cao, -thu_nhap)
+            return
+        con_lai = self.dem_thu_nhap.pop(thu_nhap) - 1
+        if con_lai:
+            self.dem_thu_nhap[thu_nhap] = con_lai
+
+    def _dung_lai_heap(self) -> None:
+        self._heap_thap = list(self.dem_thu_nhap)
+        self._heap_cao = [-x for x in self._heap_thap]
+        heapq.heapify(self._heap_thap)
+        heapq.heapify(self._heap_cao)
+
+    @staticmethod
+    def _dinh(heap: list[float], con_nguoi: dict, dau: int) -> float:
+        """Đỉnh heap sau khi bỏ các mức thu nhập đã hết người (dau=-1 với heap số đối)."""
+        while dau * heap[0] not in con_nguoi:
+            heapq.heappop(heap)
+        return dau * heap[0]
+
+    def ket_qua(self) -> dict:
+        n = self.so_luong
+        if n:
+            thap_nhat = self._dinh(self._heap_thap, self.dem_thu_nhap, 1)
+            cao_nhat = self._dinh(self._heap_cao, self.dem_thu_nhap, -1)
+        return {
+            "so_luong": n,
+            "tong_luong": self.tong_luong,
+            "tong_thu_nhap": self.tong_thu_nhap,
+            "tong_thue": self.tong_thue,
+            "thu_nhap_trung_binh": self.tong_thu_nhap / n if n else 0.0,
+            "do_lech_chuan": math.sqrt(self.m2 / n) if n else 0.0,
+            "thu_nhap_thap_nhat": thap_nhat if n else 0.0,
+            "thu_nhap_cao_nhat": cao_nhat if n else 0.0,
+        }
+
+
+class ThongKeChucVu:
+    """
+    Số liệu tổng hợp theo chức vụ của danh sách nhân viên.\n
+    Lưu dict ma_nv -> (chức vụ, lương, thu nhập) đã cộng vào tổng để khi xóa
+    hoặc cập nhật biết chính xác phần cần trừ đi (đối tượng đã bị sửa tại chỗ).
+    """
+    def __init__(self):
+        self._theo_chuc_vu: dict[str, _TongHop] = {}
+        self._dong_gop: dict[str, tuple[str, float, float]] = {}
+        self._phien_ban_thue = bo_thue.hien_hanh.phien_ban
+
+    def __len__(self) -> int:
+        return len(self._dong_gop)
+
+    def xay_dung(self, danh_sach) -> None:
+        """Dựng lại toàn bộ số liệu từ danh sách nhân viên."""
+        self._theo_chuc_vu = {}
+        self._dong_gop = {}
+        self._phien_ban_thue = bo_thue.hien_hanh.phien_ban
+        for nv in danh_sach:
+            self.them(nv)
+
+    def them(self, nv) -> None:
+        """Cộng một nhân viên vào số liệu của chức vụ."""
+        dong_gop = (nv.chuc_vu, nv.luong, nv.thu_nhap)
+        self._dong_gop[nv.ma_nv] = dong_gop
+        tong_hop = self._theo_chuc_vu.get(dong_gop[0])
+        if tong_hop is None:
+            tong_hop = self._theo_chuc_vu[dong_gop[0]] = _TongHop()
+        tong_hop.cong(*dong_gop[1:], 1)
+
+    def xoa(self, ma_nv: str) -> None:
+        """Trừ phần đóng góp đã ghi nhận của nhân viên khỏi số liệu."""
+        dong_gop = self._dong_gop.pop(ma_nv, None)
+        if dong_gop is not None:
+            self._theo_chuc_vu[dong_gop[0]].cong(*dong_gop[1:], -1)
+
+    def cap_nhat(self, nv) -> None:
+        """Cập nhật số liệu sau khi lương/thu nhập của nhân viên thay đổi."""
+        dong_gop = self._dong_gop.get(nv.ma_nv)
+        if dong_gop is not None and dong_gop[1:] == (nv.luong, nv.thu_nhap):
+            return
+        self.xoa(nv.ma_nv)
+        self.them(nv)
+
+    def _tinh_lai_thue(self) -> None:
+        """Biểu thuế đã đổi: tính lại tổng thuế của mỗi chức vụ từ các mức thu nhập của nó."""
+        bieu_thue = bo_thue.hien_hanh
+        for tong_hop in self._theo_chuc_vu.values():
+            dem = tong_hop.dem_thu_nhap
+            tong_hop.tong_thue = math.fsum(thue * so_nguoi for thue, so_nguoi
+                                           in zip(bieu_thue.tinh_hang_loat(list(dem)), dem.values()))
+        self._phien_ban_thue = bieu_thue.phien_ban
+
+    def ket_qua(self) -> dict[str, dict]:
+        """
+        Số liệu của từng chức vụ và dòng "Tổng" cho cả danh sách: so_luong, tong_luong,
+        tong_thu_nhap, tong_thue, thu_nhap_trung_binh, do_lech_chuan, thu_nhap_thap_nhat,
+        thu_nhap_cao_nhat.
+        """
+        if self._phien_ban_thue != bo_thue.hien_hanh.phien_ban:
+            self._tinh_lai_thue()
+        ket_qua = {cv: th.ket_qua() for cv, th in self._theo_chuc_vu.items() if th.so_luong}
+        ket_qua["Tổng"] = gop_ket_qua(ket_qua.values())
+        return ket_qua
+
+
+def tong_hop_nhom(cac_luong, cac_thu_nhap) -> dict:
+    """
+    Số liệu (cùng dạng với ThongKeChucVu.ket_qua) của một nhóm nhân viên tính thẳng từ cột
+    lương và cột thu nhập, dùng khi dữ liệu không nằm trong bộ nhớ (vd: quét file .bin).
+    Thuế tính theo biểu thuế đang áp dụng.
+    """
+    n = len(cac_thu_nhap)
+    if not n:
+        return _TongHop().ket_qua()
+    tong_thu_nhap = math.fsum(cac_thu_nhap)
+    trung_binh = tong_thu_nhap / n
+    return {
+        "so_luong": n,
+        "tong_luong": math.fsum(cac_luong),
+        "tong_thu_nhap": tong_thu_nhap,
+        "tong_thue": math.fsum(bo_thue.hien_hanh.tinh_hang_loat(cac_thu_nhap)),
+        "thu_nhap_trung_binh": trung_binh,
+        "do_lech_chuan": math.sqrt(math.fsum((x - trung_binh) ** 2 for x in cac_thu_nhap) / n),
+        "thu_nhap_thap_nhat": min(cac_thu_nhap),
+        "thu_nhap_cao_nhat": max(cac_thu_nhap),
+    }
+
+
+def gop_ket_qua(cac_ket_qua) -> dict:
+    """
+    Gộp số liệu của nhiều nhóm (vd: các chức vụ) thành số liệu chung.
+    Phương sai gộp theo cách ghép song song: M2 = tổng M2 từng nhóm + tổng n_nhóm * (TB_nhóm - TB)^2.
+    """
+    cac_ket_qua = [kq for kq in cac_ket_qua if kq["so_luong"]]
+    n = sum(kq["so_luong"] for kq in cac_ket_qua)
+    tong_thu_nhap = math.fsum(kq["tong_thu_nhap"] for kq in cac_ket_qua)
+    trung_binh = tong_thu_nhap / n if n else 0.0
+    m2 = math.fsum(kq["so_luong"] * (kq["do_lech_chuan"] ** 2 + (kq["thu_nhap_trung_binh"] - trung_binh) ** 2)
+                   for kq in cac_ket_qua)
+    return {
+        "so_luong": n,
+        "tong_luong": sum(kq["tong_luong"] for kq in cac_ket_qua),
+        "tong_thu_nhap": tong_thu_nhap,
+        "tong_thue": sum(kq["tong_thue"] for kq in cac_ket_qua),
+        "thu_nhap_trung_binh": trung_binh,
+        "do_lech_chuan": math.sqrt(m2 / n) if n else 0.0,
+        "thu_nhap_thap_nhat": min((kq["thu_nhap_thap_nhat"] for kq in cac_ket_qua), default=0.0),
+        "thu_nhap_cao_nhat": max((kq["thu_nhap_cao_nhat"] for kq in cac_ket_qua), default=0.0),
+    }
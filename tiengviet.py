@@ -0,0 +1,69 @@
+"""
+Module này chứa các hàm xử lý chuỗi tiếng Việt dùng cho sắp xếp và tìm kiếm.
+- khoa_sap_xep: khóa sắp xếp theo bảng chữ cái tiếng Việt (a ă â b c d đ e ê ...),
+  chữ cái so sánh trước, dấu thanh so sánh sau (ngang, huyền, hỏi, ngã, sắc, nặng).
+- khoa_sap_xep_chuoi: cùng khóa đó dạng một chuỗi, để lưu và đánh chỉ mục trong CSDL.
+- chuan_hoa: bỏ dấu (theo bảng dựng sẵn từ dạng tách NFD, đ -> d) và casefold, dùng cho
+  tìm kiếm không phân biệt dấu và hoa thường.
+- Khóa sắp xếp được nhớ lại (lru_cache) vì họ tên lặp lại nhiều và chỉ cần tính một lần.
+"""
+import unicodedata
+from functools import lru_cache
+
+BANG_CHU_CAI = "aăâbcdđeêfghijklmnoôơpqrstuưvwxyz"
+
+# Dấu phụ tạo thành chữ cái riêng (sau khi tách NFD): ă, â/ê/ô, ơ/ư
+_DAU_CHU_CAI = {"\u0306", "\u0302", "\u031b"}
+# Dấu thanh theo thứ tự sắp xếp: ngang (0), huyền, hỏi, ngã, sắc, nặng
+_DAU_THANH = {"\u0300": "1", "\u0309": "2", "\u0303": "3", "\u0301": "4", "\u0323": "5"}
+
+# Chữ cái (kể cả dấu phụ) -> ký tự thay thế có thứ tự đúng như bảng chữ cái.
+# Dùng vùng U+2000.. để chữ cái đứng sau khoảng trắng, chữ số và dấu câu.
+_THU_TU = {unicodedata.normalize("NFD", chu): chr(0x2000 + i) for i, chu in enumerate(BANG_CHU_CAI)}
+
+
+@lru_cache(maxsize=65536)
+def khoa_sap_xep(chuoi: str) -> tuple[str, str, str]:
+    """
+    Khóa sắp xếp tiếng Việt của chuỗi: (chữ cái, dấu thanh, chuỗi gốc).\n
+    Không phân biệt hoa thường ở hai phần đầu; chuỗi gốc chỉ để phân định khi
+    hai chuỗi chỉ khác nhau về hoa thường.
+    """
+    chu_cai, thanh = [], []
+    for ky_tu in unicodedata.normalize("NFD", chuoi.casefold()):
+        if ky_tu in _DAU_CHU_CAI and chu_cai:
+            chu_cai[-1] += ky_tu
+        elif ky_tu in _DAU_THANH and thanh:
+            thanh[-1] = _DAU_THANH[ky_tu]
+        elif not unicodedata.combining(ky_tu):
+            chu_cai.append(ky_tu)
+            thanh.append("0")
+    return "".join([_THU_TU.get(chu, chu[0]) for chu in chu_cai]), "".join(thanh), chuoi
+
+
+def khoa_sap_xep_chuoi(chuoi: str) -> str:
+    """
+    khoa_sap_xep ghép thành một chuỗi, ngăn bằng "\\x01" (nhỏ hơn mọi ký tự có trong họ tên) nên
+    so sánh theo mã ký tự cho cùng thứ tự với bộ ba. Dùng làm cột khóa có chỉ mục trong CSDL
+    (so sánh nhị phân UTF-8 giữ thứ tự mã ký tự, không cần collation).
+    """
+    return "\x01".join(khoa_sap_xep(chuoi))
+
+
+def _tao_bang_bo_dau() -> dict[int, str | None]:
+    """Bảng str.translate: chữ có dấu (dạng dựng sẵn) -> chữ không dấu, dấu kết hợp -> bỏ."""
+    bang = {ma: None for ma in range(0x300, 0x370)}
+    for ma in range(0xC0, 0x1F00):
+        goc = "".join([ky_tu for ky_tu in unicodedata.normalize("NFD", chr(ma)) if not unicodedata.combining(ky_tu)])
+        if goc != chr(ma) and len(goc) == 1:
+            bang[ma] = goc
+    bang[ord("đ")], bang[ord("Đ")] = "d", "D"
+    return bang
+
+
+_BANG_BO_DAU = _tao_bang_bo_dau()
+
+
+def chuan_hoa(chuoi: str) -> str:
+    """Chuỗi không dấu, chữ thường để so khớp: "Đặng Thị Ánh" -> "dang thi anh"."""
+    return chuoi.casefold().translate(_BANG_BO_DAU)
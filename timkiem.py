@@ -0,0 +1,180 @@
+"""
+Module này chứa ChiMucTen: chỉ mục tìm kiếm nhân viên theo họ tên.
+- Họ tên được chuẩn hóa (bỏ dấu, chữ thường) rồi tách thành các từ (token).
+- Tìm đúng từ dùng dict token -> tập mã; tìm theo tiền tố dùng bisect trên mảng
+  token đã sắp xếp; tìm gần đúng (gõ sai) dùng bảng "xóa bớt ký tự" (symmetric delete)
+  nên không phải so từng tên.
+- Chỉ mục được cập nhật theo từng lần thêm/xóa/đổi họ tên, không dựng lại toàn bộ.
+"""
+from bisect import bisect_left, insort
+from itertools import combinations
+
+from tiengviet import chuan_hoa
+
+
+def _cac_ban_xoa(token: str, so_ky_tu: int) -> set[str]:
+    """Mọi chuỗi thu được khi xóa tối đa so_ky_tu ký tự của token (kể cả chính token)."""
+    ket_qua = {token}
+    for k in range(1, min(so_ky_tu, len(token)) + 1):
+        ket_qua.update("".join(token[i] for i in range(len(token)) if i not in bo)
+                       for bo in combinations(range(len(token)), k))
+    return ket_qua
+
+
+def khoang_cach_sua(a: str, b: str, toi_da: int) -> int:
+    """Khoảng cách Levenshtein giữa a và b; trả về toi_da + 1 ngay khi chắc chắn vượt toi_da."""
+    if abs(len(a) - len(b)) > toi_da:
+        return toi_da + 1
+    hang_truoc = list(range(len(b) + 1))
+    for i, ky_tu_a in enumerate(a, 1):
+        hang = [i]
+        for j, ky_tu_b in enumerate(b, 1):
+            hang.append(min(hang_truoc[j] + 1, hang[j - 1] + 1, hang_truoc[j - 1] + (ky_tu_a != ky_tu_b)))
+        if min(hang) > toi_da:
+            return toi_da + 1
+        hang_truoc = hang
+    return hang_truoc[-1]
+
+
+class ChiMucTen:
+    """
+    Chỉ mục họ tên đã chuẩn hóa của danh sách nhân viên.\n
+    Lưu _theo_token (token -> tập mã nhân viên), _cac_token (các token khác nhau, tăng dần)
+    và _token_cua_ma (mã -> các token của họ tên) để xóa/cập nhật đúng chỗ.
+    Bảng xóa bớt ký tự cho tìm gần đúng được dựng lần đầu khi cần rồi cập nhật theo token.
+    """
+    SAI_SO_TOI_DA = 2  # Số ký tự sai tối đa khi tìm gần đúng
+
+    def __init__(self):
+        self._theo_token: dict[str, set[str]] = {}
+        self._cac_token: list[str] = []
+        self._token_cua_ma: dict[str, tuple[str, ...]] = {}
+        self._ban_xoa: dict[str, set[str]] | None = None  # bản xóa bớt ký tự -> các token gốc
+
+    def __len__(self) -> int:
+        return len(self._token_cua_ma)
+
+    @staticmethod
+    def tach_token(chuoi: str) -> tuple[str, ...]:
+        """Các từ đã chuẩn hóa của chuỗi (bỏ dấu, chữ thường)."""
+        return tuple(chuan_hoa(chuoi).split())
+
+    def xay_dung(self, cac_cap) -> None:
+        """Dựng lại chỉ mục từ các cặp (ma_nv, ho_ten)."""
+        self._theo_token = {}
+        self._token_cua_ma = {}
+        self._ban_xoa = None
+        theo_token = self._theo_token
+        for ma_nv, ho_ten in cac_cap:
+            cac_token = self._token_cua_ma[ma_nv] = self.tach_token(ho_ten)
+            for token in cac_token:
+                tap_ma = theo_token.get(token)
+                if tap_ma is None:
+                    theo_token[token] = {ma_nv}
+                else:
+                    tap_ma.add(ma_nv)
+        self._cac_token = sorted(theo_token)
+
+    def them(self, ma_nv: str, ho_ten: str) -> None:
+        """Thêm họ tên của một nhân viên vào chỉ mục."""
+        if ma_nv in self._token_cua_ma:
+            self.xoa(ma_nv)
+        cac_token = self._token_cua_ma[ma_nv] = self.tach_token(ho_ten)
+        for token in cac_token:
+            tap_ma = self._theo_token.get(token)
+            if tap_ma is None:
+                self._theo_token[token] = {ma_nv}
+                insort(self._cac_token, token)
+                if self._ban_xoa is not None:
+                    for ban_xoa in _cac_ban_xoa(token, self.SAI_SO_TOI_DA):
+                        self._ban_xoa.setdefault(ban_xoa, set()).add(token)
+            else:
+                tap_ma.add(ma_nv)
+
+    def xoa(self, ma_nv: str) -> None:
+        """Xóa nhân viên khỏi chỉ mục; token không còn ai dùng thì bị bỏ đi."""
+        for token in self._token_cua_ma.pop(ma_nv, ()):
+            tap_ma = self._theo_token.get(token)
+            if tap_ma is None:
+                continue  # họ tên có cùng một từ hai lần, đã xử lý ở lần trước
+            tap_ma.discard(ma_nv)
+            if tap_ma:
+                continue
+            del self._theo_token[token]
+            del self._cac_token[bisect_left(self._cac_token, token)]
+            if self._ban_xoa is not None:
+                for ban_xoa in _cac_ban_xoa(token, self.SAI_SO_TOI_DA):
+                    cac_goc = self._ban_xoa[ban_xoa]
+                    cac_goc.discard(token)
+                    if not cac_goc:
+                        del self._ban_xoa[ban_xoa]
+
+    def cap_nhat(self, ma_nv: str, ho_ten: str) -> None:
+        """Cập nhật chỉ mục khi họ tên của nhân viên thay đổi (không đổi thì bỏ qua)."""
+        if self._token_cua_ma.get(ma_nv) == self.tach_token(ho_ten):
+            return
+        self.them(ma_nv, ho_ten)
+
+    # --- Tìm kiếm: đều trả về danh sách mã nhân viên ---
+    def _theo_tien_to(self, tien_to: str) -> set[str]:
+        """Mã các nhân viên có ít nhất một từ bắt đầu bằng tien_to."""
+        dau = bisect_left(self._cac_token, tien_to)
+        cuoi = bisect_left(self._cac_token, tien_to + "\U0010ffff", dau)
+        if cuoi - dau == 1:
+            return self._theo_token[self._cac_token[dau]]
+        ket_qua = set()
+        for token in self._cac_token[dau:cuoi]:
+            ket_qua.update(self._theo_token[token])
+        return ket_qua
+
+    @staticmethod
+    def _giao(cac_tap: list[set[str]]) -> list[str]:
+        """Giao các tập (bắt đầu từ tập nhỏ nhất), kết quả sắp theo mã."""
+        if not cac_tap or not all(cac_tap):
+            return []
+        cac_tap = sorted(cac_tap, key=len)
+        return sorted(cac_tap[0].intersection(*cac_tap[1:]))
+
+    def tim_token(self, tu_khoa: str) -> list[str]:
+        """Nhân viên có họ tên chứa đủ mọi từ của tu_khoa (không phân biệt dấu, hoa thường)."""
+        return self._giao([self._theo_token.get(token, set()) for token in self.tach_token(tu_khoa)])
+
+    def tim_tien_to(self, tu_khoa: str) -> list[str]:
+        """Nhân viên mà mỗi từ của tu_khoa là tiền tố của một từ trong họ tên (vd: "ng an" -> "Nguyễn Văn An")."""
+        return self._giao([self._theo_tien_to(token) for token in self.tach_token(tu_khoa)])
+
+    def _token_gan_dung(self, token: str, sai_so: int) -> list[tuple[str, int]]:
+        """Các token trong chỉ mục cách token không quá sai_so ký tự, kèm khoảng cách."""
+        if self._ban_xoa is None:
+            self._ban_xoa = {}
+            for goc in self._theo_token:
+                for ban_xoa in _cac_ban_xoa(goc, self.SAI_SO_TOI_DA):
+                    self._ban_xoa.setdefault(ban_xoa, set()).add(goc)
+        ung_vien = set()
+        for ban_xoa in _cac_ban_xoa(token, sai_so):
+            ung_vien.update(self._ban_xoa.get(ban_xoa, ()))
+        ket_qua = []
+        for goc in ung_vien:
+            khoang_cach = khoang_cach_sua(token, goc, sai_so)
+            if khoang_cach <= sai_so:
+                ket_qua.append((goc, khoang_cach))
+        return ket_qua
+
+    def tim_gan_dung(self, tu_khoa: str, sai_so: int = 1) -> list[str]:
+        """
+        Nhân viên mà mỗi từ của tu_khoa khớp với một từ trong họ tên, cho phép sai tối đa
+        sai_so ký tự mỗi từ (thêm/bớt/thay). Kết quả sắp theo tổng số ký tự sai rồi theo mã.
+        """
+        sai_so = min(sai_so, self.SAI_SO_TOI_DA)
+        cac_muc = []  # mỗi từ của tu_khoa: các tập mã theo số ký tự sai 0, 1, ...
+        for token in self.tach_token(tu_khoa):
+            muc = [set() for _ in range(sai_so + 1)]
+            for goc, khoang_cach in self._token_gan_dung(token, sai_so):
+                muc[khoang_cach].update(self._theo_token[goc])
+            cac_muc.append(muc)
+        ket_qua = self._giao([set().union(*muc) for muc in cac_muc])
+
+        def tong_sai_so(ma_nv: str) -> int:
+            return sum(next(d for d, tap in enumerate(muc) if ma_nv in tap) for muc in cac_muc)
+
+        return sorted(ket_qua, key=tong_sai_so)
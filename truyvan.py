@@ -0,0 +1,36 @@
+"""
+Module này chứa các hàm truy vấn dùng chung trên một nguồn nhân viên bất kỳ.
+- Nguồn có thể là list trong bộ nhớ hoặc một iterator đọc dần từ file.
+- Các hàm chỉ duyệt nguồn một lần và không cần tạo bản sao toàn bộ danh sách.
+"""
+import heapq
+
+
+def tim_theo_ma(nguon, ma_nv: str):
+    """Tìm nhân viên đầu tiên có mã ma_nv, dừng duyệt ngay khi tìm thấy."""
+    ma_nv = ma_nv.upper()
+    for nv in nguon:
+        if nv.ma_nv == ma_nv:
+            return nv
+    return None
+
+
+def loc_theo_khoang(nguon, min_gia_tri: float, max_gia_tri: float, khoa=lambda nv: nv.luong):
+    """Trả về lần lượt (generator) các nhân viên có khóa (mặc định là lương) trong đoạn [min, max]."""
+    return (nv for nv in nguon if min_gia_tri <= khoa(nv) <= max_gia_tri)
+
+
+def top_k(nguon, k: int = 5, giam_dan: bool = True, chuc_vu: str | None = None,
+          khoa=lambda nv: nv.thu_nhap) -> list:
+    """
+    Lấy k nhân viên có khóa (mặc định là thu nhập) cao nhất hoặc thấp nhất.\n
+    - giam_dan=True: lấy cao nhất, sắp giảm dần; False: lấy thấp nhất, sắp tăng dần.
+    - chuc_vu: chỉ xét nhân viên có chức vụ này (vd: "Tiếp Thị").\n
+    Dùng heap kích thước k nên tốn O(n log k) và chỉ giữ k phần tử trong bộ nhớ.
+    """
+    if k <= 0:
+        return []
+    if chuc_vu is not None:
+        nguon = (nv for nv in nguon if nv.chuc_vu == chuc_vu)
+    chon = heapq.nlargest if giam_dan else heapq.nsmallest
+    return chon(k, nguon, key=khoa)